@@ -0,0 +1,157 @@
+"""
+Offline Download Benchmark
+
+Runs `LandsatDownloader` end to end without Earth Engine or network access: the `ee` module
+is replaced by `fake_ee` and tiles are served by a local `TileServer`. For each ROI size it
+measures
+
+- `patch_roi` (grid generation and clipping),
+- the batched validity stage (`checkTilesValidity`) on one month,
+- a full `startDownload` over the requested years,
+
+and reports tiles/sec, Earth Engine round trips and HTTP requests per tile, per-stage median
+latencies and the peak traced memory of the download. Earth Engine latency, tile server latency,
+error and 429 rates are configurable, so a regression in batching, pooling or retry handling
+shows up as a drop in tiles/sec or a rise in round trips per tile.
+
+Usage:
+    python benchmarks/bench_download.py
+    python benchmarks/bench_download.py --sizes 16 64 256 --ee-latency 0.1 --rate-429 0.05 --engine asyncio
+    python benchmarks/bench_download.py --years 5 --export-mode stacked
+    python benchmarks/bench_download.py --sizes 64 256 --export-mode supertile
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+import fake_ee
+from tile_server import TileServer
+
+fake_ee.install() # Must happen before the downloader imports ee
+
+import geopandas as gpd
+from shapely.geometry import box
+
+from vegetationFLOW_core.datasets.landsat8 import LandsatDownloader
+from vegetationFLOW_core.utils import DownloadMetrics
+
+RES_M = 30
+ORIGIN = 1_966_080 # A multiple of every tile size in meters, so the ROI is snapped to the lattice
+
+
+def make_roi(path: str, num_tiles: int, img_size: int) -> None:
+    """Writes a square ROI covering about `num_tiles` grid tiles, inset so no neighbour tile is touched."""
+    tile_m = img_size * RES_M
+    side = math.isqrt(num_tiles) * tile_m
+    inset = tile_m * 0.01
+    roi = box(ORIGIN + inset, ORIGIN + inset, ORIGIN + side - inset, ORIGIN + side - inset)
+    gpd.GeoDataFrame(geometry=[roi], crs="EPSG:3857").to_crs(epsg=4326).to_file(path, driver="GeoJSON")
+
+
+def bench_size(args, server: TileServer, num_tiles: int) -> dict:
+    with tempfile.TemporaryDirectory() as data_dir:
+        roi_path = os.path.join(data_dir, "roi.geojson")
+        make_roi(roi_path, num_tiles, args.img_size)
+        downloader = LandsatDownloader(
+            data_dir=data_dir,
+            dataset_name=f"bench_{num_tiles}",
+            img_size=args.img_size,
+            max_workers=args.max_workers,
+            engine=args.engine,
+            output_format=args.output_format,
+            export_mode=args.export_mode,
+        )
+        try:
+            roi_gdf = gpd.read_file(roi_path)
+            start = time.perf_counter()
+            grid = downloader.gridROI(roi_gdf)
+            patch_roi_s = time.perf_counter() - start
+
+            composite = downloader.load_ee_composite(roi_gdf, "2020-01-01", "2020-01-31", check_empty=False)
+            fake_ee.stats.reset()
+            start = time.perf_counter()
+            downloader.checkTilesValidity(composite, grid)
+            validity_s = time.perf_counter() - start
+            validity_round_trips = fake_ee.stats.round_trips
+
+            fake_ee.stats.reset()
+            server.reset()
+            downloader.metrics = DownloadMetrics() # Only count the full run
+            tracemalloc.start()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()): # The downloader prints every tile
+                downloader.startDownload(roi_path, args.start_year, args.start_year + args.years - 1)
+            download_s = time.perf_counter() - start
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        finally:
+            downloader.close()
+
+    metrics = downloader.metrics.snapshot()
+    resolved = max(metrics["tiles_resolved"], 1)
+    return {
+        "tiles": len(grid),
+        "patch_roi_ms": patch_roi_s * 1e3,
+        "validity_ms": validity_s * 1e3,
+        "validity_rt": validity_round_trips,
+        "tile_months": metrics["tiles_resolved"],
+        "tiles_per_s": metrics["tiles_done"] / download_s,
+        "rt_per_tile": fake_ee.stats.round_trips / resolved,
+        "http_per_tile": server.requests / max(metrics["tiles_done"], 1),
+        "failed": metrics["tiles_failed"],
+        "peak_mb": peak_bytes / 1024 ** 2,
+        "stages_p50": {stage: summary["p50_s"] for stage, summary in metrics["stages"].items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64], help="ROI sizes in tiles")
+    parser.add_argument("--img-size", type=int, default=128)
+    parser.add_argument("--start-year", type=int, default=2020)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--engine", choices=["threads", "asyncio"], default="threads")
+    parser.add_argument("--output-format", choices=["geotiff", "cog", "datacube"], default="geotiff")
+    parser.add_argument("--export-mode", choices=["monthly", "stacked", "supertile"], default="monthly")
+    parser.add_argument("--ee-latency", type=float, default=0.05, help="Seconds per Earth Engine round trip")
+    parser.add_argument("--http-latency", type=float, default=0.02, help="Seconds before each tile response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of tile requests answered with 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of tile requests answered with 429")
+    parser.add_argument("--invalid-rate", type=float, default=0.1, help="Fraction of tiles with too few valid pixels")
+    parser.add_argument("--empty-month-rate", type=float, default=0.0, help="Fraction of months without scenes")
+    args = parser.parse_args()
+
+    server = TileServer(latency_s=args.http_latency, error_rate=args.error_rate, rate_limit_rate=args.rate_429).start()
+    fake_ee.install(
+        latency_s=args.ee_latency,
+        tile_url=server.url,
+        invalid_tile_rate=args.invalid_rate,
+        empty_month_rate=args.empty_month_rate,
+    )
+
+    print(f"{'tiles':>6}{'patch_roi ms':>14}{'validity ms':>13}{'val RT':>8}{'tile-months':>13}"
+          f"{'tiles/s':>10}{'RT/tile':>9}{'HTTP/tile':>11}{'failed':>8}{'peak MB':>9}  stage p50 [ms]")
+    try:
+        for num_tiles in args.sizes:
+            r = bench_size(args, server, num_tiles)
+            stages = " ".join(
+                f"{stage}={p50 * 1e3:.0f}" for stage, p50 in r["stages_p50"].items() if p50 is not None
+            )
+            print(f"{r['tiles']:>6}{r['patch_roi_ms']:>14.1f}{r['validity_ms']:>13.1f}{r['validity_rt']:>8}"
+                  f"{r['tile_months']:>13}{r['tiles_per_s']:>10.1f}{r['rt_per_tile']:>9.2f}"
+                  f"{r['http_per_tile']:>11.2f}{r['failed']:>8}{r['peak_mb']:>9.1f}  {stages}")
+    finally:
+        server.stop()
+    print(f"\nProcess max RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Grid Generation Benchmark
+
+Compares the vectorized `create_grid` / STRtree `patch_roi` against the previous
+list-comprehension grid and `gpd.sjoin` clipping, for grids of 10^4 to 10^6 cells.
+
+The ROI is made of two overlapping discs covering the grid extent, so the number of
+duplicate tiles produced by the spatial join is reported as well.
+
+Usage:
+    python benchmarks/bench_grid.py
+    python benchmarks/bench_grid.py --sizes 10000 100000 --repeats 5
+"""
+
+import argparse
+import math
+import time
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point, box
+
+from vegetationFLOW_core.utils import create_grid, patch_roi
+
+TILE_SIZE_PX = 256
+RES_M = 30
+
+
+def legacy_create_grid(bounds, cell_size, resolution_m, crs):
+    minx, miny, maxx, maxy = bounds
+    width = cell_size * resolution_m
+    height = cell_size * resolution_m
+    minx = math.floor(minx / width) * width
+    miny = math.floor(miny / height) * height
+    maxx = math.ceil(maxx / width) * width
+    maxy = math.ceil(maxy / height) * height
+    cols = np.arange(minx, maxx, width)
+    rows = np.arange(miny, maxy, height)
+    grid_cells = [box(x, y, x + width, y + height) for x in cols for y in rows]
+    return gpd.GeoDataFrame({'geometry': grid_cells}, crs=crs)
+
+
+def legacy_patch_roi(roi, tile_size_px, res_m):
+    roi = roi.to_crs(epsg=3857)
+    grid = legacy_create_grid(roi.total_bounds, tile_size_px, res_m, roi.crs)
+    clipped_tiles = gpd.sjoin(grid, roi, how='inner', predicate='intersects')
+    return clipped_tiles.reset_index(drop=True)
+
+
+def make_roi(num_cells: int) -> gpd.GeoDataFrame:
+    """Builds a two-feature ROI whose grid has roughly `num_cells` cells."""
+    side = math.isqrt(num_cells) * TILE_SIZE_PX * RES_M
+    radius = side / 2
+    centre = 1_000_000 + radius # Away from the lattice origin
+    discs = [
+        Point(centre, centre).buffer(radius, quad_segs=64),
+        Point(centre + radius / 4, centre).buffer(radius * 0.75, quad_segs=64),
+    ]
+    return gpd.GeoDataFrame({'name': ['a', 'b']}, geometry=discs, crs="EPSG:3857")
+
+
+def best_of(fn, repeats: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark grid generation and ROI patching")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--skip-legacy-above", type=int, default=1_000_000,
+                        help="Skip the legacy implementation for grids larger than this")
+    args = parser.parse_args()
+
+    header = f"{'cells':>10} | {'impl':>7} | {'create_grid (s)':>15} | {'patch_roi (s)':>13} | {'tiles':>8} | {'dupes':>6}"
+    print(header)
+    print("-" * len(header))
+    for num_cells in args.sizes:
+        roi = make_roi(num_cells)
+        impls = [("vector", create_grid, patch_roi)]
+        if num_cells <= args.skip_legacy_above:
+            impls.append(("legacy", legacy_create_grid, legacy_patch_roi))
+
+        for name, grid_fn, patch_fn in impls:
+            grid_s, grid = best_of(
+                lambda: grid_fn(roi.total_bounds, TILE_SIZE_PX, RES_M, roi.crs), args.repeats
+            )
+            patch_s, tiles = best_of(lambda: patch_fn(roi, TILE_SIZE_PX, RES_M), args.repeats)
+            dupes = len(tiles) - tiles.geometry.normalize().to_wkb().nunique()
+            print(f"{len(grid):>10} | {name:>7} | {grid_s:>15.3f} | {patch_s:>13.3f} | {len(tiles):>8} | {dupes:>6}")
+
+
+if __name__ == "__main__":
+    main()
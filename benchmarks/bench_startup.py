@@ -0,0 +1,91 @@
+"""
+Cold-Start Import Benchmark
+
+Measures the import time of the core package, the FastAPI app and the Celery worker module
+in fresh interpreters, using `python -X importtime`. Each target is imported in a new process
+per repeat, and the median total is reported along with the slowest modules of the last run.
+
+The backend targets are imported from `vegetationFLOW_tool/backend`, as in the containers.
+Importing them only needs the packages installed, not a running Redis or Earth Engine credentials.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --targets core --repeats 10 --top 20
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(REPO_ROOT, "vegetationFLOW_tool", "backend")
+
+# name -> (statement, working directory)
+TARGETS = {
+    "core": ("import vegetationFLOW_core", REPO_ROOT),
+    "core+downloader": ("from vegetationFLOW_core import LandsatDownloader", REPO_ROOT),
+    "api": ("import main", BACKEND_DIR),
+    "worker": ("import worker, tasks.download_task", BACKEND_DIR),
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Parses `-X importtime` output into (self_us, cumulative_us, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()[1:])) # Nested imports keep their indent
+    return rows
+
+
+def run_once(statement: str, cwd: str) -> tuple[float, int, list[tuple[int, int, str]]]:
+    """Imports `statement` in a fresh interpreter. Returns (wall seconds, total import us, rows)."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    total_us = sum(cumulative for _, cumulative, module in rows if not module.startswith(" ")) # Top-level imports
+    return wall, total_us, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules (by self time) to list per target")
+    args = parser.parse_args()
+
+    print(f"{'target':<18}{'wall [ms]':>12}{'imports [ms]':>15}{'modules':>10}")
+    slowest = {}
+    for name in args.targets:
+        statement, cwd = TARGETS[name]
+        try:
+            runs = [run_once(statement, cwd) for _ in range(args.repeats)]
+        except RuntimeError as e:
+            print(f"{name:<18}  failed: {e}")
+            continue
+        wall = statistics.median(run[0] for run in runs) * 1e3
+        total = statistics.median(run[1] for run in runs) / 1e3
+        rows = runs[-1][2]
+        print(f"{name:<18}{wall:>12.1f}{total:>15.1f}{len(rows):>10}")
+        slowest[name] = sorted(rows, reverse=True)[:args.top]
+
+    for name, rows in slowest.items():
+        print(f"\nSlowest modules: {name}")
+        for self_us, cumulative_us, module in rows:
+            print(f"  {self_us / 1e3:>9.1f} ms self {cumulative_us / 1e3:>9.1f} ms cumulative  {module.strip()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Offline Earth Engine Stand-In
+
+A minimal, local implementation of the `ee` API surface used by `LandsatDownloader`, for
+benchmarking without an Earth Engine account or network access. Install it before the
+downloader is imported:
+
+    import fake_ee
+    fake_ee.install(latency_s=0.05, tile_url="http://127.0.0.1:8765/tile")
+    from vegetationFLOW_core.datasets.landsat8 import LandsatDownloader
+
+Every request that would reach Earth Engine (`getInfo`, `getDownloadURL`) sleeps for the configured
+latency and is counted in `fake_ee.stats`, so round trips per tile can be measured. Scene counts and
+valid pixel fractions are deterministic per month and per tile, with configurable rates of empty months
+and invalid tiles. Download URLs point to a local tile server (see `tile_server.py`).
+"""
+
+import hashlib
+import sys
+import threading
+import time
+import urllib.parse
+
+import shapely.geometry
+
+
+class Config:
+    latency_s = 0.0              # Latency of every Earth Engine round trip
+    tile_url = "http://127.0.0.1:8765/tile"
+    scenes_per_month = 3
+    empty_month_rate = 0.0       # Fraction of months without scenes
+    invalid_tile_rate = 0.0      # Fraction of tiles with (almost) no valid pixels
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.get_info = 0
+        self.download_urls = 0
+
+    def record(self, kind):
+        time.sleep(config.latency_s)
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+
+    @property
+    def round_trips(self):
+        return self.get_info + self.download_urls
+
+
+config = Config()
+stats = Stats()
+
+
+def install(**settings):
+    """Registers this module as `ee` and applies `Config` settings (e.g. latency_s=0.05)."""
+    for key, value in settings.items():
+        if not hasattr(Config, key):
+            raise AttributeError(f"Unknown setting: {key}")
+        setattr(config, key, value)
+    sys.modules["ee"] = sys.modules[__name__]
+
+
+def Initialize(*args, **kwargs):
+    pass
+
+
+def _fraction(key, rate):
+    """Deterministic pseudo-random draw in [0, 1): below `rate` counts as a hit."""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") / 2 ** 64 < rate
+
+
+def _resolve(value):
+    if isinstance(value, ComputedObject):
+        return value.evaluate()
+    if isinstance(value, dict):
+        return {k: _resolve(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_resolve(v) for v in value]
+    return value
+
+
+class ComputedObject:
+    """A deferred value; `getInfo` is the (counted) round trip."""
+
+    def __init__(self, fn):
+        self._fn = fn
+
+    def evaluate(self):
+        return _resolve(self._fn())
+
+    def getInfo(self):
+        stats.record("get_info")
+        return self.evaluate()
+
+
+class Geometry(ComputedObject):
+    def __init__(self, geojson, proj=None, *args, **kwargs):
+        super().__init__(lambda: geojson)
+        self.geojson = geojson
+        self.shape = shapely.geometry.shape(geojson)
+
+
+class Reducer:
+    def __init__(self, kind, outputs=None):
+        self.kind = kind
+        self.outputs = outputs
+
+    @staticmethod
+    def sum():
+        return Reducer("sum")
+
+    @staticmethod
+    def count():
+        return Reducer("count")
+
+    def setOutputs(self, outputs):
+        return Reducer(self.kind, outputs)
+
+
+class Dictionary(ComputedObject):
+    def __init__(self, values):
+        super().__init__(lambda: values)
+        self.values = values
+
+    def get(self, key):
+        return ComputedObject(lambda: _resolve(self.values)[key])
+
+
+class List(ComputedObject):
+    def __init__(self, items):
+        items = items.items if isinstance(items, List) else list(items)
+        super().__init__(lambda: items)
+        self.items = items
+
+    def get(self, index):
+        return self.items[index]
+
+    def map(self, fn):
+        return List([fn(item) for item in self.items])
+
+
+class Feature:
+    def __init__(self, geometry, properties=None):
+        self.geometry = geometry
+        self.properties = dict(properties or {})
+
+
+class FeatureCollection:
+    def __init__(self, features):
+        self.features = list(features)
+
+    def aggregate_array(self, name):
+        return ComputedObject(lambda: [_resolve(f.properties[name]) for f in self.features])
+
+
+class Image:
+    """
+    A permissive image: band math and masking calls return the image unchanged, `clip` sets its footprint,
+    and reductions return the tile's deterministic valid pixel fraction.
+    """
+
+    def __init__(self, geometry=None, constant=False, num_bands=6):
+        self._geometry = geometry
+        self._constant = constant
+        self._num_bands = num_bands
+
+    @staticmethod
+    def constant(value):
+        return Image(constant=True)
+
+    @staticmethod
+    def cat(images):
+        return Image(num_bands=sum(image._num_bands for image in images))
+
+    def __getattr__(self, name):
+        # mask, unmask, multiply, add, addBands, updateMask, bitwiseAnd, eq, And, rename, toFloat, ...
+        return lambda *args, **kwargs: self
+
+    def select(self, bands, *args):
+        return Image(self._geometry, self._constant, len(bands) if isinstance(bands, list) else 1)
+
+    def clip(self, geometry):
+        return Image(geometry, self._constant, self._num_bands)
+
+    def geometry(self):
+        return self._geometry
+
+    def _pixels(self, geom, scale):
+        total = geom.shape.area / scale ** 2
+        if self._constant:
+            return total, total
+        invalid = _fraction(geom.shape.bounds, config.invalid_tile_rate)
+        return total, total * (0.02 if invalid else 0.9)
+
+    def reduceRegion(self, reducer, geometry, scale, *args, **kwargs):
+        total, valid = self._pixels(geometry, scale)
+        value = total if reducer.kind == "count" else valid
+        return Dictionary({"SR_B4": value, "constant": value})
+
+    def reduceRegions(self, collection, reducer, scale, crs=None, *args, **kwargs):
+        features = []
+        for feature in collection.features:
+            _, valid = self._pixels(feature.geometry, scale)
+            name = (reducer.outputs or [reducer.kind])[0]
+            features.append(Feature(feature.geometry, {**feature.properties, name: valid}))
+        return FeatureCollection(features)
+
+    def getDownloadURL(self, params):
+        stats.record("download_urls")
+        minx, miny, maxx, maxy = shapely.geometry.shape(_resolve(params["region"])).bounds
+        width, height = params["dimensions"]
+        query = urllib.parse.urlencode({
+            "width": width, "height": height, "bands": self._num_bands, "minx": minx, "miny": miny, "maxx": maxx, "maxy": maxy,
+        })
+        return f"{config.tile_url}?{query}"
+
+
+class ImageCollection:
+    def __init__(self, collection_id, start=None, end=None):
+        self.collection_id = collection_id
+        self.start = start
+
+    def filterBounds(self, geometry):
+        return self
+
+    def filterDate(self, start, end):
+        return ImageCollection(self.collection_id, start, end)
+
+    def map(self, fn):
+        return self
+
+    def size(self):
+        empty = _fraction(("month", self.start), config.empty_month_rate)
+        return ComputedObject(lambda: 0 if empty else config.scenes_per_month)
+
+    def median(self):
+        return Image()
@@ -0,0 +1,132 @@
+"""
+Synthetic GeoTIFF Tile Server
+
+A local HTTP server answering the download URLs produced by `fake_ee` with synthetic,
+georeferenced float32 GeoTIFFs (6 bands, or as many as the requested image has). Response latency, the rate of 500 errors and the
+rate of 429 (rate limited) responses are configurable, so retry and backoff paths are
+exercised as well.
+
+    server = TileServer(latency_s=0.02, error_rate=0.01, rate_limit_rate=0.05).start()
+    ...
+    server.stop()
+"""
+
+import random
+import threading
+import time
+import urllib.parse
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from rasterio.io import MemoryFile
+from rasterio.transform import from_bounds
+
+N_BANDS = 6
+
+
+@lru_cache(maxsize=8)
+def _pixels(width: int, height: int, bands: int) -> np.ndarray:
+    rng = np.random.default_rng(width * 100003 + height)
+    return rng.uniform(0.0, 0.5, size=(bands, height, width)).astype(np.float32)
+
+
+def make_geotiff(width: int, height: int, bounds: tuple[float, float, float, float], bands: int = N_BANDS) -> bytes:
+    """Encodes a synthetic tile covering `bounds` (EPSG:3857) as GeoTIFF bytes."""
+    with MemoryFile() as memfile:
+        with memfile.open(
+                driver="GTiff", width=width, height=height, count=bands, dtype="float32",
+                crs="EPSG:3857", transform=from_bounds(*bounds, width, height)
+        ) as dst:
+            dst.write(_pixels(width, height, bands))
+        return memfile.read()
+
+
+class TileServer:
+    """
+    Serves synthetic tiles on 127.0.0.1 from a background thread.
+
+    Attributes:
+        url (str): The tile endpoint, to be passed to `fake_ee.install(tile_url=...)`.
+        requests (int): Number of requests received.
+        errors (int): Number of 500 responses sent.
+        rate_limited (int): Number of 429 responses sent.
+        bytes_sent (int): Total body bytes of successful responses.
+    """
+
+    def __init__(
+            self,
+            port: int = 0,
+            latency_s: float = 0.0,
+            error_rate: float = 0.0,
+            rate_limit_rate: float = 0.0,
+            seed: int = 0
+    ) -> None:
+        self.latency_s = latency_s
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = self.errors = self.rate_limited = self.bytes_sent = 0
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, like the EE download endpoint
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/tile"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self) -> "TileServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = self.errors = self.rate_limited = self.bytes_sent = 0
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests += 1
+            draw = self._random.random()
+        time.sleep(self.latency_s)
+
+        if draw < self.rate_limit_rate:
+            with self._lock:
+                self.rate_limited += 1
+            self._send(handler, 429, b"Too Many Requests", {"Retry-After": "0"})
+            return
+        if draw < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.errors += 1
+            self._send(handler, 500, b"Internal Server Error")
+            return
+
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(handler.path).query)
+        width, height = int(query["width"][0]), int(query["height"][0])
+        bounds = tuple(float(query[key][0]) for key in ("minx", "miny", "maxx", "maxy"))
+        bands = int(query.get("bands", [N_BANDS])[0])
+        body = make_geotiff(width, height, bounds, bands)
+        with self._lock:
+            self.bytes_sent += len(body)
+        self._send(handler, 200, body, {"Content-Type": "image/tiff"})
+
+    @staticmethod
+    def _send(handler: BaseHTTPRequestHandler, status: int, body: bytes, headers: dict = None) -> None:
+        handler.send_response(status)
+        for key, value in {"Content-Length": str(len(body)), **(headers or {})}.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -33,7 +33,12 @@ setup(
         'earthengine-api',
         'shapely',
         'geopandas',
+        'requests',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'datacube': ['zarr', 'numcodecs'],
+    },
     python_requires='>=3.8',
     author='Yashna Kumar and Sally Paing',
     author_email='p4p.vegetationflow@gmail.com',
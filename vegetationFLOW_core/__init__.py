@@ -1,5 +1,13 @@
 __version__ = "0.1.0"
 
-from .datasets.landsat8 import LandsatDownloader
-from . import utils
-from . import preprocessing
\ No newline at end of file
+from vegetationFLOW_core.utils.lazy import lazy_module
+
+# Heavy submodules (ee, geopandas, rasterio, torch) are only imported when first accessed
+__getattr__, __dir__, __all__ = lazy_module(
+    __name__,
+    {
+        "LandsatDownloader": ".datasets.landsat8",
+    },
+    modules=("utils", "preprocessing", "datasets", "inference"),
+    exports=("__version__",)
+)
@@ -0,0 +1,273 @@
+"""
+Asyncio Download Engine
+
+This module contains an asyncio-based alternative to the `ThreadPoolExecutor` used by
+`LandsatDownloader.startDownload`. Blocking Earth Engine calls run in a small, bounded
+executor while tile GeoTIFFs are fetched with native async HTTP, so hundreds of transfers
+can be in flight without hundreds of OS threads.
+
+Requires the optional `aiohttp` dependency (`pip install vegetationFLOW_core[async]`).
+
+Classes:
+--------
+- AsyncDownloadEngine
+    Runs the monthly composite downloads of a `LandsatDownloader` on an event loop.
+"""
+
+import os
+import asyncio
+import hashlib
+import time
+import concurrent.futures
+from functools import partial
+from typing import Optional, TYPE_CHECKING
+
+import ee
+import geopandas as gpd
+
+from vegetationFLOW_core.utils import FetchResult
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+if TYPE_CHECKING:
+    from vegetationFLOW_core.datasets.landsat8 import LandsatDownloader
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class AsyncDownloadEngine:
+    """
+    Downloads monthly composites for a `LandsatDownloader` on an asyncio event loop.
+
+    Earth Engine calls (composite loading, validity checks, URL signing) are blocking and are run
+    in a thread pool of `ee_concurrency` threads. Tile fetches use a single `aiohttp` session whose
+    connection pool and semaphore are limited to `http_concurrency` concurrent transfers. Disk work
+    (manifest and catalog updates, tile storage, file writes) runs in the loop's default executor, so
+    it never stalls the transfers in flight. A month that fails is logged and the others continue.
+
+    Attributes:
+        downloader (LandsatDownloader): The downloader providing EE calls, paths, logging and the manifest.
+        ee_concurrency (int): Maximum number of concurrent Earth Engine calls.
+        http_concurrency (int): Maximum number of concurrent tile transfers.
+    """
+
+    def __init__(
+            self,
+            downloader: "LandsatDownloader",
+            ee_concurrency: int = 4,
+            http_concurrency: int = 64,
+            max_retries: int = 3,
+            backoff_factor: float = 1.0,
+            chunk_size: int = 1 << 20
+    ) -> None:
+        """
+        Initializes the engine.
+
+        Args:
+            downloader (LandsatDownloader): The downloader to run.
+            ee_concurrency (int): Number of threads running blocking Earth Engine calls.
+            http_concurrency (int): Maximum number of tile transfers in flight.
+            max_retries (int): Retries on connection errors, 429 and 5xx responses.
+            backoff_factor (float): Exponential backoff factor between retries (honours Retry-After).
+            chunk_size (int): Size in bytes of the chunks streamed to disk.
+
+        Raises:
+            ImportError: If `aiohttp` is not installed.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "The asyncio download engine requires aiohttp: pip install vegetationFLOW_core[async]"
+            )
+        self.downloader = downloader
+        self.ee_concurrency = ee_concurrency
+        self.http_concurrency = http_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.chunk_size = chunk_size
+
+    def run(
+            self,
+            ROI_grid_gdf: gpd.GeoDataFrame,
+            month_jobs: list[tuple[str, str, str]],
+            roi_ee: Optional[ee.Geometry] = None
+    ) -> None:
+        """
+        Downloads every month of the job and blocks until all tiles are done.
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame): The ROI grid tiles.
+            month_jobs (list[tuple[str, str, str]]): (startDate, endDate, filename) of each month,
+                already filtered to months with scenes by `LandsatDownloader.planMonths`.
+            roi_ee (ee.Geometry | None): Precomputed ROI geometry shared by all months.
+        """
+        asyncio.run(self._run(ROI_grid_gdf, month_jobs, roi_ee))
+
+    async def _run(self, ROI_grid_gdf, month_jobs, roi_ee) -> None:
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.ee_concurrency,
+            thread_name_prefix="ee"
+        )
+        self._http_slots = asyncio.Semaphore(self.http_concurrency)
+        connect_timeout, read_timeout = self.downloader.http.timeout
+        timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        connector = aiohttp.TCPConnector(limit=self.http_concurrency)
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                self._session = session
+                await asyncio.gather(*(
+                    self._downloadMonth(ROI_grid_gdf, start_date, end_date, filename, roi_ee)
+                    for start_date, end_date, filename in month_jobs
+                ))
+        finally:
+            self._executor.shutdown(wait=True)
+
+    async def _ee(self, fn, *args, **kwargs):
+        """Runs a blocking Earth Engine call in the bounded executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def _downloadMonth(self, ROI_grid_gdf, startDate, endDate, filename, roi_ee) -> None:
+        """Downloads one month; errors are logged so they do not abort the other months."""
+        try:
+            await self._downloadMonthTiles(ROI_grid_gdf, startDate, endDate, filename, roi_ee)
+        except Exception as e:
+            print(f"Failed to download {filename[:7]}: {e}")
+            self.downloader.log.addError(f"Failed to download {filename[:7]}: {e}")
+
+    async def _downloadMonthTiles(self, ROI_grid_gdf, startDate, endDate, filename, roi_ee) -> None:
+        dl = self.downloader
+        month = os.path.splitext(filename)[0]
+        # Reading the manifest, linking cached tiles and storing them is disk work, keep it off the event loop
+        ROI_grid_gdf = await asyncio.to_thread(dl.pendingTiles, ROI_grid_gdf, filename)
+        ROI_grid_gdf = await asyncio.to_thread(dl.restoreCached, ROI_grid_gdf, filename)
+        if len(ROI_grid_gdf) == 0:
+            return
+
+        composite = await self._ee(
+            dl.load_ee_composite, ROI_grid_gdf, startDate, endDate,
+            roi_ee=roi_ee, check_empty=False
+        )
+        if composite is None:
+            return
+
+        ROI_grid_gdf = ROI_grid_gdf.to_crs(epsg=3857)
+        if dl.validity_mode == "batched":
+            valid_fraction = await self._ee(dl.checkTilesValidity, composite, ROI_grid_gdf)
+            is_valid = valid_fraction > dl.MIN_VALID_FRACTION
+            for tile_key in ROI_grid_gdf["tile_key"][~is_valid]:
+                await asyncio.to_thread(dl.skipTile, tile_key, month)
+            ROI_grid_gdf = ROI_grid_gdf[is_valid]
+
+        await asyncio.gather(*(
+            self._downloadTile(composite, i, cell, month, filename)
+            for i, cell in ROI_grid_gdf.iterrows()
+        ))
+
+    async def _downloadTile(self, composite, i, cell, month, filename) -> None:
+        dl = self.downloader
+        tile_key = dl.tileKey(cell)
+        tile_image, tile_geom_ee = dl.tileImage(composite, cell.geometry)
+        filepath = dl.downloadPath(tile_key, filename)
+        try:
+            if dl.validity_mode == "per_tile":
+                if not await self._ee(dl.checkTileValidity, tile_image=tile_image, tile_geom_ee=tile_geom_ee):
+                    await asyncio.to_thread(dl.skipTile, tile_key, month)
+                    return
+            url = await self._ee(dl.getTileURL, tile_image, img_size=int(cell.get("tile_size_px", dl.img_size)))
+            await asyncio.to_thread(os.makedirs, os.path.dirname(filepath), exist_ok=True)
+            result = await self.fetch(url, filepath)
+            if result.ok:
+                # Rewriting as a COG or into a datacube is CPU work, keep it off the event loop
+                result = await asyncio.to_thread(dl.storeTile, tile_key, month, filepath, result)
+        except Exception as e:
+            await asyncio.to_thread(dl.recordDownload, tile_key, month, filepath, None, error=e)
+            return
+        # Manifest, catalog (reads the tile) and log writes
+        await asyncio.to_thread(dl.recordDownload, tile_key, month, filepath, result)
+
+    async def fetch(self, url: str, filepath: str) -> FetchResult:
+        """
+        Streams a URL to disk, retrying on 429 and 5xx responses.
+
+        Like `HTTPDownloader.fetch`, the body is written to a `.part` file and atomically renamed,
+        and the request is added to the downloader's HTTP counters. The "fetch" stage latency covers
+        the attempts themselves, not the wait for a transfer slot or the backoff between attempts.
+
+        Args:
+            url (str): The URL to download.
+            filepath (str): Local path to write the response body to.
+
+        Returns:
+            FetchResult: Status, byte count, checksum and timings of the final attempt.
+        """
+        fetch_s = 0.0
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with self._http_slots:
+                    start = time.perf_counter() # Timed from here, so queueing for a slot is not counted
+                    try:
+                        result, retry_after = await self._fetchOnce(url, filepath)
+                    except (aiohttp.ClientError, asyncio.TimeoutError):
+                        if attempt == self.max_retries:
+                            raise
+                        retry_after = None
+                    else:
+                        if result.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                            return result
+                    finally:
+                        fetch_s += time.perf_counter() - start
+                await asyncio.sleep(retry_after or self.backoff_factor * (2 ** attempt))
+        finally:
+            self.downloader.metrics.observe("fetch", fetch_s)
+
+    async def _fetchOnce(self, url: str, filepath: str) -> tuple[FetchResult, Optional[float]]:
+        tmp_path = f"{filepath}.part"
+        start = time.perf_counter()
+        num_bytes = 0
+        checksum = None
+        retry_after = None
+        try:
+            async with self._session.get(url) as r:
+                latency = time.perf_counter() - start
+                if r.status == 200:
+                    digest = hashlib.sha256()
+                    f = await asyncio.to_thread(open, tmp_path, "wb")
+                    try:
+                        async for chunk in r.content.iter_chunked(self.chunk_size):
+                            await asyncio.to_thread(self._writeChunk, f, digest, chunk)
+                            num_bytes += len(chunk)
+                    finally:
+                        await asyncio.to_thread(f.close)
+                    await asyncio.to_thread(os.replace, tmp_path, filepath)
+                    checksum = digest.hexdigest()
+                elif r.headers.get("Retry-After", "").isdigit():
+                    retry_after = float(r.headers["Retry-After"])
+                status_code = r.status
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.downloader.http.record(ok=False, num_bytes=0, latency=0.0, duration=time.perf_counter() - start)
+            raise
+
+        result = FetchResult(
+            url=url,
+            filepath=filepath,
+            status_code=status_code,
+            num_bytes=num_bytes,
+            sha256=checksum,
+            latency_s=latency,
+            duration_s=time.perf_counter() - start,
+        )
+        self.downloader.http.record(
+            ok=result.ok, num_bytes=num_bytes, latency=result.latency_s, duration=result.duration_s
+        )
+        return result, retry_after
+
+    @staticmethod
+    def _writeChunk(f, digest, chunk: bytes) -> None:
+        """Writes a chunk and adds it to the checksum (runs in the default executor)."""
+        f.write(chunk)
+        digest.update(chunk)
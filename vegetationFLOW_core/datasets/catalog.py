@@ -0,0 +1,248 @@
+"""
+Tile Catalog
+
+This module keeps a spatial index of the tiles downloaded into a dataset, so that tiles can be
+selected by area, time and quality without walking the dataset directory or opening any GeoTIFF.
+
+The catalog is a SQLite database in the dataset directory (`catalog.sqlite`) with an R-tree over
+the tiles' EPSG:3857 bounds. It is written by `LandsatDownloader` as tiles are stored and can be
+read concurrently, e.g. by the API while a download is still running.
+
+Classes:
+--------
+- TileCatalog
+    SQLite / R-tree index of the (tile, month) pairs of a dataset.
+
+Functions:
+----------
+- band_stats(image, bands, nodata) -> tuple[float, dict]
+    Valid pixel fraction and per-band statistics of a tile.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Optional
+
+
+def band_stats(image, bands: list[str], nodata: Optional[float] = 0.0) -> tuple[float, dict]:
+    """
+    Computes the valid pixel fraction and per-band statistics of a tile.
+
+    A pixel is valid if all its bands are finite and at least one differs from `nodata`
+    (masked pixels are downloaded from Earth Engine as 0).
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Array of shape (band, y, x).
+    bands : list[str]
+        Band names, in the order of the first axis of `image`.
+    nodata : float | None
+        Value of masked pixels, or None if only non-finite values are masked.
+
+    Returns
+    -------
+    tuple[float, dict]
+        The valid fraction (0 - 1) and {band: {"min", "max", "mean", "std"}} over the valid pixels
+        (None values if no pixel is valid).
+    """
+    import numpy as np # Only needed when writing; readers of the catalog do not load numpy
+
+    valid = np.isfinite(image).all(axis=0)
+    if nodata is not None:
+        valid &= (image != nodata).any(axis=0)
+    num_valid = int(valid.sum())
+
+    stats = {}
+    for band, values in zip(bands, image):
+        values = values[valid].astype(np.float64)
+        if num_valid == 0:
+            stats[band] = {"min": None, "max": None, "mean": None, "std": None}
+        else:
+            stats[band] = {
+                "min": round(float(values.min()), 6),
+                "max": round(float(values.max()), 6),
+                "mean": round(float(values.mean()), 6),
+                "std": round(float(values.std()), 6),
+            }
+    return num_valid / valid.size if valid.size else 0.0, stats
+
+
+class TileCatalog:
+    """
+    A spatial index of the (tile, month) pairs stored in a dataset.
+
+    Every pair is one row with its EPSG:3857 bounds, valid pixel fraction, file path, size and
+    band statistics. Bounds are also kept in an R-tree, so bounding box queries only visit the
+    tiles they overlap. Writes are serialized by a lock and committed immediately; the database
+    runs in WAL mode so other processes can query it while it is written.
+
+    Attributes:
+        path (str): Path of the SQLite database.
+    """
+
+    FILENAME = "catalog.sqlite"
+    COLUMNS = ("tile", "month", "minx", "miny", "maxx", "maxy", "valid_fraction", "path", "bytes", "band_stats")
+
+    def __init__(self, dataset_dir: str, read_only: bool = False) -> None:
+        """
+        Opens the catalog of a dataset directory, creating it if needed.
+
+        Args:
+            dataset_dir (str): The dataset directory the catalog belongs to.
+            read_only (bool): Open an existing catalog for queries only.
+
+        Raises:
+            FileNotFoundError: If `read_only` and the dataset has no catalog.
+        """
+        self.path = os.path.join(dataset_dir, self.FILENAME)
+        if read_only and not os.path.exists(self.path):
+            raise FileNotFoundError(f"No tile catalog at {self.path}")
+
+        uri = f"file:{self.path}?mode=ro" if read_only else f"file:{self.path}"
+        self._conn = sqlite3.connect(uri, uri=True, timeout=30.0, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        if not read_only:
+            self._createTables()
+
+    def _createTables(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tiles (
+                    id INTEGER PRIMARY KEY,
+                    tile TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    minx REAL, miny REAL, maxx REAL, maxy REAL,
+                    valid_fraction REAL,
+                    path TEXT,
+                    bytes INTEGER,
+                    band_stats TEXT,
+                    UNIQUE (tile, month)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tiles_month ON tiles (month)")
+            self._conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS tiles_rtree USING rtree(id, minx, maxx, miny, maxy)")
+
+    def add(
+            self,
+            tile: str,
+            month: str,
+            bounds: tuple[float, float, float, float],
+            valid_fraction: float,
+            path: str,
+            num_bytes: int,
+            stats: Optional[dict] = None
+    ) -> None:
+        """
+        Adds a (tile, month) pair to the catalog, replacing any previous entry of the pair.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            bounds (tuple[float, float, float, float]): (minx, miny, maxx, maxy) in EPSG:3857.
+            valid_fraction (float): Fraction (0 - 1) of valid pixels.
+            path (str): Path of the stored tile (the datacube path in "datacube" output format).
+            num_bytes (int): Size of the stored tile in bytes.
+            stats (dict | None): Per-band statistics, see `band_stats`.
+        """
+        minx, miny, maxx, maxy = (float(v) for v in bounds)
+        with self._lock, self._conn:
+            row_id = self._conn.execute(
+                """
+                INSERT INTO tiles (tile, month, minx, miny, maxx, maxy, valid_fraction, path, bytes, band_stats)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (tile, month) DO UPDATE SET
+                    minx=excluded.minx, miny=excluded.miny, maxx=excluded.maxx, maxy=excluded.maxy,
+                    valid_fraction=excluded.valid_fraction, path=excluded.path, bytes=excluded.bytes,
+                    band_stats=excluded.band_stats
+                RETURNING id
+                """,
+                (tile, month, minx, miny, maxx, maxy, float(valid_fraction), path, int(num_bytes), json.dumps(stats))
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tiles_rtree (id, minx, maxx, miny, maxy) VALUES (?, ?, ?, ?, ?)",
+                (row_id, minx, maxx, miny, maxy)
+            )
+
+    def query(
+            self,
+            bbox: Optional[tuple[float, float, float, float]] = None,
+            crs: str = "EPSG:3857",
+            start_month: Optional[str] = None,
+            end_month: Optional[str] = None,
+            min_valid_fraction: float = 0.0,
+            tiles: Optional[list[str]] = None,
+            limit: Optional[int] = None
+    ) -> list[dict]:
+        """
+        Finds the catalogued tiles matching an area, time range and quality threshold.
+
+        E.g. the tiles covering a bounding box in 2019 Q3 with more than half of their pixels valid:
+
+            catalog.query(bbox, crs="EPSG:4326", start_month="2019-07", end_month="2019-09", min_valid_fraction=0.5)
+
+        Args:
+            bbox (tuple[float, float, float, float] | None): (minx, miny, maxx, maxy) the tiles must intersect.
+                None matches every tile.
+            crs (str): CRS of `bbox`. Other CRSs than EPSG:3857 are transformed with pyproj.
+            start_month (str | None): First month ('YYYY-MM'), inclusive.
+            end_month (str | None): Last month ('YYYY-MM'), inclusive.
+            min_valid_fraction (float): Minimum valid pixel fraction, inclusive.
+            tiles (list[str] | None): Only these tile keys.
+            limit (int | None): Maximum number of results.
+
+        Returns:
+            list[dict]: The matching entries, ordered by month then tile, with their `bounds`
+                as (minx, miny, maxx, maxy) and `band_stats` as a dict.
+        """
+        clauses, params = ["t.valid_fraction >= ?"], [min_valid_fraction]
+        table = "tiles t"
+        if bbox is not None:
+            if crs.upper() != "EPSG:3857":
+                from pyproj import Transformer
+                bbox = Transformer.from_crs(crs, "EPSG:3857", always_xy=True).transform_bounds(*bbox)
+            table = "tiles t JOIN tiles_rtree r ON r.id = t.id"
+            clauses += ["r.minx <= ?", "r.maxx >= ?", "r.miny <= ?", "r.maxy >= ?"]
+            params += [bbox[2], bbox[0], bbox[3], bbox[1]]
+        if start_month is not None:
+            clauses.append("t.month >= ?")
+            params.append(start_month)
+        if end_month is not None:
+            clauses.append("t.month <= ?")
+            params.append(end_month)
+        if tiles is not None:
+            clauses.append(f"t.tile IN ({', '.join('?' * len(tiles))})")
+            params += list(tiles)
+
+        sql = (f"SELECT {', '.join('t.' + column for column in self.COLUMNS)} FROM {table} "
+               f"WHERE {' AND '.join(clauses)} ORDER BY t.month, t.tile")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "tile": row["tile"],
+                "month": row["month"],
+                "bounds": (row["minx"], row["miny"], row["maxx"], row["maxy"]),
+                "valid_fraction": row["valid_fraction"],
+                "path": row["path"],
+                "bytes": row["bytes"],
+                "band_stats": json.loads(row["band_stats"]) if row["band_stats"] else None,
+            }
+            for row in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
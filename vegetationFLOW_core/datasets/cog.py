@@ -0,0 +1,169 @@
+"""
+Cloud-Optimized GeoTIFF Output
+
+This module rewrites downloaded tiles as Cloud-Optimized GeoTIFFs (internally tiled, compressed
+with a predictor, with overviews) and builds per-month VRT mosaics over them, so a whole ROI
+can be previewed or partially read without decoding every full-resolution tile.
+
+Functions:
+----------
+- to_cog(src_path, dst_path, ...) -> str
+    Rewrites a GeoTIFF as a COG.
+
+- build_vrt(tile_paths, vrt_path) -> str
+    Writes a VRT mosaic over tiles sharing a CRS, resolution and band layout.
+
+- file_sha256(path) -> str
+    SHA-256 hex digest of a file.
+"""
+
+import os
+import hashlib
+from typing import Literal, Optional
+from xml.sax.saxutils import escape
+
+import numpy as np
+import rasterio
+import rasterio.shutil
+
+# GDAL data type names of the VRT bands
+GDAL_DTYPES = {
+    "uint8": "Byte", "uint16": "UInt16", "int16": "Int16", "uint32": "UInt32",
+    "int32": "Int32", "float32": "Float32", "float64": "Float64",
+}
+
+
+def to_cog(
+        src_path: str,
+        dst_path: Optional[str] = None,
+        compress: Literal["deflate", "zstd"] = "deflate",
+        blocksize: int = 128,
+        resampling: str = "average"
+) -> str:
+    """
+    Rewrites a GeoTIFF as a Cloud-Optimized GeoTIFF.
+
+    The output is internally tiled with `blocksize` blocks, compressed with the floating point
+    (or horizontal, for integer data) predictor, and has overviews down to a single block.
+
+    Parameters
+    ----------
+    src_path : str
+        The GeoTIFF to convert.
+    dst_path : str | None
+        The output path. None rewrites `src_path` in place (through a temporary file).
+    compress : str
+        "deflate" (readable everywhere) or "zstd" (faster, smaller; requires GDAL built with ZSTD).
+    blocksize : int
+        Internal tile size in pixels. Overviews are built until the image fits in one block.
+    resampling : str
+        Resampling method of the overviews.
+
+    Returns
+    -------
+    str
+        The path of the COG.
+    """
+    dst_path = dst_path or src_path
+    tmp_path = dst_path + ".cog.part"
+    with rasterio.open(src_path) as src:
+        is_float = np.issubdtype(np.dtype(src.dtypes[0]), np.floating)
+    try:
+        rasterio.shutil.copy(
+            src_path, tmp_path, driver="COG",
+            COMPRESS=compress.upper(),
+            PREDICTOR="FLOATING_POINT" if is_float else "YES",
+            BLOCKSIZE=blocksize,
+            OVERVIEWS="IGNORE_EXISTING",
+            RESAMPLING=resampling.upper(),
+        )
+        os.replace(tmp_path, dst_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return dst_path
+
+
+def build_vrt(tile_paths: list[str], vrt_path: str) -> str:
+    """
+    Writes a VRT mosaic over a set of tiles.
+
+    The tiles must share a CRS, resolution, band count and data type (as the tiles of one month of
+    a dataset do). Sources are referenced relative to the VRT, so the dataset directory can be moved.
+    GDAL reads source overviews when the VRT is read at a lower resolution.
+
+    Parameters
+    ----------
+    tile_paths : list[str]
+        The tiles of the mosaic.
+    vrt_path : str
+        Path of the output VRT.
+
+    Returns
+    -------
+    str
+        `vrt_path`.
+
+    Raises
+    ------
+    ValueError
+        If `tile_paths` is empty or the tiles do not share a grid.
+    """
+    if len(tile_paths) == 0:
+        raise ValueError("No tiles to mosaic")
+
+    sources = []
+    for path in tile_paths:
+        with rasterio.open(path) as src:
+            sources.append((path, src.bounds, src.width, src.height, src.res, src.crs,
+                            src.count, src.dtypes[0], src.nodata, src.descriptions))
+    _, _, _, _, (res_x, res_y), crs, count, dtype, nodata, descriptions = sources[0]
+    for path, _, _, _, res, src_crs, src_count, src_dtype, _, _ in sources[1:]:
+        if not np.allclose(res, (res_x, res_y)) or src_crs != crs or (src_count, src_dtype) != (count, dtype):
+            raise ValueError(f"{path} is not on the same grid as {tile_paths[0]}")
+
+    bounds = np.asarray([source[1] for source in sources])
+    left, top = bounds[:, 0].min(), bounds[:, 3].max()
+    width = int(round((bounds[:, 2].max() - left) / res_x))
+    height = int(round((top - bounds[:, 1].min()) / res_y))
+
+    vrt_dir = os.path.dirname(os.path.abspath(vrt_path))
+    lines = [
+        f'<VRTDataset rasterXSize="{width}" rasterYSize="{height}">',
+        f"  <SRS>{escape(crs.to_wkt())}</SRS>",
+        f"  <GeoTransform>{left!r}, {res_x!r}, 0.0, {top!r}, 0.0, {-res_y!r}</GeoTransform>",
+    ]
+    for band in range(1, count + 1):
+        lines.append(f'  <VRTRasterBand dataType="{GDAL_DTYPES[dtype]}" band="{band}">')
+        if descriptions[band - 1]:
+            lines.append(f"    <Description>{escape(descriptions[band - 1])}</Description>")
+        if nodata is not None:
+            lines.append(f"    <NoDataValue>{'nan' if np.isnan(nodata) else nodata}</NoDataValue>")
+        for path, (src_left, _, _, src_top), src_width, src_height, *_ in sources:
+            x_off = int(round((src_left - left) / res_x))
+            y_off = int(round((top - src_top) / res_y))
+            rel_path = os.path.relpath(os.path.abspath(path), vrt_dir)
+            lines += [
+                "    <SimpleSource>",
+                f'      <SourceFilename relativeToVRT="1">{escape(rel_path)}</SourceFilename>',
+                f"      <SourceBand>{band}</SourceBand>",
+                f'      <SrcRect xOff="0" yOff="0" xSize="{src_width}" ySize="{src_height}" />',
+                f'      <DstRect xOff="{x_off}" yOff="{y_off}" xSize="{src_width}" ySize="{src_height}" />',
+                "    </SimpleSource>",
+            ]
+        lines.append("  </VRTRasterBand>")
+    lines.append("</VRTDataset>")
+
+    os.makedirs(vrt_dir, exist_ok=True)
+    with open(vrt_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return vrt_path
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Returns the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,250 @@
+"""
+Tile Datacube Store
+
+This module contains a chunked, compressed array store for downloaded tile time series,
+as an alternative to one GeoTIFF per (tile, month). The data is held in a single Zarr
+array of shape (tile, time, band, y, x), so a pixel's time series or one band across
+all months is read from the few chunks that hold it instead of decoding every file.
+
+Requires the optional `zarr` dependency (`pip install vegetationFLOW_core[datacube]`).
+
+Classes:
+--------
+- TileDatacube
+    Creates, writes (thread-safe) and lazily reads a tile datacube.
+"""
+
+import threading
+from typing import Optional, Union
+
+import numpy as np
+import rasterio
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+# Chunk shapes (tile, time, band, y, x) tuned per access pattern
+CHUNK_PRESETS = {
+    "spatial": lambda n_months, n_bands, size: (1, 1, n_bands, size, size),        # Whole tile-months (training)
+    "timeseries": lambda n_months, n_bands, size: (1, n_months, n_bands, 64, 64),  # Pixel time series
+    "band": lambda n_months, n_bands, size: (1, n_months, 1, size, size),          # One band over all months
+}
+
+
+def _require_zarr() -> None:
+    if zarr is None:
+        raise ImportError("The datacube store requires zarr: pip install vegetationFLOW_core[datacube]")
+
+
+class TileDatacube:
+    """
+    A chunked (tile, time, band, y, x) array store for a downloaded dataset.
+
+    The store is a Zarr group with a float32 `data` array (NaN where nothing was written) and a
+    `transform` array holding each tile's affine geotransform. Tile keys, months, band names and the
+    CRS are stored as group attributes.
+
+    Writes from several download threads are safe: each write locks the chunks it touches, so
+    partial-chunk read-modify-writes do not interleave. The locks only hold within one process, so
+    processes must not write chunks of the same store concurrently. Reads are lazy and only decode the chunks
+    overlapping the requested slice.
+
+    Attributes:
+        path (str): Path of the Zarr store.
+        tiles (list[str]): Tile keys, in tile-axis order.
+        months (list[str]): Months ('YYYY-MM'), in time-axis order.
+        bands (list[str]): Band names, in band-axis order.
+        data: The Zarr data array.
+    """
+
+    FILENAME = "datacube.zarr"
+
+    def __init__(self, path: str, mode: str = "r") -> None:
+        """
+        Opens an existing datacube.
+
+        Args:
+            path (str): Path of the Zarr store.
+            mode (str): "r" for read-only, "r+" to write tiles.
+        """
+        _require_zarr()
+        self.path = path
+        self.group = zarr.open_group(path, mode=mode)
+        self.data = self.group["data"]
+        self.transform = self.group["transform"]
+        self.tiles = list(self.group.attrs["tiles"])
+        self.months = list(self.group.attrs["months"])
+        self.bands = list(self.group.attrs["bands"])
+        self.crs = self.group.attrs.get("crs")
+
+        self._tile_idx = {tile: i for i, tile in enumerate(self.tiles)}
+        self._month_idx = {month: i for i, month in enumerate(self.months)}
+        self._locks: dict[tuple[int, int], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    @classmethod
+    def create(
+            cls,
+            path: str,
+            tiles: list[str],
+            months: list[str],
+            bands: list[str],
+            img_size: int,
+            chunks: Union[str, tuple[int, int, int, int, int]] = "spatial",
+            clevel: int = 5,
+            crs: Optional[str] = "EPSG:3857"
+    ) -> "TileDatacube":
+        """
+        Creates an empty datacube, or opens it if one with the same layout already exists.
+
+        Args:
+            path (str): Path of the Zarr store.
+            tiles (list[str]): Tile keys.
+            months (list[str]): Months in 'YYYY-MM' format.
+            bands (list[str]): Band names.
+            img_size (int): Tile size in pixels (tiles are square).
+            chunks (str | tuple): A preset from `CHUNK_PRESETS` ("spatial", "timeseries", "band")
+                or an explicit (tile, time, band, y, x) chunk shape.
+            clevel (int): Zstd compression level.
+            crs (str | None): CRS of the tiles.
+
+        Returns:
+            TileDatacube: The datacube, opened for writing.
+
+        Raises:
+            ValueError: If a datacube with a different layout already exists at `path`.
+        """
+        _require_zarr()
+        if isinstance(chunks, str):
+            if chunks not in CHUNK_PRESETS:
+                raise ValueError(f"Invalid chunks preset: {chunks}. Must be one of {list(CHUNK_PRESETS)}")
+            chunks = CHUNK_PRESETS[chunks](len(months), len(bands), img_size)
+        shape = (len(tiles), len(months), len(bands), img_size, img_size)
+        chunks = tuple(min(c, s) for c, s in zip(chunks, shape))
+
+        group = zarr.open_group(path, mode="a")
+        if "data" in group:
+            if (tuple(group["data"].shape) != shape or list(group.attrs["tiles"]) != list(tiles)
+                    or list(group.attrs["months"]) != list(months)):
+                raise ValueError(f"A datacube with a different layout already exists at {path}")
+            return cls(path, mode="r+")
+
+        if int(zarr.__version__.split(".")[0]) >= 3:
+            compression = {"compressors": zarr.codecs.BloscCodec(cname="zstd", clevel=clevel, shuffle="shuffle")}
+            create = group.create_array
+        else:
+            import numcodecs
+            compression = {"compressor": numcodecs.Blosc(cname="zstd", clevel=clevel, shuffle=numcodecs.Blosc.SHUFFLE)}
+            create = group.create_dataset
+
+        create("data", shape=shape, chunks=chunks, dtype="float32", fill_value=np.nan, **compression)
+        create("transform", shape=(len(tiles), 6), chunks=(len(tiles), 6), dtype="float64", fill_value=np.nan)
+        group.attrs.update({"tiles": list(tiles), "months": list(months), "bands": list(bands), "crs": crs})
+        return cls(path, mode="r+")
+
+    def _chunkLock(self, tile_idx: int, month_idx: int) -> threading.Lock:
+        key = (tile_idx // self.data.chunks[0], month_idx // self.data.chunks[1])
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def write(self, tile: str, month: str, image: np.ndarray, transform: Optional[tuple] = None) -> None:
+        """
+        Writes one tile-month into the datacube.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            image (np.ndarray): Array of shape (band, y, x).
+            transform (tuple | None): The tile's affine geotransform (a, b, c, d, e, f).
+        """
+        tile_idx = self._tile_idx[tile]
+        month_idx = self._month_idx[month]
+        with self._chunkLock(tile_idx, month_idx):
+            self.data[tile_idx, month_idx] = image.astype(np.float32, copy=False)
+        if transform is not None:
+            with self._locks_guard:
+                self.transform[tile_idx] = np.asarray(transform[:6], dtype=np.float64)
+
+    def writeGeoTIFF(self, tile: str, month: str, filepath: str) -> None:
+        """
+        Reads a downloaded tile GeoTIFF and writes it, with its geotransform, into the datacube.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            filepath (str): Path of the tile's GeoTIFF, with bands in datacube band order.
+        """
+        with rasterio.open(filepath) as src:
+            image = src.read(out_dtype=np.float32)
+            transform = tuple(src.transform)
+        self.write(tile, month, image, transform)
+
+    def read(
+            self,
+            tiles: Union[str, list[str], None] = None,
+            months: Union[str, slice, list[str], None] = None,
+            bands: Union[str, list[str], None] = None,
+            window: Optional[tuple[slice, slice]] = None
+    ) -> np.ndarray:
+        """
+        Reads a slice of the datacube, decoding only the chunks it overlaps.
+
+        Args:
+            tiles (str | list[str] | None): Tile key(s). None reads all tiles.
+            months (str | slice | list[str] | None): Month(s), or a slice of months such as
+                slice('2019-07', '2019-09') (inclusive). None reads all months.
+            bands (str | list[str] | None): Band name(s). None reads all bands.
+            window (tuple[slice, slice] | None): (rows, cols) pixel window. None reads whole tiles.
+
+        Returns:
+            np.ndarray: Array of shape (tile, time, band, y, x). Axes given as a single key are kept.
+        """
+        tile_sel = self._select(tiles, self._tile_idx)
+        month_sel = self._select(months, self._month_idx)
+        band_sel = self._select(bands, {band: i for i, band in enumerate(self.bands)})
+        rows, cols = window if window is not None else (slice(None), slice(None))
+
+        # Read contiguous ranges directly; gather lists one axis at a time
+        out = self.data.get_orthogonal_selection((tile_sel, month_sel, band_sel, rows, cols))
+        return np.asarray(out)
+
+    @staticmethod
+    def _select(keys, index: dict) -> Union[slice, np.ndarray]:
+        if keys is None:
+            return slice(None)
+        if isinstance(keys, slice):
+            start = index[keys.start] if keys.start is not None else None
+            stop = index[keys.stop] + 1 if keys.stop is not None else None
+            return slice(start, stop)
+        if isinstance(keys, str):
+            keys = [keys]
+        return np.asarray([index[key] for key in keys], dtype=np.int64)
+
+    def timeseries(self, tile: str, row: int, col: int, bands: Union[str, list[str], None] = None) -> np.ndarray:
+        """
+        Reads the time series of one pixel.
+
+        Args:
+            tile (str): Tile key.
+            row (int): Pixel row in the tile.
+            col (int): Pixel column in the tile.
+            bands (str | list[str] | None): Band name(s). None reads all bands.
+
+        Returns:
+            np.ndarray: Array of shape (time, band).
+        """
+        return self.read(tile, None, bands, window=(slice(row, row + 1), slice(col, col + 1)))[0, :, :, 0, 0]
+
+    def tileTransform(self, tile: str) -> Optional[tuple]:
+        """Returns a tile's affine geotransform (a, b, c, d, e, f), or None if it was never written."""
+        transform = self.transform[self._tile_idx[tile]]
+        return None if np.isnan(transform).any() else tuple(float(v) for v in transform)
+
+    def lazy(self):
+        """
+        Returns the data as a lazy `dask.array`, chunked like the store (requires dask).
+        """
+        import dask.array as da
+        return da.from_zarr(self.data)
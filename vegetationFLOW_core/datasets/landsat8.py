@@ -1,18 +1,46 @@
 # Imports
 import os
+import time
 import calendar
+import dataclasses
 from datetime import datetime
-import requests
-from typing import Literal, Optional
+from typing import Callable, Literal, Optional
 import concurrent.futures
-from vegetationFLOW_core.utils import patch_roi, checkDateRange, Log
+from vegetationFLOW_core import __version__
+from vegetationFLOW_core.utils import patch_roi, lattice_tile_key, checkDateRange, Log, HTTPDownloader, FetchResult, DownloadMetrics
 from vegetationFLOW_core.preprocessing import QA_water_mask, QA_cloud_mask
+from vegetationFLOW_core.datasets.manifest import DownloadManifest
+from vegetationFLOW_core.datasets.cog import to_cog, build_vrt, file_sha256
+from vegetationFLOW_core.datasets.timestack import stack_band_names, months_per_request, chunk_months, read_stack, split_stack
+from vegetationFLOW_core.datasets.catalog import TileCatalog, band_stats
+from vegetationFLOW_core.datasets.tile_cache import TileCache
+from vegetationFLOW_core.datasets.supertiles import supertile_factor, group_supertiles, read_supertile, split_supertile
 
 import ee
 import geopandas as gpd
+import rasterio
+from rasterio.transform import array_bounds
 import shapely
 import numpy as np
 
+@dataclasses.dataclass
+class DownloadPlan:
+    """
+    The work of a download job, as planned by `LandsatDownloader.planDownload`.
+
+    Attributes:
+        roi_gdf (gpd.GeoDataFrame): The region of interest.
+        grid (gpd.GeoDataFrame): The ROI grid tiles.
+        month_jobs (list[tuple[str, str, str]]): (startDate, endDate, filename) of the months left to download.
+        filenames (list[str]): Filenames of every month of the job, including those already resolved.
+        roi_ee (ee.Geometry | None): The ROI geometry used to filter the collection (None if nothing is left).
+    """
+    roi_gdf: gpd.GeoDataFrame
+    grid: gpd.GeoDataFrame
+    month_jobs: list
+    filenames: list
+    roi_ee: Optional[ee.Geometry]
+
 class LandsatDownloader:
     """
     A utility class for organizing and managing the download process for Landsat satellite imagery 
@@ -26,9 +54,55 @@ class LandsatDownloader:
         res_m (int): Spatial resolution of Landsat imagery (default: 30 meters/pixel).
         img_size (int): Landsat image size (default: 256px).
         dataset_dir (str): Full path to the directory where satelitte data will be stored.
+        validity_mode (str): "batched" checks every tile of a month in one Earth Engine call,
+            "per_tile" falls back to one check per tile.
+        max_workers (int): Number of months downloaded in parallel.
+        http (HTTPDownloader): Pooled HTTP client shared by all download threads.
+        manifest (DownloadManifest): Record of completed (tile, month) pairs in `dataset_dir`.
+        resume (bool): Whether (tile, month) pairs already in the manifest are skipped.
+        min_coverage (float): Minimum fraction of a tile inside the ROI for it to be downloaded.
+        quadtree_levels (int): Number of times partially covered edge tiles may be subdivided.
+        engine (str): "threads" downloads months on a ThreadPoolExecutor, "asyncio" uses `AsyncDownloadEngine`.
+        output_format (str): "geotiff" writes `{tile_key}/{YYYY-MM}.tif` files, "cog" writes them as Cloud-Optimized
+            GeoTIFFs with per-month VRT mosaics, "datacube" writes into a `TileDatacube`.
+        datacube (TileDatacube | None): The datacube being written, in "datacube" output format.
+        export_mode (str): "monthly" requests every tile and month separately, "stacked" requests several 
+            months of a tile at once as a time stack, "supertile" requests blocks of adjacent tiles at once.
+        catalog (TileCatalog | None): Spatial index of the stored tiles, with their bounds, valid fraction 
+            and band statistics.
+        cache (TileCache | None): Tile cache shared with other datasets, if enabled.
+        metrics (DownloadMetrics): Progress counters and per-stage latency histograms of the job.
     """
 
-    def __init__(self, data_dir: str, dataset_name: str, res_m:int=30, img_size:int=256) -> None:
+    MIN_VALID_FRACTION = 0.1 # Tiles with 10% or less valid pixels are skipped
+    BANDS = ['SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7'] # B, G, R, NIR, SWIR1, SWIR2
+
+    def __init__(
+            self, 
+            data_dir: str, 
+            dataset_name: str, 
+            res_m:int=30, 
+            img_size:int=256,
+            validity_mode:Literal["batched", "per_tile"]="batched",
+            max_workers:int=4,
+            http_timeout:tuple[float, float]=(10.0, 120.0),
+            resume:bool=False,
+            min_coverage:float=0.0,
+            quadtree_levels:int=0,
+            engine:Literal["threads", "asyncio"]="threads",
+            ee_concurrency:Optional[int]=None,
+            http_concurrency:int=64,
+            output_format:Literal["geotiff", "cog", "datacube"]="geotiff",
+            datacube_chunks:str="spatial",
+            cog_compress:Literal["deflate", "zstd"]="deflate",
+            structured_log:bool=False,
+            progress_callback:Optional[Callable[[dict], None]]=None,
+            log_id:Optional[str]=None,
+            export_mode:Literal["monthly", "stacked", "supertile"]="monthly",
+            catalog:bool=True,
+            cache_dir:Optional[str]=None,
+            cache_max_bytes:int=50 * 1024 ** 3
+    ) -> None:
         """
         Initializes the LandsatDownloader and sets up the folder structure 
         for downloading satellite imagery. 
@@ -47,23 +121,376 @@ class LandsatDownloader:
 
             img_size (int):
                 Image/Patch Size for the images in pixels
+
+            validity_mode (str):
+                "batched" (default) computes the valid fraction of every tile with a single
+                `reduceRegions` call per month. "per_tile" uses `checkTileValidity` per tile.
+
+            max_workers (int):
+                Number of worker threads. The HTTP connection pool is sized to match.
+
+            http_timeout (tuple[float, float]):
+                (connect, read) timeouts in seconds for tile downloads.
+
+            resume (bool):
+                If True, (tile, month) pairs recorded as downloaded or invalid in the dataset's 
+                manifest are skipped without contacting Earth Engine.
+
+            min_coverage (float):
+                Tiles with less than this fraction of their area inside the ROI are not downloaded
+                (see `patch_roi`). The default keeps every intersecting tile.
+
+            quadtree_levels (int):
+                If > 0, edge tiles less than half inside the ROI are split into smaller quadrants
+                up to this many times (see `patch_roi`).
+
+            engine (str):
+                "threads" (default) runs `max_workers` months in parallel on threads. "asyncio" runs 
+                blocking Earth Engine calls in a bounded executor and fetches tiles with async HTTP 
+                (requires aiohttp).
+
+            ee_concurrency (int | None):
+                asyncio engine only: maximum concurrent Earth Engine calls. Defaults to `max_workers`.
+
+            http_concurrency (int):
+                asyncio engine only: maximum concurrent tile transfers.
+
+            output_format (str):
+                "geotiff" (default) keeps one GeoTIFF per tile and month, as returned by Earth Engine. 
+                "cog" rewrites each tile as a Cloud-Optimized GeoTIFF and builds a VRT mosaic per month 
+                at `dataset_dir/mosaics/{YYYY-MM}.vrt`. "datacube" writes every tile into a chunked, 
+                compressed (tile, time, band, y, x) store at `dataset_dir/datacube.zarr` (requires zarr).
+
+            datacube_chunks (str | tuple):
+                Chunk layout of the datacube, see `datacube.CHUNK_PRESETS`.
+
+            cog_compress (str):
+                "cog" output format only: "deflate" or "zstd" compression of the tiles.
+
+            structured_log (bool):
+                If True, the log is also written as JSON lines (`logs/downloading_{dataset_name}.jsonl`),
+                with per-tile download events carrying their sizes and timings as fields.
+
+            progress_callback (Callable[[dict], None] | None):
+                Called with `metrics.snapshot()` (tile counters, bytes/s and per-stage latencies) 
+                every few seconds while tiles finish, and once when the job ends.
+
+            log_id (str | None):
+                Name of the log file in `data_dir/logs`. Defaults to "downloading_{dataset_name}"; 
+                downloaders working on the same dataset in parallel (e.g. fan-out subtasks) need their own.
+
+            export_mode (str):
+                "monthly" (default) downloads every tile and month with its own Earth Engine request. 
+                "stacked" stacks the monthly composites server-side and downloads up to a year of a tile 
+                (as many months as fit in one request) as one float32 GeoTIFF, which is split back into 
+                the chosen output format locally (see `downloadStackedComposites`). "supertile" groups 
+                adjacent tiles into the largest lattice blocks that fit in one request, downloads each block 
+                once and slices it into the tiles locally (see `downloadSupertile`). Both require the threads 
+                engine; "supertile" also requires equally sized tiles (quadtree_levels=0).
+
+            catalog (bool):
+                If True (default), every stored tile is added to the dataset's `TileCatalog` 
+                (`dataset_dir/catalog.sqlite`), which answers bbox, time and quality queries.
+
+            cache_dir (str | None):
+                Directory of a `TileCache` shared between datasets. Downloaded tiles are added to it, and 
+                tiles found in it (same lattice tile, month, bands and pipeline version) are linked into 
+                this dataset instead of being downloaded. None (default) disables the cache.
+
+            cache_max_bytes (int):
+                Size above which least recently used tiles are evicted from the cache.
         """
+        if validity_mode not in ("batched", "per_tile"):
+            raise ValueError(f"Invalid validity_mode: {validity_mode}. Must be 'batched' or 'per_tile'")
+        if engine not in ("threads", "asyncio"):
+            raise ValueError(f"Invalid engine: {engine}. Must be 'threads' or 'asyncio'")
+        if output_format not in ("geotiff", "cog", "datacube"):
+            raise ValueError(f"Invalid output_format: {output_format}. Must be 'geotiff', 'cog' or 'datacube'")
+        if export_mode not in ("monthly", "stacked", "supertile"):
+            raise ValueError(f"Invalid export_mode: {export_mode}. Must be 'monthly', 'stacked' or 'supertile'")
+        if export_mode != "monthly" and engine != "threads":
+            raise ValueError(f"The {export_mode} export mode requires the threads engine")
+        if export_mode == "supertile" and quadtree_levels > 0:
+            raise ValueError("The supertile export mode requires equally sized tiles (quadtree_levels=0)")
+        if output_format == "datacube" and quadtree_levels > 0:
+            raise ValueError("The datacube output format requires equally sized tiles (quadtree_levels=0)")
 
         # Create dataset-specific subdirectory
         self.dataset_dir = os.path.join(data_dir, dataset_name)
         self.res_m = res_m
         self.img_size = img_size
-        self.log = Log(logger_name="Downloader", log_dir=data_dir, task_id=f"downloading_{dataset_name}")
+        self.validity_mode = validity_mode
+        self.max_workers = max_workers
+        self.http = HTTPDownloader(
+            pool_size=max_workers, 
+            connect_timeout=http_timeout[0], 
+            read_timeout=http_timeout[1]
+        )
+        self.log = Log(
+            logger_name="Downloader", 
+            log_dir=data_dir, 
+            task_id=log_id or f"downloading_{dataset_name}", 
+            structured=structured_log
+        )
 
         # Ensure directories exists
         os.makedirs(name=data_dir, exist_ok=True)
         os.makedirs(name=self.dataset_dir, exist_ok=True)
+
+        self.engine = engine
+        self.ee_concurrency = ee_concurrency or max_workers
+        self.http_concurrency = http_concurrency
+        self.output_format = output_format
+        self.datacube_chunks = datacube_chunks
+        self.cog_compress = cog_compress
+        self.export_mode = export_mode
+        self.datacube = None
+        self.min_coverage = min_coverage
+        self.quadtree_levels = quadtree_levels
+        self.resume = resume
+        self.manifest = DownloadManifest(self.dataset_dir)
+        self.metrics = DownloadMetrics(progress_callback=progress_callback)
+        self.catalog = TileCatalog(self.dataset_dir) if catalog else None
+        self.cache = TileCache(cache_dir, cache_max_bytes, processing_version=__version__) if cache_dir else None
+
+    def close(self) -> None:
+        """Releases the HTTP connection pool, the catalog and the task's log files. Call when the job ends."""
+        self.http.close()
+        if self.catalog is not None:
+            self.catalog.close()
+        if self.cache is not None:
+            self.cache.close()
+        self.log.close()
+
+    def catalogTile(self, tile_key: str, month: str, filepath: str, result: FetchResult) -> None:
+        """
+        Adds a stored tile to the catalog, with its bounds, valid pixel fraction and band statistics.
+
+        The tile is read back from its GeoTIFF, or from the datacube in "datacube" output format.
+
+        Args:
+            tile_key (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            filepath (str): Path of the tile's GeoTIFF (unused in "datacube" output format).
+            result (FetchResult): The stored tile's download result.
+        """
+        if self.output_format == "datacube":
+            image = self.datacube.read(tile_key, month)[0, 0]
+            transform = rasterio.Affine(*self.datacube.tileTransform(tile_key))
+            filepath = self.datacube.path
+        else:
+            with rasterio.open(filepath) as src:
+                image = src.read()
+                transform = src.transform
+        valid_fraction, stats = band_stats(image, self.BANDS)
+        west, south, east, north = array_bounds(image.shape[1], image.shape[2], transform)
+        self.catalog.add(tile_key, month, (west, south, east, north), valid_fraction, filepath, result.num_bytes, stats)
+
+    def tileKey(self, cell: gpd.GeoSeries) -> str:
+        """
+        Returns the key (and folder name) of a grid tile, e.g. "tile_30m_256px_1530_-4372".
+
+        The key is derived from the tile's position on the global lattice (see `lattice_tile_key`), 
+        so the same ground tile has the same key in every dataset. It matches the grid's `tile_key` column.
+        """
+        return lattice_tile_key(cell["col"], cell["row"], int(cell.get("tile_size_px", self.img_size)), self.res_m)
+
+    def tilePath(self, tile_key: str, filename: str) -> str:
+        """Returns the path of a tile's GeoTIFF for a given month filename (e.g. '2018-01.tif')."""
+        return os.path.join(self.dataset_dir, tile_key, filename)
+
+    def downloadPath(self, tile_key: str, filename: str) -> str:
+        """
+        Returns the path a tile is downloaded to.
+
+        This is the tile's GeoTIFF path, except in "datacube" output format, where tiles are staged 
+        in `dataset_dir/.staging` until they are written into the datacube.
+        """
+        if self.output_format == "datacube":
+            return os.path.join(self.dataset_dir, ".staging", f"{tile_key}_{filename}")
+        return self.tilePath(tile_key, filename)
+
+    def storeTile(
+        self, 
+        tile_key: str, 
+        month: str, 
+        filepath: str, 
+        result: FetchResult, 
+        cache: bool = True
+    ) -> FetchResult:
+        """
+        Moves a downloaded tile into its final store. 
+
+        In "geotiff" output format the file is already in place. In "cog" output format it is rewritten 
+        in place as a Cloud-Optimized GeoTIFF. In "datacube" output format the staged GeoTIFF is written 
+        into the datacube and removed. If the tile cache is enabled, the GeoTIFF as downloaded is first 
+        added to it (unless `cache` is False, e.g. for tiles restored from the cache).
+
+        Returns:
+            FetchResult: The download result, with the size and checksum of the stored file.
+        """
+        if cache and self.cache is not None:
+            try:
+                self.cache.put(tile_key, month, self.BANDS, self.tileDtype, filepath)
+            except Exception as e: # The tile is still stored, only other datasets miss it
+                self.log.addWarning(f"Failed to cache {tile_key} {month}: {e}")
+        with self.metrics.timer("write"):
+            if self.output_format == "datacube":
+                self.datacube.writeGeoTIFF(tile_key, month, filepath)
+                os.remove(filepath)
+            elif self.output_format == "cog":
+                to_cog(filepath, compress=self.cog_compress)
+                # The manifest must match the file on disk for resume
+                result = dataclasses.replace(result, num_bytes=os.path.getsize(filepath), sha256=file_sha256(filepath))
+        return result
+
+    @property
+    def tileDtype(self) -> str:
+        """Data type of the downloaded tiles: stacks and super-tiles are requested as float32, monthly tiles come as float64."""
+        return "float64" if self.export_mode == "monthly" else "float32"
+
+    def restoreCached(
+        self, 
+        ROI_grid_gdf: gpd.GeoDataFrame, 
+        filename: str
+    ) -> gpd.GeoDataFrame:
+        """
+        Links the tiles of a month found in the tile cache into this dataset, without contacting Earth Engine.
+
+        Restored tiles are stored and recorded like downloaded ones (see `storeTile`, `recordDownload`).
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame): The pending tiles of the month.
+            filename (str): The month's filename, e.g. '2018-01.tif'.
+
+        Returns:
+            gpd.GeoDataFrame: The tiles that were not in the cache and still need to be downloaded.
+        """
+        if self.cache is None or len(ROI_grid_gdf) == 0:
+            return ROI_grid_gdf
+        month = os.path.splitext(filename)[0]
+        restored = []
+        for i, tile_key in ROI_grid_gdf["tile_key"].items():
+            filepath = self.downloadPath(tile_key, filename)
+            start = time.perf_counter()
+            sha256 = self.cache.materialize(tile_key, month, self.BANDS, self.tileDtype, filepath)
+            if sha256 is None:
+                continue
+            restored.append(i)
+            try:
+                result = FetchResult(
+                    url=f"cache:{sha256}", filepath=filepath, status_code=200, num_bytes=os.path.getsize(filepath),
+                    sha256=sha256, latency_s=0.0, duration_s=time.perf_counter() - start
+                )
+                result = self.storeTile(tile_key, month, filepath, result, cache=False)
+            except Exception as e:
+                self.recordDownload(tile_key, month, filepath, None, error=e)
+                continue
+            self.recordDownload(tile_key, month, filepath, result)
+
+        if len(restored) > 0:
+            print(f"Restored {len(restored)} tiles of {month} from the tile cache")
+            self.log.addInfo(f"Restored {len(restored)} tiles of {month} from the tile cache")
+            self.metrics.increment("tiles_cached", len(restored))
+        return ROI_grid_gdf.drop(index=restored)
+
+    def buildMosaics(self, ROI_grid_gdf: gpd.GeoDataFrame, filenames: list[str]) -> None:
+        """
+        Writes a VRT mosaic over the downloaded tiles of each month, at `dataset_dir/mosaics/{YYYY-MM}.vrt`.
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame): The ROI grid tiles.
+            filenames (list[str]): The months' filenames, e.g. '2018-01.tif'.
+        """
+        for filename in filenames:
+            paths = [self.tilePath(tile_key, filename) for tile_key in ROI_grid_gdf["tile_key"]]
+            paths = [path for path in paths if os.path.exists(path)]
+            if len(paths) == 0:
+                continue
+            month = os.path.splitext(filename)[0]
+            vrt_path = build_vrt(paths, os.path.join(self.dataset_dir, "mosaics", f"{month}.vrt"))
+            self.log.addInfo(f"Mosaic of {len(paths)} tiles saved at: {vrt_path}")
+
+    def pendingTiles(self, ROI_grid_gdf: gpd.GeoDataFrame, filename: str) -> gpd.GeoDataFrame:
+        """
+        Filters out the tiles whose download for a month is already resolved in the manifest.
+
+        Only applies in resume mode; otherwise all tiles are returned.
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame): The ROI grid tiles.
+            filename (str): The month's filename, e.g. '2018-01.tif'.
+
+        Returns:
+            gpd.GeoDataFrame: The tiles that still need to be validated and downloaded.
+        """
+        if not self.resume:
+            return ROI_grid_gdf
+        month = os.path.splitext(filename)[0]
+        is_pending = [
+            not self.manifest.isResolved(
+                tile_key, 
+                month, 
+                self.tilePath(tile_key, filename) if self.output_format != "datacube" else None
+            )
+            for tile_key in ROI_grid_gdf["tile_key"]
+        ]
+        return ROI_grid_gdf[is_pending]
     
+    COLLECTION_ID = 'LANDSAT/LC08/C02/T1_L2'
+
+    def roi_to_ee(self, roi_gdf: gpd.GeoDataFrame) -> ee.Geometry:
+        """
+        Converts a region of interest into an Earth Engine geometry used to filter the image collection.
+
+        The bounding box of all geometries is used, so a gridded ROI filters the same scenes as 
+        the ROI it was made from. Computing this once per job avoids re-projecting the ROI every month.
+
+        Args:
+            roi_gdf (gpd.GeoDataFrame): GeoDataFrame representing the region of interest (ROI), in any CRS.
+
+        Returns:
+            ee.Geometry: The ROI bounding box in EPSG:4326.
+        """
+        roi_gdf = roi_gdf.to_crs(epsg=4326) # EE expects geometry in 4326
+        return ee.Geometry(shapely.geometry.mapping(shapely.geometry.box(*roi_gdf.total_bounds)))
+
+    def planMonths(
+            self,
+            roi_ee: ee.Geometry,
+            date_ranges: list[tuple[str, str]]
+    ) -> list[int]:
+        """
+        Counts the available scenes for every requested date range with a single Earth Engine round trip.
+
+        The date ranges are sent as one `ee.List` and mapped over server-side, so the scene count of 
+        every month is returned by one `getInfo` call instead of one call per month.
+
+        Args:
+            roi_ee (ee.Geometry): The ROI geometry, see `roi_to_ee`.
+            date_ranges (list[tuple[str, str]]): (startDate, endDate) pairs, in 'YYYY-MM-DD' format.
+
+        Returns:
+            list[int]: The number of scenes found for each date range, in the order given.
+        """
+        if len(date_ranges) == 0:
+            return []
+
+        collection = ee.ImageCollection(self.COLLECTION_ID).filterBounds(roi_ee)
+
+        def count_scenes(date_range):
+            date_range = ee.List(date_range)
+            return collection.filterDate(date_range.get(0), date_range.get(1)).size()
+
+        return ee.List([list(date_range) for date_range in date_ranges]).map(count_scenes).getInfo()
+
     def load_ee_composite(
             self, 
             roi_gdf:gpd.GeoDataFrame, 
             startDate:str, 
-            endDate:str
+            endDate:str,
+            roi_ee:Optional[ee.Geometry]=None,
+            check_empty:bool=True
     ) -> Optional[ee.Image]:
         """
         Loads a cloud- and water-masked Landsat 8 median composite Image for a given region and time range,
@@ -71,34 +498,38 @@ class LandsatDownloader:
 
         Args:
             roi_gdf (gpd.GeoDataFrame): GeoDataFrame representing the region of interest (ROI). 
-                                        Only the first geometry is used.
+                                        Its bounding box is used to filter the collection.
             startDate (str): Start date of the date range filter, in 'YYYY-MM-DD' format.
             endDate (str): End date of the date range filter, in 'YYYY-MM-DD' format.
+            roi_ee (ee.Geometry | None): Precomputed ROI geometry (see `roi_to_ee`). 
+                                        If None, it is derived from `roi_gdf`.
+            check_empty (bool): Whether to request the scene count from Earth Engine. 
+                                Set to False when the month was already checked by `planMonths`.
 
         Returns:
             ee.Image | None:    The scaled median composite Image with selected optical bands,
                                 or None if no images are found for the specified parameters.
         """
-        roi_gdf = roi_gdf.to_crs(epsg=4326) # EE expects geometry in 4326
-        roi_ee = ee.Geometry(shapely.geometry.mapping(roi_gdf.geometry.iloc[0]))
+        if roi_ee is None:
+            roi_ee = self.roi_to_ee(roi_gdf)
 
         def apply_scale_factors(image):
-            optical_bands = image.select(['SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7']).multiply(0.0000275).add(-0.2)
+            optical_bands = image.select(self.BANDS).multiply(0.0000275).add(-0.2)
             return image.addBands(optical_bands, None, True)
 
-        collection = (ee.ImageCollection('LANDSAT/LC08/C02/T1_L2')
+        collection = (ee.ImageCollection(self.COLLECTION_ID)
                     .filterBounds(roi_ee)
                     .filterDate(startDate, endDate)
                     .map(QA_cloud_mask)
                     .map(QA_water_mask)
                     )
-        if collection.size().getInfo() == 0:
+        if check_empty and collection.size().getInfo() == 0:
             self.log.addWarning("No images found for this region and date.")
             print("No images found for this region and date.")
             return None
         median_composite = collection.median()
         scaled_composite = apply_scale_factors(median_composite)
-        scaled_composite = scaled_composite.select(['SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7'])  
+        scaled_composite = scaled_composite.select(self.BANDS)
         # B, G, R, NIR, SWIR1, SWIR2 => Important, as this is how it will downloaded
         return scaled_composite
     
@@ -135,19 +566,121 @@ class LandsatDownloader:
             scale=30
         ).get("constant")
 
-        valid_pixels_val = valid_pixels.getInfo()
-        total_pixels_val = total_pixels.getInfo()
+        with self.metrics.timer("validity"):
+            valid_pixels_val = valid_pixels.getInfo()
+            total_pixels_val = total_pixels.getInfo()
 
-        if valid_pixels_val <= 0.1*total_pixels_val: # If true: Invalid data
+        if valid_pixels_val <= self.MIN_VALID_FRACTION*total_pixels_val: # If true: Invalid data
             return False
         else:
             return True
 
+    def checkTilesValidity(
+        self, 
+        composite: ee.Image, 
+        ROI_grid_gdf: gpd.GeoDataFrame
+    ) -> np.ndarray:
+        """
+        Computes the valid pixel fraction of every tile in the grid with a single Earth Engine round trip.
+
+        All tiles are sent as one `ee.FeatureCollection` and the masked "SR_B4" pixels are summed 
+        per tile with one `reduceRegions` call. The reduction runs on the EPSG:3857 grid at `res_m`, 
+        which the tiles are snapped to, so the total pixel count of a tile is derived from its area 
+        instead of being requested from Earth Engine.
+
+        Args:
+            composite (ee.Image): The (unclipped) composite image, expected to contain the band "SR_B4".
+            ROI_grid_gdf (gpd.GeoDataFrame): The ROI grid tiles, in any CRS.
+
+        Returns:
+            np.ndarray: The valid pixel fraction (0 - 1) of each tile, in the row order of `ROI_grid_gdf`.
+        """
+        ROI_grid_gdf = ROI_grid_gdf.to_crs(epsg=3857)
+
+        features = [
+            ee.Feature(ee.Geometry(shapely.geometry.mapping(geom), 'EPSG:3857'), {"tile_idx": idx})
+            for idx, geom in enumerate(ROI_grid_gdf.geometry)
+        ]
+        tiles_fc = ee.FeatureCollection(features)
+
+        valid_fc = composite.select("SR_B4").mask().unmask(0).reduceRegions(
+            collection=tiles_fc,
+            reducer=ee.Reducer.sum().setOutputs(["valid"]),
+            crs='EPSG:3857',
+            scale=self.res_m,
+        )
+        with self.metrics.timer("validity"):
+            result = ee.Dictionary({
+                "tile_idx": valid_fc.aggregate_array("tile_idx"),
+                "valid": valid_fc.aggregate_array("valid"),
+            }).getInfo()
+
+        valid_pixels = np.zeros(len(ROI_grid_gdf), dtype=np.float64)
+        valid_pixels[np.asarray(result["tile_idx"], dtype=np.int64)] = result["valid"]
+        total_pixels = ROI_grid_gdf.geometry.area.to_numpy() / (self.res_m ** 2)
+
+        return valid_pixels / total_pixels
+
+    def tileImage(
+        self, 
+        composite: ee.Image, 
+        tile_geom: shapely.Geometry
+    ) -> tuple[ee.Image, ee.Geometry]:
+        """
+        Clips the composite to a tile of the ROI grid.
+
+        Args:
+            composite (ee.Image): The composite image.
+            tile_geom (shapely.Geometry): The tile polygon in EPSG:3857.
+
+        Returns:
+            tuple[ee.Image, ee.Geometry]: The clipped image and the tile geometry as an EE geometry.
+        """
+        region_JSON = shapely.geometry.mapping(tile_geom)
+        tile_geom_ee = ee.Geometry(region_JSON, 'EPSG:3857')  # Explicitly tell EE it's 3857
+        return composite.clip(tile_geom_ee), tile_geom_ee
+
+    def getTileURL(
+        self, 
+        composite: ee.Image, 
+        img_size: Optional[int] = None,
+        dimensions: Optional[tuple[int, int]] = None
+    ) -> str:
+        """
+        Requests a GeoTIFF download URL from Earth Engine for a clipped composite image.
+
+        This call blocks on Earth Engine and does not download any pixels.
+
+        Args:
+            composite (ee.Image): An Earth Engine Image, already clipped to the target tile.
+            img_size (int | None): Image Size in pixels. Assuming Height and Width is the same.
+                Defaults to `self.img_size`; quadtree tiles pass their own size.
+            dimensions (tuple[int, int] | None): (width, height) in pixels, for non-square images 
+                such as super-tiles. Overrides `img_size`.
+
+        Returns:
+            str: The signed download URL.
+        """
+        img_size = img_size or self.img_size
+        dimensions = list(dimensions or (img_size, img_size))
+        with self.metrics.timer("url"):
+            region_JSON = composite.geometry().getInfo()  # Get clipped image geometry info
+            
+            return composite.getDownloadURL({
+                'region': region_JSON,
+                'dimensions': dimensions,                   # Exact tile size (no distortion)
+                'crs': 'EPSG:3857',                         # Coordinate Reference System (meters)
+                'format': 'GEO_TIFF',
+                'filePerBand': False
+            })
+
     def downloadURL(
         self, 
         composite: ee.ImageCollection,  
-        filepath: str
-    ) -> None:
+        filepath: str,
+        img_size: Optional[int] = None,
+        dimensions: Optional[tuple[int, int]] = None
+    ) -> FetchResult:
         """
         Downloads a clipped composite image as a GeoTIFF file with specified dimensions and CRS.
 
@@ -155,44 +688,200 @@ class LandsatDownloader:
 
         Args:
             composite (ee.Image): An Earth Engine Image, already clipped to the target tile.
-            img_size (int): Image Size in pixels. Assuming Height and Width is the same
             filepath (str): Local file path where the downloaded GeoTIFF will be saved.
+            img_size (int | None): Image Size in pixels. Assuming Height and Width is the same.
+                Defaults to `self.img_size`; quadtree tiles pass their own size.
+            dimensions (tuple[int, int] | None): (width, height) in pixels, overrides `img_size`.
+
+        The GeoTIFF is streamed to disk through the shared, pooled `HTTPDownloader` and 
+        atomically renamed to `filepath` once complete.
+
+        Returns:
+            FetchResult: Status, size, checksum and timings of the download.
 
         Raises:
-            requests.RequestException: If the HTTP request to download the image fails.
-        """
-        region_JSON = composite.geometry().getInfo()  # Get clipped image geometry info
-        
-        url = composite.getDownloadURL({
-            'region': region_JSON,
-            'dimensions': [self.img_size, self.img_size],        # Exact tile size (no distortion)
-            'crs': 'EPSG:3857',                         # Coordinate Reference System (meters)
-            'format': 'GEO_TIFF',
-            'filePerBand': False
-        })
-
-        r = requests.get(url)
-        if r.status_code == 200:
-            with open(filepath, 'wb') as f:
-                f.write(r.content)
+            requests.RequestException: If the HTTP request to download the image fails or times out.
+        """
+        url = self.getTileURL(composite, img_size=img_size, dimensions=dimensions)
+        with self.metrics.timer("fetch"):
+            return self.http.fetch(url, filepath)
+
+    def skipTile(self, tile_key: str, month: str) -> None:
+        """Logs a tile skipped for having too few valid pixels and records it in the manifest."""
+        print(f"Skipped Tile {tile_key}: Most pixels masked or invalid")
+        self.log.addInfo(f"Skipped Tile {tile_key}: Most pixels masked or invalid")
+        self.manifest.record(tile_key, month, DownloadManifest.INVALID)
+        self.metrics.increment("tiles_invalid")
+
+    def failMonths(self, ROI_grid_gdf: gpd.GeoDataFrame, filenames: list[str], error: Exception) -> None:
+        """
+        Logs months that failed as a whole and records their unresolved tiles as failed in the manifest.
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame): The ROI grid tiles.
+            filenames (list[str]): Filenames of the failed months, e.g. '2018-01.tif'.
+            error (Exception): The exception raised for the months.
+        """
+        months = [os.path.splitext(filename)[0] for filename in filenames]
+        print(f"Failed to download {months[0]} to {months[-1]}: {error}")
+        self.log.addError(f"Failed to download {months[0]} to {months[-1]}: {error}")
+        for month, filename in zip(months, filenames):
+            for tile_key in self.pendingTiles(ROI_grid_gdf, filename)["tile_key"]:
+                self.manifest.record(tile_key, month, DownloadManifest.FAILED)
+                self.metrics.increment("tiles_failed")
+
+    def recordDownload(
+        self, 
+        tile_key: str, 
+        month: str, 
+        filepath: str, 
+        result: Optional[FetchResult], 
+        error: Optional[Exception] = None
+    ) -> None:
+        """
+        Logs the outcome of a tile download and records it in the manifest.
+
+        Args:
+            tile_key (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            filepath (str): Path of the tile's GeoTIFF.
+            result (FetchResult | None): The download result, None if the download raised.
+            error (Exception | None): The exception raised by the download, if any.
+        """
+        if error is not None:
+            print(f"Failed to download at {filepath}: {error}")
+            self.log.addError(f"Failed to download at {filepath}: {error}")
+            self.manifest.record(tile_key, month, DownloadManifest.FAILED)
+            self.metrics.increment("tiles_failed")
+        elif result.ok:
             print(f"Saved at: {filepath}")
-            self.log.addInfo(f"Saved at: {filepath}")
+            self.log.addEvent(
+                "tile_saved", tile=tile_key, month=month, path=filepath, bytes=result.num_bytes,
+                latency_s=round(result.latency_s, 3), duration_s=round(result.duration_s, 3)
+            )
+            self.manifest.record(tile_key, month, DownloadManifest.DONE, result.num_bytes, result.sha256)
+            self.metrics.increment("bytes", result.num_bytes)
+            self.metrics.increment("tiles_done")
+            if self.catalog is not None:
+                try:
+                    self.catalogTile(tile_key, month, filepath, result)
+                except Exception as e: # The tile is stored; only its index entry is missing
+                    self.log.addWarning(f"Failed to catalog {tile_key} {month}: {e}")
         else:
-            print(f"Failed to download at {filepath}, status: {r.status_code}")
-            self.log.addWarning(f"Failed to download at {filepath}, status: {r.status_code}")
+            print(f"Failed to download at {filepath}, status: {result.status_code}")
+            self.log.addWarning(f"Failed to download at {filepath}, status: {result.status_code}")
+            self.manifest.record(tile_key, month, DownloadManifest.FAILED)
+            self.metrics.increment("tiles_failed")
+
+    def storeSupertile(
+        self, 
+        cells: gpd.GeoDataFrame, 
+        month: str, 
+        path: str, 
+        result: FetchResult
+    ) -> dict[str, FetchResult]:
+        """
+        Slices a downloaded super-tile into its grid tiles and stores them.
+
+        In "geotiff" and "cog" output formats, every tile is written to its usual GeoTIFF (and rewritten 
+        as a COG, see `storeTile`). In "datacube" output format the tiles are written into the datacube 
+        straight from the super-tile.
+
+        Args:
+            cells (gpd.GeoDataFrame): The grid tiles of the super-tile, in EPSG:3857.
+            month (str): Month in 'YYYY-MM' format.
+            path (str): Path of the downloaded super-tile GeoTIFF.
+            result (FetchResult): The result of the super-tile download.
+
+        Returns:
+            dict[str, FetchResult]: A result per tile key, with the size and checksum of the stored tile.
+        """
+        tile_keys = list(cells["tile_key"])
+        bounds = [tuple(geom.bounds) for geom in cells.geometry]
+        if self.output_format == "datacube":
+            with self.metrics.timer("write"):
+                for k, image, transform in read_supertile(path, bounds, self.img_size):
+                    self.datacube.write(tile_keys[k], month, image, transform)
+            # Tiles share the transfer; nothing is left on disk to checksum
+            return {
+                tile_key: dataclasses.replace(result, num_bytes=result.num_bytes // len(tile_keys), sha256=None)
+                for tile_key in tile_keys
+            }
+
+        filepaths = [self.tilePath(tile_key, f"{month}.tif") for tile_key in tile_keys]
+        with self.metrics.timer("write"):
+            split_supertile(path, bounds, self.img_size, filepaths)
+        results = {}
+        for tile_key, filepath in zip(tile_keys, filepaths):
+            tile_result = dataclasses.replace(
+                result, filepath=filepath, num_bytes=os.path.getsize(filepath), sha256=file_sha256(filepath)
+            )
+            results[tile_key] = self.storeTile(tile_key, month, filepath, tile_result)
+        return results
+
+    def downloadSupertile(
+        self, 
+        composite: ee.Image, 
+        cells: gpd.GeoDataFrame, 
+        month: str
+    ) -> None:
+        """
+        Downloads adjacent grid tiles with a single Earth Engine request and slices the result into the tiles.
+
+        The request covers the bounding box of the tiles and is cast to float32, as the block size 
+        assumes (see `supertile_factor`). Every tile is recorded in the manifest on its own; if the 
+        request fails, all of its tiles are recorded as failed.
+
+        Args:
+            composite (ee.Image): The month's composite.
+            cells (gpd.GeoDataFrame): The grid tiles of the super-tile, in EPSG:3857.
+            month (str): Month in 'YYYY-MM' format.
+        """
+        tile_keys = list(cells["tile_key"])
+        minx, miny, maxx, maxy = cells.total_bounds
+        dimensions = (round((maxx - minx) / self.res_m), round((maxy - miny) / self.res_m))
+        print(f"Downloading {len(tile_keys)} tiles ({tile_keys[0]}, ...) as one super-tile...")
+        self.log.addInfo(f"Downloading {len(tile_keys)} tiles ({tile_keys[0]}, ...) as one super-tile...")
+
+        supertile_image, _ = self.tileImage(composite, shapely.box(minx, miny, maxx, maxy))
+        supertile_image = supertile_image.toFloat() # Blocks are sized for float32 (see `supertile_factor`)
+        path = os.path.join(self.dataset_dir, ".staging", f"supertile_{tile_keys[0]}_{month}.tif")
+        filepaths = [self.downloadPath(tile_key, f"{month}.tif") for tile_key in tile_keys]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            result = self.downloadURL(supertile_image, filepath=path, dimensions=dimensions)
+            results = self.storeSupertile(cells, month, path, result) if result.ok else None
+        except Exception as e:
+            for tile_key, filepath in zip(tile_keys, filepaths):
+                self.recordDownload(tile_key, month, filepath, None, error=e)
+            return
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+        for tile_key, filepath in zip(tile_keys, filepaths):
+            self.recordDownload(tile_key, month, filepath, results[tile_key] if result.ok else result)
 
     def downloadMonthlyComposite(
         self, 
         ROI_grid_gdf: gpd.GeoDataFrame, 
         startDate: str, 
         endDate: str, 
-        filename: str
+        filename: str,
+        roi_ee: Optional[ee.Geometry] = None,
+        check_empty: bool = True
     ) -> None:
         """
         Downloads a median composite image for each tile in a uniform ROI grid, clipped by each tile geometry.
 
         For each grid cell in the ROI, the method clips the composite to that tile and downloads the image
-        if the tile contains sufficient valid data pixels.
+        if the tile contains sufficient valid data pixels. In "batched" validity mode all tiles are checked
+        up front with `checkTilesValidity` and only the tiles that passed are iterated. In "supertile" export 
+        mode, the valid tiles are downloaded in blocks of adjacent tiles instead (see `downloadSupertile`).
+
+        Every outcome is recorded in the manifest. In resume mode, tiles already resolved for this month
+        are skipped, and tiles found in the tile cache are restored from it (see `restoreCached`). If none 
+        remain, Earth Engine is not contacted at all.
 
         Args:
             ROI_grid_gdf (gpd.GeoDataFrame):
@@ -203,30 +892,241 @@ class LandsatDownloader:
                 End date for the image collection filter, formatted as 'YYYY-MM-DD'.
             filename (str):
                 The filename to use when saving each tile's downloaded GeoTIFF image.
+            roi_ee (ee.Geometry | None):
+                Precomputed ROI geometry shared by all months (see `roi_to_ee`).
+            check_empty (bool):
+                Whether to check for an empty collection. False when the month was planned by `planMonths`.
 
         Returns:
             None
         """
-        composite = self.load_ee_composite(ROI_grid_gdf, startDate, endDate)
+        month = os.path.splitext(filename)[0]
+        ROI_grid_gdf = self.restoreCached(self.pendingTiles(ROI_grid_gdf, filename), filename)
+        if len(ROI_grid_gdf) == 0:
+            print(f"Skipped {month}: All tiles already resolved")
+            self.log.addInfo(f"Skipped {month}: All tiles already resolved")
+            return
+
+        composite = self.load_ee_composite(ROI_grid_gdf, startDate, endDate, roi_ee=roi_ee, check_empty=check_empty)
 
         if composite:
             ROI_grid_gdf = ROI_grid_gdf.to_crs(epsg=3857)  # Matches grid CRS and download projection
 
+            if self.validity_mode == "batched":
+                valid_fraction = self.checkTilesValidity(composite=composite, ROI_grid_gdf=ROI_grid_gdf)
+                is_valid = valid_fraction > self.MIN_VALID_FRACTION
+                for tile_key in ROI_grid_gdf["tile_key"][~is_valid]:
+                    self.skipTile(tile_key, month)
+                ROI_grid_gdf = ROI_grid_gdf[is_valid] # Only tiles that passed are downloaded
+
+            if self.export_mode == "supertile":
+                if self.validity_mode == "per_tile":
+                    is_valid = np.array([
+                        self.checkTileValidity(*self.tileImage(composite, geom)) for geom in ROI_grid_gdf.geometry
+                    ], dtype=bool)
+                    for tile_key in ROI_grid_gdf["tile_key"][~is_valid]:
+                        self.skipTile(tile_key, month)
+                    ROI_grid_gdf = ROI_grid_gdf[is_valid]
+                # Invalid and resolved tiles are left out, so they are not part of any request
+                for group in group_supertiles(ROI_grid_gdf, supertile_factor(self.img_size, len(self.BANDS))):
+                    self.downloadSupertile(composite, ROI_grid_gdf.loc[group], month)
+                return
+
             for i, cell in ROI_grid_gdf.iterrows():
-                tile_geom = cell.geometry
-                region_JSON = shapely.geometry.mapping(tile_geom)
-                tile_geom_ee = ee.Geometry(region_JSON, 'EPSG:3857')  # Explicitly tell EE it's 3857
-                tile_image = composite.clip(tile_geom_ee)
+                tile_key = self.tileKey(cell)
+                tile_image, tile_geom_ee = self.tileImage(composite, cell.geometry)
 
-                if self.checkTileValidity(tile_image=tile_image, tile_geom_ee=tile_geom_ee):
+                if self.validity_mode == "batched" or self.checkTileValidity(tile_image=tile_image, tile_geom_ee=tile_geom_ee):
                     print(f"Downloading Tile {i}...")
                     self.log.addInfo(f"Downloading Tile {i}...")
-                    filepath = os.path.join(self.dataset_dir, f"tile_{i}")
-                    os.makedirs(filepath, exist_ok=True)
-                    self.downloadURL(tile_image, filepath=os.path.join(filepath, filename))  # Pass clipped image only
+                    filepath = self.downloadPath(tile_key, filename)
+                    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                    try:
+                        result = self.downloadURL(  # Pass clipped image only
+                            tile_image, 
+                            filepath=filepath, 
+                            img_size=int(cell.get("tile_size_px", self.img_size))
+                        )
+                        if result.ok:
+                            result = self.storeTile(tile_key, month, filepath, result)
+                    except Exception as e:
+                        self.recordDownload(tile_key, month, filepath, None, error=e)
+                        continue
+                    self.recordDownload(tile_key, month, filepath, result)
                 else:
-                    print(f"Skipped Tile {i}: Most pixels masked or invalid")
-                    self.log.addInfo(f"Skipped Tile {i}: Most pixels masked or invalid")
+                    self.skipTile(tile_key, month)
+
+    def stackComposites(self, composites: dict[str, ee.Image]) -> ee.Image:
+        """
+        Stacks monthly composites into one image, with bands named `{YYYY-MM}_{band}` (e.g. '2018-01_SR_B4').
+
+        The stack is cast to float32, so its request size per month is predictable (see `months_per_request`).
+
+        Args:
+            composites (dict[str, ee.Image]): The composite of each month ('YYYY-MM'), in chronological order.
+
+        Returns:
+            ee.Image: The stacked image, with bands in month, then `BANDS` order.
+        """
+        return ee.Image.cat([
+            composite.rename(stack_band_names([month], self.BANDS)) for month, composite in composites.items()
+        ]).toFloat()
+
+    def storeStack(
+        self, 
+        tile_key: str, 
+        months: list[str], 
+        stack_path: str, 
+        result: FetchResult
+    ) -> dict[str, FetchResult]:
+        """
+        Splits a downloaded time stack of a tile into its months and stores them.
+
+        In "geotiff" and "cog" output formats, every month is written to its usual tile GeoTIFF (and 
+        rewritten as a COG, see `storeTile`). In "datacube" output format the months are written into 
+        the datacube straight from the stack, without per-month files.
+
+        Args:
+            tile_key (str): Tile key.
+            months (list[str]): The months of the stack ('YYYY-MM'), in band order.
+            stack_path (str): Path of the downloaded stack GeoTIFF.
+            result (FetchResult): The result of the stack download.
+
+        Returns:
+            dict[str, FetchResult]: A result per month, with the size and checksum of the stored month.
+        """
+        if self.output_format == "datacube":
+            with self.metrics.timer("write"):
+                for k, image, transform in read_stack(stack_path, len(self.BANDS)):
+                    self.datacube.write(tile_key, months[k], image, transform)
+            # Months share the transfer; nothing is left on disk to checksum
+            return {
+                month: dataclasses.replace(result, num_bytes=result.num_bytes // len(months), sha256=None)
+                for month in months
+            }
+
+        filepaths = [self.tilePath(tile_key, f"{month}.tif") for month in months]
+        with self.metrics.timer("write"):
+            split_stack(stack_path, filepaths, self.BANDS)
+        results = {}
+        for month, filepath in zip(months, filepaths):
+            month_result = dataclasses.replace(
+                result, filepath=filepath, num_bytes=os.path.getsize(filepath), sha256=file_sha256(filepath)
+            )
+            results[month] = self.storeTile(tile_key, month, filepath, month_result)
+        return results
+
+    def downloadStack(
+        self, 
+        tile_key: str, 
+        cell: gpd.GeoSeries, 
+        stack: ee.Image, 
+        months: list[str]
+    ) -> None:
+        """
+        Downloads several months of one tile with a single Earth Engine request and stores each month.
+
+        Every month is recorded in the manifest on its own, so resume works as in the monthly export mode. 
+        If the request fails, all of its months are recorded as failed.
+
+        Args:
+            tile_key (str): Tile key.
+            cell (gpd.GeoSeries): The tile's row of the ROI grid, in EPSG:3857.
+            stack (ee.Image): The time stack of the months' composites, see `stackComposites`.
+            months (list[str]): The months to download ('YYYY-MM'), in chronological order.
+        """
+        print(f"Downloading Tile {tile_key} ({months[0]} to {months[-1]}, {len(months)} months)...")
+        self.log.addInfo(f"Downloading Tile {tile_key} ({months[0]} to {months[-1]}, {len(months)} months)...")
+        tile_image, _ = self.tileImage(stack.select(stack_band_names(months, self.BANDS)), cell.geometry)
+        stack_path = os.path.join(self.dataset_dir, ".staging", f"{tile_key}_{months[0]}_{months[-1]}_stack.tif")
+        filepaths = [self.downloadPath(tile_key, f"{month}.tif") for month in months]
+        os.makedirs(os.path.dirname(stack_path), exist_ok=True)
+        try:
+            result = self.downloadURL(
+                tile_image, 
+                filepath=stack_path, 
+                img_size=int(cell.get("tile_size_px", self.img_size))
+            )
+            results = self.storeStack(tile_key, months, stack_path, result) if result.ok else None
+        except Exception as e:
+            for month, filepath in zip(months, filepaths):
+                self.recordDownload(tile_key, month, filepath, None, error=e)
+            return
+        finally:
+            if os.path.exists(stack_path):
+                os.remove(stack_path)
+
+        for month, filepath in zip(months, filepaths):
+            self.recordDownload(tile_key, month, filepath, results[month] if result.ok else result)
+
+    def downloadStackedComposites(
+        self, 
+        ROI_grid_gdf: gpd.GeoDataFrame, 
+        month_jobs: list[tuple[str, str, str]],
+        roi_ee: Optional[ee.Geometry] = None,
+        executor: Optional[concurrent.futures.Executor] = None
+    ) -> list[concurrent.futures.Future]:
+        """
+        Downloads several months of every tile in the ROI grid as time stacks, one request per tile.
+
+        The monthly median composites are built and stacked server-side (see `stackComposites`). Tile 
+        validity is still checked per month, and each tile requests only the bands of its valid, pending 
+        months, so skipped and resolved months cost no transfer. The months must fit in one request 
+        (see `months_per_request` and `chunk_months`).
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame):
+                A GeoDataFrame representing the ROI divided into uniform grid tiles.
+            month_jobs (list[tuple[str, str, str]]):
+                (startDate, endDate, filename) of the months to download, in chronological order.
+            roi_ee (ee.Geometry | None):
+                Precomputed ROI geometry shared by all months (see `roi_to_ee`).
+            executor (concurrent.futures.Executor | None):
+                If given, the tile downloads are submitted to it instead of running one after another.
+
+        Returns:
+            list[concurrent.futures.Future]: The submitted tile downloads (empty without `executor`).
+        """
+        months = [os.path.splitext(filename)[0] for _, _, filename in month_jobs]
+
+        # Months still to download per tile
+        pending = {i: [] for i in ROI_grid_gdf.index}
+        for month, (_, _, filename) in zip(months, month_jobs):
+            for i in self.restoreCached(self.pendingTiles(ROI_grid_gdf, filename), filename).index:
+                pending[i].append(month)
+        ROI_grid_gdf = ROI_grid_gdf[[len(pending[i]) > 0 for i in ROI_grid_gdf.index]]
+        if len(ROI_grid_gdf) == 0:
+            print(f"Skipped {months[0]} to {months[-1]}: All tiles already resolved")
+            self.log.addInfo(f"Skipped {months[0]} to {months[-1]}: All tiles already resolved")
+            return []
+        ROI_grid_gdf = ROI_grid_gdf.to_crs(epsg=3857)  # Matches grid CRS and download projection
+
+        composites = {
+            month: self.load_ee_composite(ROI_grid_gdf, start_date, end_date, roi_ee=roi_ee, check_empty=False)
+            for month, (start_date, end_date, _) in zip(months, month_jobs)
+        }
+
+        for month, composite in composites.items():
+            month_grid = ROI_grid_gdf[[month in pending[i] for i in ROI_grid_gdf.index]]
+            if len(month_grid) == 0:
+                continue
+            if self.validity_mode == "batched":
+                is_valid = self.checkTilesValidity(composite=composite, ROI_grid_gdf=month_grid) > self.MIN_VALID_FRACTION
+            else:
+                is_valid = np.array([
+                    self.checkTileValidity(*self.tileImage(composite, geom)) for geom in month_grid.geometry
+                ], dtype=bool)
+            for i in month_grid.index[~is_valid]:
+                self.skipTile(month_grid.at[i, "tile_key"], month)
+                pending[i].remove(month)
+
+        stack = self.stackComposites(composites)
+        jobs = [(self.tileKey(cell), cell, pending[i]) for i, cell in ROI_grid_gdf.iterrows() if len(pending[i]) > 0]
+        if executor is None:
+            for tile_key, cell, tile_months in jobs:
+                self.downloadStack(tile_key, cell, stack, tile_months)
+            return []
+        return [executor.submit(self.downloadStack, tile_key, cell, stack, tile_months) for tile_key, cell, tile_months in jobs]
 
     def startDownload(
         self, 
@@ -241,7 +1141,13 @@ class LandsatDownloader:
         For each month between `startYear` and `endYear`, the method:
         - Generates a grid over the ROI.
         - Validates year range.
-        - Submits monthly composite download jobs in parallel using ThreadPoolExecutor.
+        - In resume mode, drops months whose tiles are all resolved in the manifest.
+        - Counts the available scenes of every month in one Earth Engine call and drops empty months.
+        - Submits monthly composite download jobs in parallel using ThreadPoolExecutor,
+          or runs them on the `AsyncDownloadEngine` when engine="asyncio".
+        - In "stacked" export mode, submits one job per chunk of months instead, each building the chunk's 
+          stack and submitting one download per tile to the same pool.
+        - In "cog" output format, writes a VRT mosaic of each month over its tiles.
 
         Args:
             roi_path (str): 
@@ -255,52 +1161,220 @@ class LandsatDownloader:
             bool:
                 True if download tasks were submitted successfully; False if an error occurred.
         """
-        # Load ROI shapefile
-        ROI_gdf = gpd.read_file(roi_path)
+        plan = self.planDownload(roi_path, startYear, endYear)
+        if plan is None:
+            return False
 
-        # Generate grid patches over the ROI
-        ROI_grid_gdf = patch_roi(
+        # Download composites in parallel
+        if self.engine == "asyncio" and len(plan.month_jobs) > 0:
+            from vegetationFLOW_core.datasets.async_engine import AsyncDownloadEngine # Optional dependency
+            AsyncDownloadEngine(
+                self, 
+                ee_concurrency=self.ee_concurrency, 
+                http_concurrency=self.http_concurrency
+            ).run(plan.grid, plan.month_jobs, roi_ee=plan.roi_ee)
+        elif self.export_mode == "stacked":
+            max_months = months_per_request(self.img_size, len(self.BANDS))
+            jobs = {os.path.splitext(job[2])[0]: job for job in plan.month_jobs}
+            chunks = chunk_months(list(jobs), max_months)
+            self.log.addInfo(f"Stacked export: {len(chunks)} requests per tile, up to {max_months} months each")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self.downloadStackedComposites, 
+                        plan.grid, 
+                        [jobs[month] for month in chunk], 
+                        roi_ee=plan.roi_ee,
+                        executor=executor # Tiles are downloaded in parallel, even for a single chunk
+                    )
+                    for chunk in chunks
+                ]
+                tile_futures = []
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        tile_futures.extend(future.result())
+                    except Exception as e: # E.g. an Earth Engine error while building the chunk's stack
+                        self.failMonths(plan.grid, [jobs[month][2] for month in chunk], e)
+                for future in concurrent.futures.as_completed(tile_futures):
+                    if future.exception() is not None:
+                        print(f"Stacked tile download failed: {future.exception()}")
+                        self.log.addError(f"Stacked tile download failed: {future.exception()}")
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = []
+                for start_date, end_date, filename in plan.month_jobs:
+                    future = executor.submit(
+                        self.downloadMonthlyComposite, 
+                        plan.grid, 
+                        start_date, 
+                        end_date, 
+                        filename,
+                        roi_ee=plan.roi_ee,
+                        check_empty=False
+                    )
+                    futures.append(future)
+
+                # Wait for all tasks to complete
+                concurrent.futures.wait(futures)
+
+        self.finishDownload(plan.grid, plan.filenames)
+        return True
+
+    def gridROI(self, ROI_gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Generates the grid tiles over the ROI with this downloader's tile settings (see `patch_roi`)."""
+        return patch_roi(
             roi=ROI_gdf, 
             tile_size_px=self.img_size, 
-            res_m=self.res_m
+            res_m=self.res_m,
+            min_coverage=self.min_coverage,
+            quadtree_levels=self.quadtree_levels
         )
 
+    def planDownload(
+        self, 
+        roi_path: str, 
+        startYear: int, 
+        endYear: int
+    ) -> Optional[DownloadPlan]:
+        """
+        Plans a download: grids the ROI, lists the months, and drops the months with nothing to do.
+
+        In resume mode, months whose tiles are all resolved in the manifest are dropped without contacting
+        Earth Engine. The scenes of the remaining months are counted with one Earth Engine call and empty 
+        months are dropped. In "datacube" output format, the datacube is created here.
+
+        Args:
+            roi_path (str): Path to the shapefile containing the region of interest (ROI).
+            startYear (int): Starting year for the download (inclusive).
+            endYear (int): Ending year for the download (inclusive).
+
+        Returns:
+            DownloadPlan | None: The plan, or None if the year range is invalid.
+        """
+        # Load ROI shapefile
+        ROI_gdf = gpd.read_file(roi_path)
+
+        # Generate grid patches over the ROI
+        ROI_grid_gdf = self.gridROI(ROI_gdf)
+
         # Validate the year range
         try:
             checkDateRange(startYear, endYear)
         except Exception as e:
             print(f"Error Downloading...\n{e}")
             self.log.addError(f"Error Downloading...\n{e}")
-            return False
+            return None
 
         years = list(range(startYear, endYear + 1))
         months = list(range(1, 13))  # January to December
 
-        # Download composites in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            futures = []
-            for year in years:
-                for month in months:
-                    max_days = calendar.monthrange(year, month)[1]
-                    start_date = f"{year}-{month:02d}-01"
-                    end_date = f"{year}-{month:02d}-{max_days:02d}"
-                    filename = f"{year}-{month:02d}.tif"
+        month_jobs = []
+        for year in years:
+            for month in months:
+                max_days = calendar.monthrange(year, month)[1]
+                start_date = f"{year}-{month:02d}-01"
+                end_date = f"{year}-{month:02d}-{max_days:02d}"
+                filename = f"{year}-{month:02d}.tif"
+                month_jobs.append((start_date, end_date, filename))
 
-                    future = executor.submit(
-                        self.downloadMonthlyComposite, 
-                        ROI_grid_gdf, 
-                        start_date, 
-                        end_date, 
-                        filename
-                    )
-                    futures.append(future)
+        if self.output_format == "datacube":
+            from vegetationFLOW_core.datasets.datacube import TileDatacube # Optional dependency
+            self.datacube = TileDatacube.create(
+                os.path.join(self.dataset_dir, TileDatacube.FILENAME),
+                tiles=list(ROI_grid_gdf["tile_key"]),
+                months=[os.path.splitext(filename)[0] for _, _, filename in month_jobs],
+                bands=self.BANDS,
+                img_size=self.img_size,
+                chunks=self.datacube_chunks
+            )
 
-            # Wait for all tasks to complete
-            concurrent.futures.wait(futures)
-        
-        self.log.addInfo("Finished Downloading")
+        all_filenames = [filename for _, _, filename in month_jobs]
 
-        return True
+        # Resume: months with every tile already resolved need no Earth Engine calls
+        pending_counts = [len(self.pendingTiles(ROI_grid_gdf, filename)) for _, _, filename in month_jobs]
+        month_jobs = [job for job, count in zip(month_jobs, pending_counts) if count > 0]
+        pending_counts = [count for count in pending_counts if count > 0]
+        if len(month_jobs) == 0:
+            self.log.addInfo("Nothing left to resume")
+            return DownloadPlan(ROI_gdf, ROI_grid_gdf, [], all_filenames, None)
+
+        # Plan: drop months without any scenes before using the thread pool
+        with self.metrics.timer("plan"):
+            roi_ee = self.roi_to_ee(ROI_gdf)
+            scene_counts = self.planMonths(roi_ee, [(start_date, end_date) for start_date, end_date, _ in month_jobs])
+        for (start_date, _, _), count in zip(month_jobs, scene_counts):
+            if count == 0:
+                print(f"Skipped {start_date[:7]}: No images found for this region and date.")
+                self.log.addWarning(f"Skipped {start_date[:7]}: No images found for this region and date.")
+        self.metrics.increment("months_skipped", sum(count == 0 for count in scene_counts))
+        self.metrics.increment("months_planned", sum(count > 0 for count in scene_counts))
+        self.metrics.increment("tiles_planned", sum(n for n, count in zip(pending_counts, scene_counts) if count > 0))
+        self.metrics.report(force=True)
+        month_jobs = [job for job, count in zip(month_jobs, scene_counts) if count > 0]
+
+        return DownloadPlan(ROI_gdf, ROI_grid_gdf, month_jobs, all_filenames, roi_ee)
+
+    def downloadTiles(
+        self, 
+        roi_path: str, 
+        startDate: str, 
+        endDate: str, 
+        filename: str, 
+        tile_indices: list[int]
+    ) -> dict:
+        """
+        Downloads one month for a subset of the ROI grid tiles, e.g. as one subtask of a fanned-out job.
+
+        The grid is regenerated from the ROI, which gives the same tiles and indices as `planDownload`, 
+        so only the tile indices need to be passed to the subtask. The "datacube" output format is not 
+        supported: the datacube's chunk locks only serialize threads, and subtasks running in other 
+        processes would overwrite each other's chunks (and the shared transform chunk).
+
+        Args:
+            roi_path (str): Path to the shapefile containing the region of interest (ROI).
+            startDate (str): Start date of the month, in 'YYYY-MM-DD' format.
+            endDate (str): End date of the month, in 'YYYY-MM-DD' format.
+            filename (str): The month's filename, e.g. '2018-01.tif'.
+            tile_indices (list[int]): Indices of the grid tiles to download.
+
+        Returns:
+            dict: The metrics snapshot of this subset (see `DownloadMetrics.snapshot`).
+
+        Raises:
+            ValueError: If the output format is "datacube".
+        """
+        if self.output_format == "datacube":
+            raise ValueError("The 'datacube' output format cannot be written by parallel subtasks; use startDownload")
+
+        ROI_gdf = gpd.read_file(roi_path)
+        ROI_grid_gdf = self.gridROI(ROI_gdf).loc[list(tile_indices)]
+
+        self.metrics.increment("tiles_planned", len(self.pendingTiles(ROI_grid_gdf, filename)))
+        self.downloadMonthlyComposite(
+            ROI_grid_gdf, 
+            startDate, 
+            endDate, 
+            filename, 
+            roi_ee=self.roi_to_ee(ROI_gdf), 
+            check_empty=False
+        )
+        return self.metrics.snapshot()
+
+    def finishDownload(self, ROI_grid_gdf: gpd.GeoDataFrame, filenames: list[str]) -> None:
+        """
+        Finalizes a download: builds the month mosaics ("cog" output format) and logs the job's metrics.
+
+        Args:
+            ROI_grid_gdf (gpd.GeoDataFrame): The ROI grid tiles.
+            filenames (list[str]): Filenames of every month of the job, e.g. '2018-01.tif'.
+        """
+        if self.output_format == "cog":
+            self.buildMosaics(ROI_grid_gdf, filenames)
+
+        self.log.addInfo(f"HTTP stats: {self.http.stats()}")
+        self.log.addEvent("metrics", **self.metrics.snapshot())
+        self.metrics.report(force=True)
+        self.log.addInfo("Finished Downloading")
 
 if __name__ == "__main__":
     ee.Initialize(project="vegetationflow-p4p")
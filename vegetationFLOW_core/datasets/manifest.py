@@ -0,0 +1,123 @@
+"""
+Download Manifest
+
+This module keeps a per-dataset record of which (tile, month) pairs have been downloaded,
+so that an interrupted download can be resumed without contacting Earth Engine again.
+
+Classes:
+--------
+- DownloadManifest
+    Append-only JSON lines manifest stored in the dataset directory.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class DownloadManifest:
+    """
+    An append-only, thread-safe manifest of the work done for a dataset.
+
+    Every completed (tile, month) pair is written as one JSON line as soon as it finishes,
+    so the manifest survives crashes. When loaded, later lines override earlier ones and a
+    truncated last line (from a crash mid-write) is ignored.
+
+    Attributes:
+        path (str): Path of the manifest file.
+    """
+
+    FILENAME = "manifest.jsonl"
+    DONE = "done"          # Tile downloaded and written
+    INVALID = "invalid"    # Tile skipped because most pixels are masked
+    FAILED = "failed"      # Download failed, retried on resume
+
+    def __init__(self, dataset_dir: str) -> None:
+        """
+        Loads the manifest of a dataset directory, or starts a new one.
+
+        Args:
+            dataset_dir (str): The dataset directory the manifest belongs to.
+        """
+        self.path = os.path.join(dataset_dir, self.FILENAME)
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partially written line
+                self._entries[(entry["tile"], entry["month"])] = entry
+
+    def record(
+            self,
+            tile: str,
+            month: str,
+            status: str,
+            num_bytes: int = 0,
+            checksum: Optional[str] = None
+    ) -> None:
+        """
+        Records the outcome of a (tile, month) pair and appends it to the manifest file.
+
+        Args:
+            tile (str): Tile key, e.g. "tile_30m_256px_1530_-4372".
+            month (str): Month in 'YYYY-MM' format.
+            status (str): One of DONE, INVALID or FAILED.
+            num_bytes (int): Size of the written file in bytes.
+            checksum (str | None): SHA-256 hex digest of the written file.
+        """
+        entry = {
+            "tile": tile,
+            "month": month,
+            "status": status,
+            "bytes": num_bytes,
+            "sha256": checksum,
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self._entries[(tile, month)] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+
+    def get(self, tile: str, month: str) -> Optional[dict]:
+        """Returns the latest entry for a (tile, month) pair, or None if it was never recorded."""
+        with self._lock:
+            return self._entries.get((tile, month))
+
+    def isResolved(self, tile: str, month: str, filepath: Optional[str] = None) -> bool:
+        """
+        Checks whether a (tile, month) pair needs no further work.
+
+        A pair is resolved if it is known to be invalid, or if it was downloaded and the file
+        on disk still has the recorded size. If `filepath` is None (e.g. tiles stored in a 
+        datacube), a downloaded pair is trusted without checking the disk.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            filepath (str | None): Expected path of the downloaded GeoTIFF.
+
+        Returns:
+            bool: True if the pair can be skipped.
+        """
+        entry = self.get(tile, month)
+        if entry is None:
+            return False
+        if entry["status"] == self.INVALID:
+            return True
+        if entry["status"] == self.DONE:
+            if filepath is None:
+                return True
+            return os.path.exists(filepath) and os.path.getsize(filepath) == entry["bytes"]
+        return False
@@ -0,0 +1,164 @@
+"""
+Super-Tile Fetching
+
+Helpers for the "supertile" export mode of `LandsatDownloader`. Adjacent grid tiles are grouped into
+square blocks of the tile lattice ("super-tiles"), each block is downloaded from Earth Engine with a
+single request covering its tiles, and the download is sliced locally into the usual per-tile patches,
+each with its own geotransform.
+
+Functions:
+----------
+- supertile_factor(img_size, num_bands, ...) -> int
+    Side length, in tiles, of the largest super-tile that fits in one download request.
+
+- group_supertiles(grid, factor) -> list[pd.Index]
+    Groups grid tiles by the super-tile block of the lattice they fall in.
+
+- read_supertile(path, bounds, size_px) -> Iterator[tuple[int, np.ndarray, tuple]]
+    Reads the tiles of a downloaded super-tile one at a time.
+
+- split_supertile(path, bounds, size_px, out_paths) -> None
+    Writes each tile of a super-tile as its own GeoTIFF.
+"""
+
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import rasterio
+from rasterio.windows import Window, from_bounds
+
+from vegetationFLOW_core.datasets.timestack import EE_REQUEST_LIMIT_BYTES
+
+# Earth Engine rejects `getDownloadURL` requests with a wider or taller pixel grid
+EE_MAX_GRID_DIM_PX = 10000
+
+
+def supertile_factor(
+        img_size: int,
+        num_bands: int,
+        bytes_per_pixel: int = 4,
+        limit_bytes: int = EE_REQUEST_LIMIT_BYTES,
+        headroom: float = 0.9,
+        max_dim_px: int = EE_MAX_GRID_DIM_PX
+) -> int:
+    """
+    Side length, in tiles, of the largest square super-tile that fits in one Earth Engine download request.
+
+    Parameters
+    ----------
+    img_size : int
+        Tile size in pixels (height and width).
+    num_bands : int
+        Number of bands downloaded.
+    bytes_per_pixel : int
+        Size of one band value; 4 for the float32 super-tiles requested by the downloader.
+    limit_bytes : int
+        Earth Engine request size limit.
+    headroom : float
+        Fraction of the limit to use, leaving room for the GeoTIFF structure.
+    max_dim_px : int
+        Earth Engine limit on the width and height of a request.
+
+    Returns
+    -------
+    int
+        At least 1, in which case every tile is its own super-tile.
+    """
+    tile_bytes = img_size * img_size * num_bands * bytes_per_pixel
+    factor = 1
+    while ((factor + 1) ** 2 * tile_bytes <= limit_bytes * headroom
+           and (factor + 1) * img_size <= max_dim_px):
+        factor += 1
+    return factor
+
+
+def group_supertiles(grid: gpd.GeoDataFrame, factor: int) -> list[pd.Index]:
+    """
+    Groups grid tiles into super-tiles: the `factor` x `factor` blocks of the tile lattice.
+
+    Blocks are aligned to the lattice (not to the ROI), so the same tiles are grouped together
+    whatever the ROI, and a block only holds the grid tiles that fall in it.
+
+    Parameters
+    ----------
+    grid : gpd.GeoDataFrame
+        Equally sized grid tiles with `col` and `row` lattice indices (see `patch_roi`).
+    factor : int
+        Super-tile side length in tiles, see `supertile_factor`.
+
+    Returns
+    -------
+    list[pd.Index]
+        The grid index of the tiles of each super-tile, in grid order.
+    """
+    block_col = grid["col"].to_numpy() // factor
+    block_row = grid["row"].to_numpy() // factor
+    groups = pd.Series(grid.index, index=grid.index).groupby([block_col, block_row], sort=True)
+    return [pd.Index(group.to_numpy()) for _, group in groups]
+
+
+def _windows(src: rasterio.DatasetReader, bounds: list[tuple], size_px: int) -> list[Window]:
+    """Pixel windows of the tiles in a super-tile, snapped to whole pixels."""
+    windows = []
+    for tile_bounds in bounds:
+        window = from_bounds(*tile_bounds, transform=src.transform).round_offsets()
+        windows.append(Window(window.col_off, window.row_off, size_px, size_px))
+    return windows
+
+
+def read_supertile(path: str, bounds: list[tuple], size_px: int) -> Iterator[tuple[int, np.ndarray, tuple]]:
+    """
+    Reads the tiles of a downloaded super-tile one at a time.
+
+    Parameters
+    ----------
+    path : str
+        Path of the super-tile GeoTIFF.
+    bounds : list[tuple]
+        (minx, miny, maxx, maxy) of each tile, in the CRS of the super-tile.
+    size_px : int
+        Tile size in pixels.
+
+    Yields
+    ------
+    tuple[int, np.ndarray, tuple]
+        The tile's position in `bounds`, its (band, y, x) float32 array and its affine geotransform.
+    """
+    with rasterio.open(path) as src:
+        for k, window in enumerate(_windows(src, bounds, size_px)):
+            yield k, src.read(window=window, out_dtype=np.float32), tuple(src.window_transform(window))
+
+
+def split_supertile(path: str, bounds: list[tuple], size_px: int, out_paths: list[str]) -> None:
+    """
+    Slices a super-tile into one GeoTIFF per tile, laid out like a single-tile download.
+
+    Each file is written to a temporary `.part` file and atomically renamed.
+
+    Parameters
+    ----------
+    path : str
+        Path of the super-tile GeoTIFF.
+    bounds : list[tuple]
+        (minx, miny, maxx, maxy) of each tile, in the CRS of the super-tile.
+    size_px : int
+        Tile size in pixels.
+    out_paths : list[str]
+        Output path of each tile, in the order of `bounds`.
+    """
+    with rasterio.open(path) as src:
+        profile = src.profile.copy()
+        descriptions = src.descriptions
+        profile.update(width=size_px, height=size_px)
+        for window, out_path in zip(_windows(src, bounds, size_px), out_paths):
+            tmp_path = f"{out_path}.part"
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            with rasterio.open(tmp_path, "w", **{**profile, "transform": src.window_transform(window)}) as dst:
+                dst.write(src.read(window=window))
+                for i, description in enumerate(descriptions, start=1):
+                    if description:
+                        dst.set_band_description(i, description)
+            os.replace(tmp_path, out_path)
@@ -0,0 +1,224 @@
+"""
+Shared Tile Cache
+
+This module keeps downloaded tiles in a cache shared by all datasets, so a ground tile that was
+already downloaded for one ROI is linked into the next dataset instead of being requested from
+Earth Engine again. Tiles are identified by their global lattice key (see `lattice_tile_key`), so
+overlapping ROIs of different users resolve to the same entries.
+
+Classes:
+--------
+- TileCache
+    Content-addressed tile store with a SQLite index and size-based LRU eviction.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+from vegetationFLOW_core.datasets.cog import file_sha256
+
+
+class TileCache:
+    """
+    A content-addressed, size-bounded cache of tile GeoTIFFs shared between datasets.
+
+    Entries are keyed by (tile key, month, bands, dtype, processing version) and point to an object named
+    by the SHA-256 of its content (`objects/{sha[:2]}/{sha}.tif`), so identical files are stored once.
+    Objects are added and handed out as hard links where possible (falling back to copies across
+    file systems); tiles are never modified in place, so a dataset keeps its tiles when they are
+    evicted from the cache. When the objects exceed `max_bytes`, the least recently used entries
+    are evicted. The SQLite index makes the cache safe to share between processes.
+
+    Attributes:
+        cache_dir (str): Root directory of the cache.
+        max_bytes (int): Maximum total size of the cached objects.
+        processing_version (str): Part of every key, so tiles made by other pipeline versions are not reused.
+    """
+
+    FILENAME = "index.sqlite"
+
+    def __init__(self, cache_dir: str, max_bytes: int = 50 * 1024 ** 3, processing_version: str = "") -> None:
+        """
+        Opens the cache in a directory, creating it if needed.
+
+        Args:
+            cache_dir (str): Root directory of the cache.
+            max_bytes (int): Maximum total size of the cached objects, 50 GiB by default.
+            processing_version (str): Version of the processing that produced the tiles.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.processing_version = processing_version
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+
+        self._conn = sqlite3.connect(os.path.join(cache_dir, self.FILENAME), timeout=30.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    tile TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_sha256 ON entries (sha256)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+
+    def key(self, tile: str, month: str, bands: list[str], dtype: str) -> str:
+        """Returns the cache key of a tile-month: a SHA-256 over (tile, month, bands, dtype, processing version)."""
+        payload = json.dumps([tile, month, list(bands), dtype, self.processing_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def objectPath(self, sha256: str) -> str:
+        """Returns the path of the object with a given content hash."""
+        return os.path.join(self.cache_dir, "objects", sha256[:2], f"{sha256}.tif")
+
+    def get(self, tile: str, month: str, bands: list[str], dtype: str) -> Optional[str]:
+        """
+        Looks up a tile-month and marks it as recently used.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            bands (list[str]): Band names of the tile.
+            dtype (str): Data type of the tile's pixels, e.g. "float32".
+
+        Returns:
+            str | None: The SHA-256 of the cached object, or None on a miss.
+        """
+        key = self.key(tile, month, bands, dtype)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT sha256 FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if not os.path.exists(self.objectPath(row[0])): # Removed behind the index's back
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, tile: str, month: str, bands: list[str], dtype: str, filepath: str) -> str:
+        """
+        Adds a tile-month to the cache, then evicts least recently used entries above `max_bytes`.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            bands (list[str]): Band names of the tile.
+            dtype (str): Data type of the tile's pixels, e.g. "float32".
+            filepath (str): Path of the tile's GeoTIFF, as downloaded.
+
+        Returns:
+            str: The SHA-256 of the cached object.
+        """
+        sha256 = file_sha256(filepath)
+        object_path = self.objectPath(sha256)
+        with self._lock, self._conn:
+            # Linking and indexing the object under the write lock orders them with `evict` in other
+            # processes, which deletes unreferenced objects before committing
+            self._conn.execute("BEGIN IMMEDIATE")
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                self._linkOrCopy(filepath, object_path)
+            self._conn.execute(
+                """
+                INSERT INTO entries (key, tile, month, sha256, bytes, last_access) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET sha256=excluded.sha256, bytes=excluded.bytes, last_access=excluded.last_access
+                """,
+                (self.key(tile, month, bands, dtype), tile, month, sha256, os.path.getsize(object_path), time.time())
+            )
+        self.evict()
+        return sha256
+
+    def materialize(self, tile: str, month: str, bands: list[str], dtype: str, dst_path: str) -> Optional[str]:
+        """
+        Places a cached tile-month at `dst_path`, as a hard link or a copy.
+
+        Args:
+            tile (str): Tile key.
+            month (str): Month in 'YYYY-MM' format.
+            bands (list[str]): Band names of the tile.
+            dtype (str): Data type of the tile's pixels, e.g. "float32".
+            dst_path (str): Where the tile's GeoTIFF should be.
+
+        Returns:
+            str | None: The SHA-256 of the tile, or None on a miss.
+        """
+        sha256 = self.get(tile, month, bands, dtype)
+        if sha256 is None:
+            return None
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        try:
+            self._linkOrCopy(self.objectPath(sha256), dst_path)
+        except FileNotFoundError: # Evicted by another process in the meantime
+            return None
+        return sha256
+
+    def evict(self) -> int:
+        """
+        Evicts least recently used entries until the cached objects fit in `max_bytes`.
+
+        An object is deleted once no entry refers to it anymore, before the transaction commits, so a
+        concurrent `put` never indexes an object that is about to be deleted.
+
+        Returns:
+            int: The number of objects deleted.
+        """
+        removed = []
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(bytes), 0) FROM (SELECT sha256, MAX(bytes) AS bytes FROM entries GROUP BY sha256)"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for key, sha256, num_bytes in self._conn.execute(
+                "SELECT key, sha256, bytes FROM entries ORDER BY last_access"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                if self._conn.execute("SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone() is None:
+                    removed.append(sha256)
+                    total -= num_bytes
+            for sha256 in removed:
+                try:
+                    os.remove(self.objectPath(sha256))
+                except FileNotFoundError:
+                    pass
+        return len(removed)
+
+    def stats(self) -> dict:
+        """Returns the number of entries and objects and the total size of the objects."""
+        with self._lock:
+            entries, objects, num_bytes = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM entries), COUNT(*), COALESCE(SUM(bytes), 0) "
+                "FROM (SELECT sha256, MAX(bytes) AS bytes FROM entries GROUP BY sha256)"
+            ).fetchone()
+        return {"entries": entries, "objects": objects, "bytes": num_bytes, "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _linkOrCopy(src: str, dst: str) -> None:
+        """Atomically places `src` at `dst`, as a hard link if both are on the same file system."""
+        tmp_path = f"{dst}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            os.link(src, tmp_path)
+        except FileNotFoundError: # The source is gone, a copy would fail too
+            raise
+        except OSError: # Other file system, or links not supported
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
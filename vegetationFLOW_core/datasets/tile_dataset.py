@@ -0,0 +1,266 @@
+"""
+Tile Dataset
+
+This module contains a PyTorch `Dataset` that reads downloaded Landsat tiles back for training.
+
+Classes:
+--------
+- LandsatTileDataset
+    Map-style dataset over a downloaded dataset directory (GeoTIFFs or datacube).
+"""
+
+import os
+import re
+from collections import OrderedDict
+from typing import Callable, Literal, Optional
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+import torch
+from torch.utils.data import Dataset
+
+# Band order of the downloaded composites (see LandsatDownloader.BANDS)
+LANDSAT_BANDS = ('SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7')
+
+MONTH_FILE = re.compile(r"^(\d{4})-(\d{2})\.tif$")
+
+# GDAL options for many small, independent reads: no directory listing on open, no sidecar lookups
+GDAL_READ_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "GDAL_PAM_ENABLED": "NO",
+}
+
+
+class LandsatTileDataset(Dataset):
+    """
+    A map-style dataset over the tiles of a downloaded dataset directory.
+
+    The directory is indexed once, at construction, into compact integer arrays: each item is a
+    (tile, start month) pair stored as two int32 values, and file paths are rebuilt from the tile
+    name and month when an item is read. No per-item strings are kept, so the index stays small
+    and cheap to copy into `DataLoader` workers.
+
+    Tiles are read with windowed I/O. Open file handles are cached per worker process (keyed on the
+    process id), so the dataset is safe to use with multi-worker and persistent-worker `DataLoader`s.
+
+    Attributes:
+        dataset_dir (str): The downloaded dataset directory.
+        tiles (list[str]): Tile folder names, indexed by the tile ids of the items.
+        months (np.ndarray): Month ordinals (year * 12 + month - 1) of the time axis.
+        band_indexes (list[int]): 1-based indexes of the selected bands.
+        sequence_length (int): Number of consecutive months per item.
+    """
+
+    def __init__(
+            self,
+            dataset_dir: str,
+            bands: Optional[list[str]] = None,
+            sequence_length: int = 1,
+            start_month: Optional[str] = None,
+            end_month: Optional[str] = None,
+            window: Optional[tuple[int, int, int, int]] = None,
+            source: Literal["auto", "geotiff", "datacube"] = "auto",
+            fill_value: Optional[float] = 0.0,
+            transform: Optional[Callable] = None,
+            max_open_files: int = 64
+    ) -> None:
+        """
+        Indexes a downloaded dataset directory.
+
+        Args:
+            dataset_dir (str): The dataset directory written by `LandsatDownloader`.
+            bands (list[str] | None): Band names to read, e.g. ['SR_B4', 'SR_B5']. None reads all bands.
+            sequence_length (int): Number of consecutive months per item. 1 returns single images,
+                larger values return temporal windows; tiles with a missing month inside a window are skipped.
+            start_month (str | None): First month ('YYYY-MM') to include.
+            end_month (str | None): Last month ('YYYY-MM') to include.
+            window (tuple[int, int, int, int] | None): (col_off, row_off, width, height) pixel window
+                read from each tile. None reads whole tiles.
+            source (str): "geotiff" reads `tile_*/YYYY-MM.tif` files, "datacube" reads `datacube.zarr`,
+                "auto" uses the datacube if present.
+            fill_value (float | None): Value replacing NaN (masked) pixels. None keeps NaNs.
+            transform (Callable | None): Applied to the image tensor before it is returned.
+            max_open_files (int): Maximum number of file handles cached per worker.
+        """
+        self.dataset_dir = dataset_dir
+        self.sequence_length = sequence_length
+        self.window = window
+        self.fill_value = fill_value
+        self.transform = transform
+        self.max_open_files = max_open_files
+
+        bands = list(bands) if bands is not None else list(LANDSAT_BANDS)
+        unknown = [band for band in bands if band not in LANDSAT_BANDS]
+        if unknown:
+            raise ValueError(f"Unknown bands: {unknown}. Must be in {LANDSAT_BANDS}")
+        self.bands = bands
+        self.band_indexes = [LANDSAT_BANDS.index(band) + 1 for band in bands]
+
+        datacube_path = os.path.join(dataset_dir, "datacube.zarr")
+        if source == "auto":
+            source = "datacube" if os.path.exists(datacube_path) else "geotiff"
+        self.source = source
+
+        if source == "datacube":
+            presence = self._indexDatacube(datacube_path)
+        else:
+            presence = self._indexGeoTIFFs()
+
+        # Restrict the time axis
+        lo = _month_ordinal(start_month) if start_month else -np.inf
+        hi = _month_ordinal(end_month) if end_month else np.inf
+        keep = (self.months >= lo) & (self.months <= hi)
+        self.months = self.months[keep]
+        presence = presence[:, keep]
+
+        # An item starts at (tile, t) when months t .. t + sequence_length - 1 are all present
+        # and consecutive in the calendar
+        n_tiles, n_months = presence.shape
+        starts = np.zeros_like(presence)
+        if n_months >= sequence_length:
+            span = self.months[sequence_length - 1:] - self.months[:n_months - sequence_length + 1]
+            consecutive = span == sequence_length - 1
+            counts = np.cumsum(np.pad(presence, ((0, 0), (1, 0))).astype(np.int32), axis=1)
+            full = (counts[:, sequence_length:] - counts[:, :n_months - sequence_length + 1]) == sequence_length
+            starts[:, :n_months - sequence_length + 1] = full & consecutive
+        self.tile_ids, self.month_ids = (idx.astype(np.int32) for idx in np.nonzero(starts))
+
+        self._pid = None
+        self._handles: OrderedDict = OrderedDict()
+        self._env = None
+        self._cube = None
+
+    def _indexGeoTIFFs(self) -> np.ndarray:
+        """Scans the tile folders once and returns the (tile, month) presence matrix."""
+        tiles = []
+        tile_months = []
+        with os.scandir(self.dataset_dir) as entries:
+            for entry in entries:
+                if not (entry.is_dir() and entry.name.startswith("tile_")):
+                    continue
+                months = []
+                with os.scandir(entry.path) as files:
+                    for f in files:
+                        match = MONTH_FILE.match(f.name)
+                        if match:
+                            months.append(int(match.group(1)) * 12 + int(match.group(2)) - 1)
+                if months:
+                    tiles.append(entry.name)
+                    tile_months.append(months)
+
+        order = sorted(range(len(tiles)), key=lambda i: tiles[i])
+        self.tiles = [tiles[i] for i in order]
+        all_months = sorted({m for months in tile_months for m in months})
+        self.months = np.asarray(all_months, dtype=np.int32)
+        month_pos = {m: i for i, m in enumerate(all_months)}
+
+        presence = np.zeros((len(self.tiles), len(all_months)), dtype=bool)
+        for row, i in enumerate(order):
+            presence[row, [month_pos[m] for m in tile_months[i]]] = True
+        return presence
+
+    def _indexDatacube(self, path: str) -> np.ndarray:
+        """Reads the tile and month axes of the datacube; a tile-month is present if it was written."""
+        from vegetationFLOW_core.datasets.datacube import TileDatacube
+        from vegetationFLOW_core.datasets.manifest import DownloadManifest
+
+        cube = TileDatacube(path)
+        self.tiles = cube.tiles
+        self.months = np.asarray([_month_ordinal(m) for m in cube.months], dtype=np.int32)
+
+        # The manifest records which tile-months were written, avoiding a scan of the array
+        manifest = DownloadManifest(self.dataset_dir)
+        presence = np.zeros((len(cube.tiles), len(cube.months)), dtype=bool)
+        for i, tile in enumerate(cube.tiles):
+            for j, month in enumerate(cube.months):
+                entry = manifest.get(tile, month)
+                presence[i, j] = entry is not None and entry["status"] == DownloadManifest.DONE
+        return presence
+
+    def __len__(self) -> int:
+        return len(self.tile_ids)
+
+    def _workerSetup(self) -> None:
+        """Resets per-process state, so handles opened in a parent are never shared with workers."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._handles = OrderedDict()
+        self._env = rasterio.Env(**GDAL_READ_OPTIONS)
+        self._env.__enter__()
+        if self.source == "datacube":
+            from vegetationFLOW_core.datasets.datacube import TileDatacube
+            self._cube = TileDatacube(os.path.join(self.dataset_dir, "datacube.zarr"))
+
+    def _open(self, path: str) -> rasterio.io.DatasetReader:
+        src = self._handles.get(path)
+        if src is not None:
+            self._handles.move_to_end(path)
+            return src
+        src = rasterio.open(path)
+        self._handles[path] = src
+        if len(self._handles) > self.max_open_files:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        return src
+
+    def _readGeoTIFF(self, tile: str, month: int, out: np.ndarray) -> None:
+        path = os.path.join(self.dataset_dir, tile, f"{_month_key(month)}.tif")
+        window = Window(*self.window) if self.window is not None else None
+        out[...] = self._open(path).read(self.band_indexes, window=window, out_dtype=np.float32)
+
+    def __getitem__(self, idx: int) -> dict:
+        """
+        Reads one item.
+
+        Returns:
+            dict: "image" (float32 tensor of shape (C, H, W), or (T, C, H, W) if sequence_length > 1),
+                "tile" (tile id) and "month" (ordinal of the first month).
+        """
+        self._workerSetup()
+        tile_id = int(self.tile_ids[idx])
+        month_id = int(self.month_ids[idx])
+        tile = self.tiles[tile_id]
+        months = self.months[month_id:month_id + self.sequence_length]
+
+        if self.source == "datacube":
+            window = None
+            if self.window is not None:
+                col_off, row_off, width, height = self.window
+                window = (slice(row_off, row_off + height), slice(col_off, col_off + width))
+            image = self._cube.read(tile, [_month_key(m) for m in months], self.bands, window=window)[0]
+        else:
+            first = self._open(os.path.join(self.dataset_dir, tile, f"{_month_key(months[0])}.tif"))
+            height, width = (self.window[3], self.window[2]) if self.window is not None else first.shape
+            image = np.empty((len(months), len(self.band_indexes), height, width), dtype=np.float32)
+            for t, month in enumerate(months):
+                self._readGeoTIFF(tile, month, image[t])
+
+        if self.fill_value is not None:
+            np.nan_to_num(image, copy=False, nan=self.fill_value)
+        if self.sequence_length == 1:
+            image = image[0]
+
+        image = torch.from_numpy(np.ascontiguousarray(image))
+        if self.transform is not None:
+            image = self.transform(image)
+        return {"image": image, "tile": tile_id, "month": int(months[0])}
+
+    def __getstate__(self) -> dict:
+        # File handles and GDAL environments are per process and are reopened in each worker
+        state = self.__dict__.copy()
+        state.update(_pid=None, _handles=OrderedDict(), _env=None, _cube=None)
+        return state
+
+
+def _month_ordinal(month: str) -> int:
+    """'YYYY-MM' -> year * 12 + month - 1."""
+    year, mm = month.split("-")[:2]
+    return int(year) * 12 + int(mm) - 1
+
+
+def _month_key(ordinal: int) -> str:
+    """year * 12 + month - 1 -> 'YYYY-MM'."""
+    year, month0 = divmod(int(ordinal), 12)
+    return f"{year}-{month0 + 1:02d}"
@@ -0,0 +1,182 @@
+"""
+Time-Stacked Exports
+
+Helpers for the "stacked" export mode of `LandsatDownloader`. Instead of one Earth Engine request
+per tile and month, the monthly composites are stacked server-side into one multi-band image with
+bands named `{YYYY-MM}_{band}` (e.g. '2018-01_SR_B4'), and each tile downloads as many months as fit
+under the Earth Engine request size limit in one GeoTIFF. The stack is then split back locally.
+
+Functions:
+----------
+- stack_band_names(months, bands) -> list[str]
+    Band names of a stack of months, in month then band order.
+
+- months_per_request(img_size, num_bands, ...) -> int
+    Number of months of a tile that fit in one download request.
+
+- chunk_months(months, max_months) -> list[list[str]]
+    Splits months into per-year request chunks of at most `max_months`.
+
+- read_stack(stack_path, num_bands) -> Iterator[tuple[int, np.ndarray, tuple]]
+    Reads a downloaded stack one month at a time.
+
+- split_stack(stack_path, out_paths, bands) -> None
+    Writes each month of a stack as its own GeoTIFF.
+"""
+
+import math
+import os
+from itertools import groupby
+from typing import Iterator
+
+import numpy as np
+import rasterio
+
+# Earth Engine rejects `getDownloadURL` requests above this (uncompressed) size
+EE_REQUEST_LIMIT_BYTES = 32 * 1024 ** 2
+
+
+def stack_band_names(months: list[str], bands: list[str]) -> list[str]:
+    """
+    Band names of a time stack.
+
+    Parameters
+    ----------
+    months : list[str]
+        Months in 'YYYY-MM' format.
+    bands : list[str]
+        Band names of a single month.
+
+    Returns
+    -------
+    list[str]
+        '{month}_{band}' for every month, then band.
+    """
+    return [f"{month}_{band}" for month in months for band in bands]
+
+
+def months_per_request(
+        img_size: int,
+        num_bands: int,
+        bytes_per_pixel: int = 4,
+        limit_bytes: int = EE_REQUEST_LIMIT_BYTES,
+        headroom: float = 0.9
+) -> int:
+    """
+    Number of months of one tile that fit in a single Earth Engine download request.
+
+    Parameters
+    ----------
+    img_size : int
+        Tile size in pixels (height and width).
+    num_bands : int
+        Bands per month.
+    bytes_per_pixel : int
+        Size of one band value; 4 for the float32 stacks requested by the downloader.
+    limit_bytes : int
+        Earth Engine request size limit.
+    headroom : float
+        Fraction of the limit to use, leaving room for the GeoTIFF structure.
+
+    Returns
+    -------
+    int
+        At least 1, so a tile too large for the limit falls back to one month per request.
+    """
+    month_bytes = img_size * img_size * num_bands * bytes_per_pixel
+    return max(1, int(limit_bytes * headroom) // month_bytes)
+
+
+def chunk_months(months: list[str], max_months: int) -> list[list[str]]:
+    """
+    Splits months into the chunks downloaded per request.
+
+    Chunks never span two years, and a year needing several requests is split into
+    chunks of (almost) equal size, e.g. 12 months at most 5 per request give 4 + 4 + 4.
+
+    Parameters
+    ----------
+    months : list[str]
+        Months in 'YYYY-MM' format, in chronological order.
+    max_months : int
+        Maximum months per chunk, see `months_per_request`.
+
+    Returns
+    -------
+    list[list[str]]
+        The chunks, in chronological order.
+    """
+    chunks = []
+    for _, year_months in groupby(months, key=lambda month: month[:4]):
+        year_months = list(year_months)
+        num_chunks = math.ceil(len(year_months) / max_months)
+        size = math.ceil(len(year_months) / num_chunks)
+        chunks.extend(year_months[k:k + size] for k in range(0, len(year_months), size))
+    return chunks
+
+
+def read_stack(stack_path: str, num_bands: int) -> Iterator[tuple[int, np.ndarray, tuple]]:
+    """
+    Reads a downloaded time stack one month at a time, so only one month is held in memory.
+
+    Parameters
+    ----------
+    stack_path : str
+        Path of the stack GeoTIFF, with bands in month then band order.
+    num_bands : int
+        Bands per month.
+
+    Yields
+    ------
+    tuple[int, np.ndarray, tuple]
+        The month's position in the stack, its (band, y, x) float32 array and the affine geotransform.
+
+    Raises
+    ------
+    ValueError
+        If the band count of the stack is not a multiple of `num_bands`.
+    """
+    with rasterio.open(stack_path) as src:
+        if src.count % num_bands != 0:
+            raise ValueError(f"Stack has {src.count} bands, not a multiple of {num_bands} bands per month")
+        transform = tuple(src.transform)
+        for k in range(src.count // num_bands):
+            indexes = list(range(k * num_bands + 1, (k + 1) * num_bands + 1))
+            yield k, src.read(indexes, out_dtype=np.float32), transform
+
+
+def split_stack(stack_path: str, out_paths: list[str], bands: list[str]) -> None:
+    """
+    Splits a time stack into one GeoTIFF per month, laid out like a single-month download.
+
+    Each file is written to a temporary `.part` file and atomically renamed, so an interrupted
+    split never leaves a truncated month behind.
+
+    Parameters
+    ----------
+    stack_path : str
+        Path of the stack GeoTIFF, with bands in month then band order.
+    out_paths : list[str]
+        Output path of each month, in stack order.
+    bands : list[str]
+        Band names of a single month, written as band descriptions.
+
+    Raises
+    ------
+    ValueError
+        If the stack does not hold exactly `len(out_paths)` months.
+    """
+    with rasterio.open(stack_path) as src:
+        profile = src.profile.copy()
+        if src.count != len(out_paths) * len(bands):
+            raise ValueError(f"Stack has {src.count} bands, expected {len(out_paths)} months of {len(bands)} bands")
+
+    profile.update(count=len(bands))
+    for k, image, _ in read_stack(stack_path, len(bands)):
+        tmp_path = f"{out_paths[k]}.part"
+        os.makedirs(os.path.dirname(out_paths[k]), exist_ok=True)
+        with rasterio.open(tmp_path, "w", **{**profile, "dtype": image.dtype.name}) as dst:
+            dst.write(image)
+            for i, band in enumerate(bands, start=1):
+                dst.set_band_description(i, band)
+        os.replace(tmp_path, out_paths[k])
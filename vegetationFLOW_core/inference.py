@@ -0,0 +1,292 @@
+"""
+Inference Engine
+
+This module runs a trained model over a downloaded dataset and writes the predictions
+as a single georeferenced mosaic.
+
+The mosaic is processed as a stream of overlapping sliding windows, one row of windows
+at a time. Overlapping predictions are blended with a smooth weight map, and output rows
+are written as soon as every window covering them has been predicted, so neither the
+input nor the output mosaic is ever held in memory in full.
+
+Classes:
+--------
+- InferenceEngine
+    Batched, blended sliding-window inference from tile GeoTIFFs to a mosaic GeoTIFF.
+"""
+
+import os
+import glob
+import time
+import queue
+import threading
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import rasterio
+from rasterio.merge import merge
+from rasterio.transform import from_origin
+from rasterio.windows import Window
+import torch
+
+
+class InferenceEngine:
+    """
+    Batched sliding-window inference over the tiles of a dataset directory.
+
+    Attributes:
+        model (torch.nn.Module): The model. Takes (B, C, H, W) float32 and returns (B, K, H, W).
+        window_size (int): Side of the square windows fed to the model, in pixels.
+        overlap (int): Overlap between neighbouring windows, in pixels.
+        batch_size (int): Number of windows per forward pass.
+        prefetch (int): Number of window rows read ahead of the model.
+        num_threads (int | None): Intra-op threads used by torch (None keeps torch's default).
+        out_dtype (np.dtype): Data type of the output mosaic.
+    """
+
+    def __init__(
+            self,
+            model: torch.nn.Module,
+            window_size: int = 256,
+            overlap: int = 32,
+            batch_size: int = 8,
+            prefetch: int = 2,
+            num_threads: Optional[int] = None,
+            out_dtype: Union[str, np.dtype] = "float32",
+            device: Union[str, torch.device] = "cpu",
+            bands: Optional[list[int]] = None
+    ) -> None:
+        """
+        Initializes the engine.
+
+        Args:
+            model (torch.nn.Module): The trained model.
+            window_size (int): Side of the model's input windows, in pixels.
+            overlap (int): Overlap between windows, in pixels. Must be smaller than `window_size`.
+            batch_size (int): Number of windows per forward pass.
+            prefetch (int): Number of window rows read ahead by the reader thread.
+            num_threads (int | None): Intra-op threads for torch on CPU.
+            out_dtype (str | np.dtype): Output data type, e.g. "float32", "int16" or "uint8". GeoTIFFs cannot hold float16.
+            device (str | torch.device): Device to run the model on.
+            bands (list[int] | None): 1-based band indexes fed to the model. None uses all bands.
+
+        Raises:
+            ValueError: If `overlap` is not in [0, window_size) or `out_dtype` is float16.
+        """
+        if not 0 <= overlap < window_size:
+            raise ValueError(f"overlap must be in [0, window_size), got {overlap}")
+        if np.dtype(out_dtype) == np.float16:
+            raise ValueError("out_dtype float16 cannot be written to a GeoTIFF; use 'float32' or an integer type")
+        self.model = model.eval().to(device)
+        self.window_size = window_size
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        self.num_threads = num_threads
+        self.out_dtype = np.dtype(out_dtype)
+        self.device = torch.device(device)
+        self.bands = bands
+        self.weights = self._blendWeights(window_size, overlap)
+
+    @staticmethod
+    def _blendWeights(window_size: int, overlap: int) -> np.ndarray:
+        """Weight map ramping linearly from the window edges over the overlap, flat in the centre."""
+        ramp = np.ones(window_size, dtype=np.float32)
+        if overlap > 0:
+            edge = (np.arange(overlap, dtype=np.float32) + 1) / (overlap + 1)
+            ramp[:overlap] = edge
+            ramp[-overlap:] = edge[::-1]
+        return np.outer(ramp, ramp)
+
+    @staticmethod
+    def _positions(length: int, window_size: int, stride: int) -> list[int]:
+        """Window offsets covering [0, length), with the last window flush with the end."""
+        if length <= window_size:
+            return [0]
+        positions = list(range(0, length - window_size, stride))
+        positions.append(length - window_size)
+        return positions
+
+    def _mosaicGrid(self, paths: list[str]) -> tuple:
+        """Returns (transform, width, height, crs, count) of the mosaic covering all tiles."""
+        bounds = []
+        with rasterio.open(paths[0]) as src:
+            res_x, res_y = src.res
+            crs = src.crs
+            count = src.count
+        for path in paths:
+            with rasterio.open(path) as src:
+                bounds.append(src.bounds)
+        bounds = np.asarray(bounds)
+        left, bottom = bounds[:, 0].min(), bounds[:, 1].min()
+        right, top = bounds[:, 2].max(), bounds[:, 3].max()
+        width = int(round((right - left) / res_x))
+        height = int(round((top - bottom) / res_y))
+        return from_origin(left, top, res_x, res_y), width, height, crs, count
+
+    def _readRows(
+            self,
+            sources: list,
+            transform,
+            width: int,
+            row_positions: list[int],
+            out: queue.Queue,
+            stop: threading.Event
+    ) -> None:
+        """
+        Reader thread: reads one strip of `window_size` rows per window row, across all tiles.
+
+        Stops as soon as `stop` is set, even while waiting for room in `out`.
+        """
+        try:
+            res_x, res_y = transform.a, -transform.e
+            left, top = transform.c, transform.f
+            for i, row in enumerate(row_positions):
+                if stop.is_set():
+                    return
+                strip_top = top - row * res_y
+                strip_bounds = (left, strip_top - self.window_size * res_y, left + width * res_x, strip_top)
+                strip, _ = merge(sources, bounds=strip_bounds, res=(res_x, res_y),
+                                 indexes=self.bands, nodata=np.nan, dtype="float32")
+                if not self._put(out, (i, row, strip[:, :self.window_size, :width]), stop):
+                    return
+        except Exception as e:
+            self._put(out, e, stop)
+        self._put(out, None, stop)
+
+    @staticmethod
+    def _put(out: queue.Queue, item, stop: threading.Event) -> bool:
+        """Puts an item in a bounded queue unless `stop` is set first. Returns True if it was put."""
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _batches(self, strip: np.ndarray, col_positions: list[int]) -> Iterator[tuple[list[int], np.ndarray]]:
+        for start in range(0, len(col_positions), self.batch_size):
+            cols = col_positions[start:start + self.batch_size]
+            batch = np.stack([strip[:, :, c:c + self.window_size] for c in cols])
+            yield cols, batch
+
+    def run(self, dataset_dir: str, month: str, out_path: str) -> dict:
+        """
+        Predicts a month of a dataset and writes the blended mosaic.
+
+        Args:
+            dataset_dir (str): The dataset directory (`tile_*/YYYY-MM.tif`).
+            month (str): The month to predict, 'YYYY-MM'.
+            out_path (str): Path of the output GeoTIFF.
+
+        Returns:
+            dict: Run statistics: number of tiles and windows, elapsed seconds, tiles/s and windows/s.
+
+        Raises:
+            FileNotFoundError: If no tile exists for `month`.
+        """
+        paths = sorted(glob.glob(os.path.join(dataset_dir, "tile_*", f"{month}.tif")))
+        if len(paths) == 0:
+            raise FileNotFoundError(f"No tiles found for {month} in {dataset_dir}")
+        if self.num_threads is not None:
+            torch.set_num_threads(self.num_threads)
+
+        start_time = time.perf_counter()
+        transform, width, height, crs, _ = self._mosaicGrid(paths)
+        stride = self.window_size - self.overlap
+        row_positions = self._positions(height, self.window_size, stride)
+        col_positions = self._positions(width, self.window_size, stride)
+        padded_width = max(width, self.window_size)
+
+        sources = [rasterio.open(path) for path in paths]
+        strips: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._readRows,
+            args=(sources, transform, padded_width, row_positions, strips, stop),
+            daemon=True
+        )
+        reader.start()
+
+        # Accumulation buffers hold the `window_size` rows starting at the current window row
+        dst = None
+        acc = weight = valid = None
+        n_windows = 0
+        try:
+            with torch.inference_mode():
+                while (item := strips.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    i, row, strip = item
+                    strip_valid = ~np.isnan(strip).all(axis=0)
+                    np.nan_to_num(strip, copy=False, nan=0.0)
+
+                    for cols, batch in self._batches(strip, col_positions):
+                        pred = self.model(torch.from_numpy(batch).to(self.device)).float().cpu().numpy()
+                        if acc is None:
+                            acc = np.zeros((pred.shape[1], self.window_size, padded_width), dtype=np.float32)
+                            weight = np.zeros((self.window_size, padded_width), dtype=np.float32)
+                            valid = np.zeros((self.window_size, padded_width), dtype=bool)
+                            dst = self._openOutput(out_path, transform, width, height, crs, pred.shape[1])
+                        for k, c in enumerate(cols):
+                            acc[:, :, c:c + self.window_size] += pred[k] * self.weights
+                            weight[:, c:c + self.window_size] += self.weights
+                        n_windows += len(cols)
+                    valid |= strip_valid
+
+                    # Rows above the next window row are final: write them and shift the buffers up
+                    next_row = row_positions[i + 1] if i + 1 < len(row_positions) else height
+                    n_final = min(next_row, height) - row
+                    self._writeRows(dst, acc, weight, valid, row, n_final, width)
+                    for buf in (acc, weight, valid):
+                        buf[..., :-n_final, :] = buf[..., n_final:, :]
+                        buf[..., -n_final:, :] = 0
+        finally:
+            # On an error the reader may be blocked on a full queue: stop it, drain the queue, and only
+            # close the sources once it has exited
+            stop.set()
+            while True:
+                try:
+                    strips.get_nowait()
+                except queue.Empty:
+                    break
+            reader.join()
+            for src in sources:
+                src.close()
+            if dst is not None:
+                dst.close()
+
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "tiles": len(paths),
+            "windows": n_windows,
+            "elapsed_s": elapsed,
+            "tiles_per_s": len(paths) / elapsed,
+            "windows_per_s": n_windows / elapsed,
+        }
+        print(f"Inference on {month}: {stats['tiles_per_s']:.2f} tiles/s ({stats['windows_per_s']:.2f} windows/s)")
+        return stats
+
+    def _openOutput(self, out_path, transform, width, height, crs, count) -> rasterio.io.DatasetWriter:
+        is_float = np.issubdtype(self.out_dtype, np.floating)
+        return rasterio.open(
+            out_path, "w", driver="GTiff",
+            width=width, height=height, count=count,
+            dtype=self.out_dtype.name, crs=crs, transform=transform,
+            nodata=np.nan if is_float else 0,
+            compress="deflate", predictor=3 if is_float else 2,
+            tiled=False, # Striped, so rows can be written as they are finalised
+        )
+
+    def _writeRows(self, dst, acc, weight, valid, row, n_rows, width) -> None:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            block = acc[:, :n_rows, :width] / weight[:n_rows, :width]
+        nodata = ~valid[:n_rows, :width]
+        if np.issubdtype(self.out_dtype, np.integer):
+            info = np.iinfo(self.out_dtype)
+            block = np.clip(np.rint(block), info.min, info.max)
+            block[:, nodata] = 0
+        else:
+            block[:, nodata] = np.nan
+        dst.write(block.astype(self.out_dtype), window=Window(0, row, width, n_rows))
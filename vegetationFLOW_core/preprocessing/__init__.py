@@ -1,6 +1,19 @@
-from . import cloud_masks
+from vegetationFLOW_core.utils.lazy import lazy_module
 
-from . import water_masks
-
-from .cloud_masks import QA_cloud_mask
-from .water_masks import QA_water_mask
\ No newline at end of file
+# Attributes are imported from their submodule on first access, see `lazy_module`
+__getattr__, __dir__, __all__ = lazy_module(
+    __name__,
+    {
+        "QA_cloud_mask": ".cloud_masks",
+        "QA_water_mask": ".water_masks",
+        "QA_valid_mask": ".local_masks",
+        "QA_mask_raster": ".local_masks",
+        "PackedMask": ".local_masks",
+        "median_composite": ".compositing",
+        "composite_periods": ".compositing",
+        "group_scenes": ".compositing",
+        "SpectralIndexEngine": ".indices",
+        "compute_indices": ".indices",
+    },
+    modules=("cloud_masks", "water_masks", "local_masks", "compositing", "indices")
+)
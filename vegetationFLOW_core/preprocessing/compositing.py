@@ -0,0 +1,336 @@
+"""
+Local Compositing Utilities
+
+This module builds NaN-aware median composites from a stack of local, per-scene rasters,
+as a local alternative to requesting `collection.median()` from Earth Engine. Scenes are
+fetched once and composited offline for any window (monthly, seasonal or annual).
+
+The rasters are processed in blocks of full-width rows across a process pool. The block
+height is chosen so that the peak memory of all workers stays under a fixed budget,
+regardless of how many scenes are in the window.
+
+Functions:
+----------
+- group_scenes(scene_dates, period) -> dict[str, list[int]]
+    Groups scenes into monthly, seasonal or annual compositing windows.
+
+- median_composite(scene_paths, out_path, ...) -> str
+    Writes the masked median composite of a list of co-registered scenes.
+
+- composite_periods(scenes, out_dir, period, ...) -> dict[str, str]
+    Writes one median composite per compositing window, compositing the windows in parallel.
+"""
+
+import os
+import warnings
+import concurrent.futures
+from datetime import date, datetime
+from typing import Iterable, Optional, Union, Literal
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+from .local_masks import QA_valid_mask, DEFAULT_MASK_BITS, _band_index
+
+SEASONS = {12: "DJF", 1: "DJF", 2: "DJF", 3: "MAM", 4: "MAM", 5: "MAM",
+           6: "JJA", 7: "JJA", 8: "JJA", 9: "SON", 10: "SON", 11: "SON"}
+
+
+def group_scenes(
+        scene_dates: Iterable[Union[str, date]],
+        period: Literal["month", "season", "year"] = "month"
+) -> dict[str, list[int]]:
+    """
+    Groups scenes into compositing windows by acquisition date.
+
+    Parameters
+    ----------
+    scene_dates : Iterable[str | date]
+        Acquisition date of each scene, as `date` objects or 'YYYY-MM-DD' strings.
+    period : str
+        "month" ('YYYY-MM'), "season" ('YYYY-DJF', December counts towards the next year's DJF)
+        or "year" ('YYYY').
+
+    Returns
+    -------
+    dict[str, list[int]]
+        Indices of the scenes in each window, keyed by window name, in chronological order.
+    """
+    groups: dict[str, list[int]] = {}
+    for idx, scene_date in enumerate(scene_dates):
+        if isinstance(scene_date, str):
+            scene_date = datetime.strptime(scene_date[:10], "%Y-%m-%d").date()
+        if period == "month":
+            key = f"{scene_date.year}-{scene_date.month:02d}"
+        elif period == "season":
+            year = scene_date.year + 1 if scene_date.month == 12 else scene_date.year
+            key = f"{year}-{SEASONS[scene_date.month]}"
+        elif period == "year":
+            key = f"{scene_date.year}"
+        else:
+            raise ValueError(f"Invalid period: {period}. Must be 'month', 'season' or 'year'")
+        groups.setdefault(key, []).append(idx)
+    return dict(sorted(groups.items()))
+
+
+def _composite_block(
+        scene_paths: list[str],
+        mask_paths: Optional[list[str]],
+        bands: list[int],
+        qa_band: Optional[Union[int, str]],
+        mask_bits: tuple[int, ...],
+        extra_flags: tuple[str, ...],
+        row: int,
+        n_rows: int
+) -> tuple[int, np.ndarray]:
+    """Reads one block of rows from every scene and returns its NaN-aware median (runs in a worker)."""
+    with rasterio.open(scene_paths[0]) as src:
+        width = src.width
+    stack = np.empty((len(scene_paths), len(bands), n_rows, width), dtype=np.float32)
+    window = Window(0, row, width, n_rows)
+
+    for k, path in enumerate(scene_paths):
+        with rasterio.open(path) as src:
+            scene = stack[k]
+            scene[...] = src.read(bands, window=window, out_dtype=np.float32)
+            if src.nodata is not None and not np.isnan(src.nodata):
+                scene[scene == src.nodata] = np.nan
+            if qa_band is not None:
+                qa = src.read(_band_index(src, qa_band), window=window)
+                valid = QA_valid_mask(qa, bits=mask_bits, extra_flags=extra_flags)
+                np.copyto(scene, np.nan, where=~valid)
+        if mask_paths is not None:
+            with rasterio.open(mask_paths[k]) as mask_src:
+                valid = mask_src.read(1, window=window).astype(bool)
+            np.copyto(scene, np.nan, where=~valid)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning) # All-NaN pixels stay NaN
+        median = np.nanmedian(stack, axis=0, overwrite_input=True)
+    return row, median.astype(np.float32, copy=False)
+
+
+def _block_rows(
+        n_scenes: int,
+        n_bands: int,
+        width: int,
+        workers: int,
+        max_memory_mb: float
+) -> int:
+    """Largest block height keeping all workers' stacks (plus the median's working copy) in budget."""
+    bytes_per_row = n_scenes * n_bands * width * np.dtype(np.float32).itemsize * 2
+    rows = int(max_memory_mb * 1024 ** 2 // (bytes_per_row * workers))
+    if rows < 1:
+        raise ValueError(
+            f"max_memory_mb={max_memory_mb} is too small for {n_scenes} scenes of width {width} "
+            f"on {workers} workers"
+        )
+    return rows
+
+
+def median_composite(
+        scene_paths: list[str],
+        out_path: str,
+        bands: Optional[list[int]] = None,
+        mask_paths: Optional[list[str]] = None,
+        qa_band: Optional[Union[int, str]] = None,
+        mask_bits: Iterable[int] = DEFAULT_MASK_BITS,
+        extra_flags: Iterable[str] = (),
+        max_memory_mb: float = 512,
+        workers: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None
+) -> str:
+    """
+    Writes the NaN-aware median composite of a list of co-registered scenes.
+
+    Masked pixels (from `mask_paths`, the QA band, or the rasters' nodata value) are set to NaN
+    before the per-pixel median, so each output pixel is the median of its valid observations only.
+    Pixels without any valid observation are NaN in the output.
+
+    Parameters
+    ----------
+    scene_paths : list[str]
+        Rasters of the same shape, CRS and transform, one per scene.
+    out_path : str
+        Path of the output GeoTIFF (float32, NaN nodata).
+    bands : list[int] | None
+        1-based band indices to composite. Defaults to all bands except `qa_band`.
+    mask_paths : list[str] | None
+        Optional single-band rasters, one per scene, with 1 for valid and 0 for masked pixels.
+    qa_band : int | str | None
+        QA_PIXEL band of the scenes (index or description). If given, the scenes are masked with
+        `QA_valid_mask(mask_bits, extra_flags)`.
+    mask_bits : Iterable[int]
+        QA bits masked when `qa_band` is given.
+    extra_flags : Iterable[str]
+        Additional QA flags masked when `qa_band` is given, see `local_masks.QA_FLAGS`.
+    max_memory_mb : float
+        Peak memory budget, in MB, of the block stacks across all workers.
+    workers : int | None
+        Number of worker processes (of `executor`, if given). Defaults to the number of CPUs.
+    executor : concurrent.futures.Executor | None
+        Existing process pool to run the blocks on, e.g. shared with other work.
+
+    Returns
+    -------
+    str
+        `out_path`.
+
+    Raises
+    ------
+    ValueError
+        If the scenes are not on the same grid, or the memory budget cannot fit a single row.
+    """
+    job = _prepare_composite(scene_paths, out_path, bands, mask_paths, qa_band, mask_bits, extra_flags)
+    own_executor = executor is None
+    workers = workers or os.cpu_count() or 1
+    if own_executor:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    try:
+        _run_composites([job], executor, workers, max_memory_mb)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+    return out_path
+
+
+def _prepare_composite(
+        scene_paths: list[str],
+        out_path: str,
+        bands: Optional[list[int]] = None,
+        mask_paths: Optional[list[str]] = None,
+        qa_band: Optional[Union[int, str]] = None,
+        mask_bits: Iterable[int] = DEFAULT_MASK_BITS,
+        extra_flags: Iterable[str] = ()
+) -> dict:
+    """Validates the scenes of a composite and returns its output profile and block arguments."""
+    if len(scene_paths) == 0:
+        raise ValueError("No scenes to composite")
+    if mask_paths is not None and len(mask_paths) != len(scene_paths):
+        raise ValueError("mask_paths must contain one mask per scene")
+
+    with rasterio.open(scene_paths[0]) as src:
+        profile = src.profile.copy()
+        qa_idx = _band_index(src, qa_band) if qa_band is not None else None
+        descriptions = src.descriptions
+    for path in scene_paths[1:]:
+        with rasterio.open(path) as src:
+            if (src.width, src.height, src.transform, src.crs) != (
+                    profile["width"], profile["height"], profile["transform"], profile["crs"]):
+                raise ValueError(f"{path} is not on the same grid as {scene_paths[0]}")
+
+    if bands is None:
+        bands = [b for b in range(1, profile["count"] + 1) if b != qa_idx]
+
+    # Striped (not tiled) output, so full-width row blocks can be written in any order
+    profile.update(count=len(bands), dtype="float32", nodata=np.nan, driver="GTiff",
+                   compress="deflate", predictor=3, tiled=False)
+    for key in ("blockxsize", "blockysize"):
+        profile.pop(key, None)
+    return {
+        "out_path": out_path,
+        "profile": profile,
+        "descriptions": [descriptions[band - 1] for band in bands],
+        "args": (scene_paths, mask_paths, bands, qa_band, tuple(mask_bits), tuple(extra_flags)),
+    }
+
+
+def _run_composites(
+        jobs: list[dict],
+        executor: concurrent.futures.Executor,
+        workers: int,
+        max_memory_mb: float
+) -> None:
+    """
+    Composites the blocks of several windows on one pool, with at most `workers` blocks in flight.
+
+    Blocks of the next window are submitted while the previous window's last blocks still run, so
+    small windows do not leave workers idle. Each block fits in `max_memory_mb / workers`, which keeps
+    all in-flight blocks within the budget. Outputs are opened with their first block and closed once
+    all their blocks are written.
+    """
+    outputs: dict[int, rasterio.io.DatasetWriter] = {}
+    remaining: dict[int, int] = {}
+    pending: dict[concurrent.futures.Future, int] = {}
+
+    def write(futures: Iterable[concurrent.futures.Future]) -> None:
+        for future in futures:
+            j = pending.pop(future)
+            row, block = future.result()
+            outputs[j].write(block, window=Window(0, row, block.shape[-1], block.shape[-2]))
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                outputs.pop(j).close()
+
+    try:
+        for j, job in enumerate(jobs):
+            scene_paths, _, bands = job["args"][:3]
+            height, width = job["profile"]["height"], job["profile"]["width"]
+            block_rows = _block_rows(len(scene_paths), len(bands), width, workers, max_memory_mb)
+            rows = range(0, height, block_rows)
+            remaining[j] = len(rows)
+
+            dst = rasterio.open(job["out_path"], "w", **job["profile"])
+            outputs[j] = dst
+            for i, description in enumerate(job["descriptions"], start=1):
+                if description:
+                    dst.set_band_description(i, description)
+
+            # Keep at most `workers` blocks in flight so finished blocks never pile up in memory
+            for row in rows:
+                n_rows = min(block_rows, height - row)
+                pending[executor.submit(_composite_block, *job["args"], row, n_rows)] = j
+                if len(pending) >= workers:
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    write(done)
+        write(concurrent.futures.as_completed(list(pending)))
+    finally:
+        for dst in outputs.values():
+            dst.close()
+
+
+def composite_periods(
+        scenes: dict[str, Union[str, date]],
+        out_dir: str,
+        period: Literal["month", "season", "year"] = "month",
+        workers: Optional[int] = None,
+        **kwargs
+) -> dict[str, str]:
+    """
+    Writes one median composite per compositing window, sharing one process pool.
+
+    The blocks of all windows are queued on the pool together, so windows are composited in
+    parallel and small windows do not leave workers idle.
+
+    Parameters
+    ----------
+    scenes : dict[str, str | date]
+        Scene raster paths mapped to their acquisition dates.
+    out_dir : str
+        Directory the composites are written to, as '{window}.tif'.
+    period : str
+        "month", "season" or "year", see `group_scenes`.
+    workers : int | None
+        Number of worker processes. Defaults to the number of CPUs.
+    **kwargs
+        `median_composite` options (`bands`, `mask_paths`, `qa_band`, `mask_bits`, `extra_flags`,
+        `max_memory_mb`).
+
+    Returns
+    -------
+    dict[str, str]
+        Path of the composite of each window.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = list(scenes)
+    groups = group_scenes(scenes.values(), period=period)
+    max_memory_mb = kwargs.pop("max_memory_mb", 512)
+    jobs = [
+        _prepare_composite([paths[i] for i in idx], os.path.join(out_dir, f"{window_name}.tif"), **kwargs)
+        for window_name, idx in groups.items()
+    ]
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        _run_composites(jobs, executor, workers, max_memory_mb) # All windows share the pool
+    return {window_name: job["out_path"] for window_name, job in zip(groups, jobs)}
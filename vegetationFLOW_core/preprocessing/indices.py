@@ -0,0 +1,465 @@
+"""
+Spectral Index Engine
+
+This module computes vegetation and moisture indices (NDVI, EVI, SAVI, NBR, NDMI) from the six-band
+Landsat 8 surface reflectance tiles produced by `LandsatDownloader` (SR_B2 .. SR_B7, scaled to
+reflectance), for single tiles, time stacks, tile GeoTIFF datasets and the tile datacube.
+
+All requested indices are computed in one pass over blocks of rows. Each block reuses a small set of
+preallocated scratch buffers (written with `out=`), and the NIR - red difference shared by NDVI, EVI
+and SAVI is computed once per block, so no full-size temporary is created per index. Masked pixels
+(NaN, the input nodata value or an explicit validity mask) and divisions by zero give nodata.
+Output can be float32, float16 or scaled int16.
+
+Functions:
+----------
+- compute_indices(image, indices, ...) -> np.ndarray
+    Computes indices of a (..., band, y, x) array with a one-off `SpectralIndexEngine`.
+
+Classes:
+--------
+- SpectralIndexEngine
+    Configured index computation over arrays, GeoTIFF tiles, datasets and datacubes.
+"""
+
+import os
+import glob
+import threading
+import concurrent.futures
+from itertools import repeat
+from typing import Iterable, Optional, Literal
+
+import numpy as np
+import rasterio
+
+LANDSAT_BANDS = ("SR_B2", "SR_B3", "SR_B4", "SR_B5", "SR_B6", "SR_B7") # Band order of the downloaded tiles
+BAND_ROLES = {"blue": "SR_B2", "green": "SR_B3", "red": "SR_B4", "nir": "SR_B5", "swir1": "SR_B6", "swir2": "SR_B7"}
+
+# Bands (by role) each index reads
+INDEX_BANDS = {
+    "NDVI": ("nir", "red"),
+    "EVI": ("nir", "red", "blue"),
+    "SAVI": ("nir", "red"),
+    "NBR": ("nir", "swir2"),
+    "NDMI": ("nir", "swir1"),
+}
+SAVI_L = 0.5 # Soil brightness correction of SAVI
+
+INT16_NODATA = -32768
+OUTPUT_LIMITS = {"float32": np.finfo(np.float32).max, "float16": np.finfo(np.float16).max, "int16": 32767}
+
+_scratch_local = threading.local() # Scratch buffers of the current thread, reused across blocks
+
+
+def _scratch(rows: int, width: int) -> dict[str, np.ndarray]:
+    """Returns this thread's scratch buffers for blocks of `rows` x `width` pixels."""
+    buffers = getattr(_scratch_local, "buffers", None)
+    if buffers is None or buffers["diff"].shape[1] != width or buffers["diff"].shape[0] < rows:
+        buffers = {
+            name: np.empty((rows, width), dtype=np.float32) for name in ("diff", "num", "den", "res")
+        }
+        buffers.update({name: np.empty((rows, width), dtype=bool) for name in ("invalid", "mask")})
+        _scratch_local.buffers = buffers
+    return {name: buffer[:rows] for name, buffer in buffers.items()} # The last block of a tile may be shorter
+
+
+class SpectralIndexEngine:
+    """
+    Computes a configurable set of spectral indices in one fused pass per block of rows.
+
+    Attributes:
+        indices (tuple[str, ...]): The indices computed, in output band order.
+        bands (tuple[str, ...]): Input band names, in input band order.
+        dtype (str): Output dtype: "float32", "float16" or "int16" (index values times `scale`).
+        scale (float): Scale of int16 output.
+        nodata (float | None): Input value of masked pixels (0 for Earth Engine downloads), None to only mask NaN.
+        block_rows (int): Rows per block; the scratch buffers hold one block.
+        workers (int | None): Threads (arrays) or processes (files, datacube) used. Defaults to the number of CPUs.
+
+    The thread pool of `compute` is created on first use and kept for the engine's lifetime, so its
+    threads keep their scratch buffers across calls. Call `close()` (or use the engine as a context
+    manager) to stop it.
+    """
+
+    def __init__(
+            self,
+            indices: Iterable[str] = ("NDVI",),
+            bands: Iterable[str] = LANDSAT_BANDS,
+            dtype: Literal["float32", "float16", "int16"] = "float32",
+            scale: float = 10000,
+            nodata: Optional[float] = 0.0,
+            block_rows: int = 64,
+            workers: Optional[int] = None
+    ) -> None:
+        """
+        Parameters
+        ----------
+        indices : Iterable[str]
+            Indices to compute, any of `INDEX_BANDS` ("NDVI", "EVI", "SAVI", "NBR", "NDMI").
+        bands : Iterable[str]
+            Input band names in input band order; must include the bands of `BAND_ROLES` the indices read.
+        dtype : str
+            "float32" and "float16" output NaN for nodata, "int16" outputs round(index * scale)
+            with `INT16_NODATA` for nodata.
+        scale : float
+            Scale of int16 output (10000 keeps 4 decimals).
+        nodata : float | None
+            Input value of masked pixels. A pixel is masked if all its bands equal it.
+        block_rows : int
+            Rows per block.
+        workers : int | None
+            Parallelism, see the class attributes.
+
+        Raises
+        ------
+        ValueError
+            If an index, the dtype or a band needed by the indices is unknown.
+        """
+        self.indices = tuple(indices)
+        self.bands = tuple(bands)
+        for index in self.indices:
+            if index not in INDEX_BANDS:
+                raise ValueError(f"Invalid index: {index}. Must be one of {list(INDEX_BANDS)}")
+        if dtype not in OUTPUT_LIMITS:
+            raise ValueError(f"Invalid dtype: {dtype}. Must be 'float32', 'float16' or 'int16'")
+        roles = sorted({role for index in self.indices for role in INDEX_BANDS[index]})
+        missing = [BAND_ROLES[role] for role in roles if BAND_ROLES[role] not in self.bands]
+        if missing:
+            raise ValueError(f"Bands {missing} are needed by {list(self.indices)} but not in {list(self.bands)}")
+
+        self.dtype = dtype
+        self.scale = scale
+        self.nodata = nodata
+        self.block_rows = block_rows
+        self.workers = workers
+        self._band_idx = {role: self.bands.index(BAND_ROLES[role]) for role in roles}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        self._executor_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Engines are sent to worker processes; the thread pool and its lock stay in this one
+        state = self.__dict__.copy()
+        state.update(_executor=None, _executor_workers=0, _executor_lock=None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+
+    def _threadPool(self, workers: int) -> concurrent.futures.ThreadPoolExecutor:
+        """Returns the engine's thread pool, creating it (or resizing it for another `workers`) if needed."""
+        with self._executor_lock:
+            if self._executor is None or self._executor_workers != workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="indices")
+                self._executor_workers = workers
+            return self._executor
+
+    def close(self) -> None:
+        """Stops the thread pool of `compute`."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def __enter__(self) -> "SpectralIndexEngine":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def output_nodata(self) -> float:
+        """Nodata value of the output."""
+        return INT16_NODATA if self.dtype == "int16" else np.nan
+
+    def compute(
+            self,
+            image: np.ndarray,
+            valid: Optional[np.ndarray] = None,
+            out: Optional[np.ndarray] = None,
+            workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Computes the indices of a tile or a stack of tiles.
+
+        Blocks of rows (of every tile in the stack) are spread over the engine's thread pool; numpy
+        releases the GIL inside the ufuncs, so the blocks run on all cores without copying the input.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            Reflectance array of shape (..., band, y, x), e.g. (band, y, x) for a tile or
+            (time, band, y, x) for a time stack.
+        valid : np.ndarray | None
+            Optional boolean mask, broadcastable to (..., y, x), False where pixels are masked.
+        out : np.ndarray | None
+            C-contiguous output array of shape (..., index, y, x) and the engine's dtype.
+        workers : int | None
+            Threads to use, 1 to run in the calling thread. Defaults to `self.workers`, then the number of CPUs.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (..., index, y, x).
+        """
+        image = np.asarray(image)
+        if image.ndim < 3 or image.shape[-3] != len(self.bands):
+            raise ValueError(f"Expected an array of shape (..., {len(self.bands)}, y, x), got {image.shape}")
+        lead, (height, width) = image.shape[:-3], image.shape[-2:]
+        out_shape = (*lead, len(self.indices), height, width)
+        if out is None:
+            out = np.empty(out_shape, dtype=self.dtype)
+        elif out.shape != out_shape or out.dtype != np.dtype(self.dtype) or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous {self.dtype} array of shape {out_shape}")
+
+        src = image.reshape(-1, len(self.bands), height, width)
+        dst = out.reshape(-1, len(self.indices), height, width)
+        mask = None if valid is None else np.broadcast_to(np.asarray(valid, dtype=bool), (*lead, height, width)).reshape(-1, height, width)
+
+        blocks = [(n, row) for n in range(src.shape[0]) for row in range(0, height, self.block_rows)]
+
+        def run(block):
+            n, row = block
+            rows = slice(row, min(row + self.block_rows, height))
+            self._computeBlock(src[n, :, rows], None if mask is None else mask[n, rows], dst[n, :, rows])
+
+        workers = workers or self.workers or os.cpu_count() or 1
+        if workers == 1 or len(blocks) == 1:
+            for block in blocks:
+                run(block)
+        else:
+            list(self._threadPool(workers).map(run, blocks))
+        return out
+
+    def _computeBlock(self, src: np.ndarray, valid: Optional[np.ndarray], dst: np.ndarray) -> None:
+        """Computes every index of one block (band, rows, x) into `dst` (index, rows, x)."""
+        s = _scratch(*src.shape[-2:])
+        diff, num, den, invalid, mask = s["diff"], s["num"], s["den"], s["invalid"], s["mask"]
+        band = {role: src[i] for role, i in self._band_idx.items()}
+
+        # Masked pixels: all bands at the nodata value, or masked by `valid`
+        invalid.fill(self.nodata is not None)
+        if self.nodata is not None:
+            for values in src:
+                np.equal(values, self.nodata, out=mask)
+                invalid &= mask
+        if valid is not None:
+            np.logical_not(valid, out=mask)
+            invalid |= mask
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            if any(index in ("NDVI", "EVI", "SAVI") for index in self.indices):
+                np.subtract(band["nir"], band["red"], out=diff) # Shared numerator
+            for k, index in enumerate(self.indices):
+                res = dst[k] if dst.dtype == np.float32 else s["res"] # float32 output is written in place
+                if index == "NDVI":
+                    np.add(band["nir"], band["red"], out=den)
+                    np.divide(diff, den, out=res)
+                elif index == "SAVI":
+                    np.add(band["nir"], band["red"], out=den)
+                    den += SAVI_L
+                    np.divide(diff, den, out=res)
+                    res *= 1 + SAVI_L
+                elif index == "EVI":
+                    np.multiply(band["red"], 6.0, out=den)
+                    den += band["nir"]
+                    np.multiply(band["blue"], 7.5, out=num)
+                    den -= num
+                    den += 1.0
+                    np.divide(diff, den, out=res)
+                    res *= 2.5
+                else: # Normalized differences of NIR and a SWIR band
+                    swir = band["swir2"] if index == "NBR" else band["swir1"]
+                    np.subtract(band["nir"], swir, out=num)
+                    np.add(band["nir"], swir, out=den)
+                    np.divide(num, den, out=res)
+                self._store(res, invalid, mask, dst[k])
+
+    def _store(self, res: np.ndarray, invalid: np.ndarray, mask: np.ndarray, dst: np.ndarray) -> None:
+        """Masks one index block and converts it into the output dtype."""
+        np.isfinite(res, out=mask)
+        np.logical_not(mask, out=mask)
+        mask |= invalid # Nodata: masked input, NaN input or division by zero
+        if self.dtype == "int16":
+            res *= self.scale
+        limit = OUTPUT_LIMITS[self.dtype]
+        np.clip(res, -limit, limit, out=res) # Near-zero EVI denominators must not overflow the output
+        if self.dtype == "int16":
+            np.rint(res, out=res)
+            np.copyto(res, 0, where=mask) # Casting NaN to int16 is undefined
+        if res is not dst:
+            np.copyto(dst, res, casting="unsafe")
+        np.copyto(dst, self.output_nodata, where=mask)
+
+    def computeTile(self, src_path: str, dst_path: str) -> str:
+        """
+        Computes the indices of a tile GeoTIFF into a new GeoTIFF with one band per index.
+
+        Input bands are matched by their descriptions when the tile has them (as Earth Engine
+        downloads do), by position in `bands` otherwise. GeoTIFFs cannot hold float16, so use
+        "float32" or "int16" output here.
+
+        Parameters
+        ----------
+        src_path : str
+            Path of the reflectance tile.
+        dst_path : str
+            Path of the index GeoTIFF (deflate compressed, written atomically).
+
+        Returns
+        -------
+        str
+            `dst_path`.
+        """
+        if self.dtype == "float16":
+            raise ValueError("GeoTIFF output requires dtype 'float32' or 'int16'")
+        with rasterio.open(src_path) as src:
+            profile = src.profile.copy()
+            descriptions = src.descriptions
+            if all(band in descriptions for band in self.bands):
+                image = src.read([descriptions.index(band) + 1 for band in self.bands])
+            else:
+                image = src.read(list(range(1, len(self.bands) + 1)))
+
+        indices = self.compute(image, workers=1)
+        profile.update(
+            driver="GTiff", count=len(self.indices), dtype=self.dtype, nodata=self.output_nodata,
+            compress="deflate", predictor=2 if self.dtype == "int16" else 3
+        )
+        os.makedirs(os.path.dirname(dst_path) or ".", exist_ok=True)
+        tmp_path = f"{dst_path}.part"
+        with rasterio.open(tmp_path, "w", **profile) as dst:
+            dst.write(indices)
+            for i, index in enumerate(self.indices, start=1):
+                dst.set_band_description(i, index)
+            if self.dtype == "int16":
+                dst.scales = [1 / self.scale] * len(self.indices)
+        os.replace(tmp_path, dst_path)
+        return dst_path
+
+    def computeDataset(
+            self,
+            dataset_dir: str,
+            out_dir: Optional[str] = None,
+            months: Optional[Iterable[str]] = None,
+            workers: Optional[int] = None
+    ) -> list[str]:
+        """
+        Computes the indices of every tile-month GeoTIFF of a dataset across a process pool.
+
+        Parameters
+        ----------
+        dataset_dir : str
+            The dataset directory (`tile_*/YYYY-MM.tif`).
+        out_dir : str | None
+            Output root, laid out like the dataset (`{tile}/{YYYY-MM}.tif`). Defaults to `dataset_dir/indices`.
+        months : Iterable[str] | None
+            Only these months ('YYYY-MM'). None computes all.
+        workers : int | None
+            Worker processes. Defaults to `self.workers`, then the number of CPUs.
+
+        Returns
+        -------
+        list[str]
+            The index GeoTIFFs written.
+        """
+        out_dir = out_dir or os.path.join(dataset_dir, "indices")
+        months = None if months is None else set(months)
+        src_paths = [
+            path for path in sorted(glob.glob(os.path.join(dataset_dir, "tile_*", "*.tif")))
+            if months is None or os.path.splitext(os.path.basename(path))[0] in months
+        ]
+        dst_paths = [os.path.join(out_dir, os.path.relpath(path, dataset_dir)) for path in src_paths]
+
+        workers = workers or self.workers or os.cpu_count() or 1
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.computeTile, src_paths, dst_paths, chunksize=16))
+
+    def computeDatacube(
+            self,
+            src_path: str,
+            dst_path: Optional[str] = None,
+            workers: Optional[int] = None
+    ) -> str:
+        """
+        Computes the indices of a tile datacube into a datacube with one band per index.
+
+        Tiles are spread over a process pool. The output has one chunk per tile-month, so workers never
+        write the same chunk. The datacube stores float32, so int16 and float16 output are written as
+        float32 index values.
+
+        Parameters
+        ----------
+        src_path : str
+            Path of the reflectance datacube (see `TileDatacube`).
+        dst_path : str | None
+            Path of the index datacube. Defaults to `indices.zarr` next to `src_path`.
+        workers : int | None
+            Worker processes. Defaults to `self.workers`, then the number of CPUs.
+
+        Returns
+        -------
+        str
+            `dst_path`.
+        """
+        from vegetationFLOW_core.datasets.datacube import TileDatacube # Optional dependency
+
+        dst_path = dst_path or os.path.join(os.path.dirname(os.path.abspath(src_path)), "indices.zarr")
+        src = TileDatacube(src_path)
+        dst = TileDatacube.create(
+            dst_path, tiles=src.tiles, months=src.months, bands=list(self.indices),
+            img_size=src.data.shape[-1], chunks="spatial", crs=src.crs
+        )
+        dst.transform[:] = src.transform[:] # One chunk for all tiles, so it is written here, not by the workers
+
+        engine = SpectralIndexEngine(self.indices, self.bands, "float32", nodata=self.nodata, block_rows=self.block_rows)
+        workers = workers or self.workers or os.cpu_count() or 1
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_datacube_tile, repeat(engine), repeat(src_path), repeat(dst_path), src.tiles))
+        return dst_path
+
+
+def _datacube_tile(engine: SpectralIndexEngine, src_path: str, dst_path: str, tile: str) -> None:
+    """Computes the indices of every month of one datacube tile (runs in a worker)."""
+    from vegetationFLOW_core.datasets.datacube import TileDatacube
+
+    src = TileDatacube(src_path)
+    dst = TileDatacube(dst_path, mode="r+")
+    step = src.data.chunks[1] # Read whole time chunks, so each source chunk is decoded once
+    for k in range(0, len(src.months), step):
+        months = list(src.months[k:k + step])
+        indices = engine.compute(src.read(tile, months, list(engine.bands))[0], workers=1)
+        for month, image in zip(months, indices):
+            dst.write(tile, month, image)
+
+
+def compute_indices(
+        image: np.ndarray,
+        indices: Iterable[str] = ("NDVI",),
+        valid: Optional[np.ndarray] = None,
+        **kwargs
+) -> np.ndarray:
+    """
+    Computes spectral indices of a (..., band, y, x) reflectance array.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Reflectance of a tile (band, y, x) or a time stack (time, band, y, x), bands in `LANDSAT_BANDS` order.
+    indices : Iterable[str]
+        Indices to compute, see `INDEX_BANDS`.
+    valid : np.ndarray | None
+        Optional boolean mask broadcastable to (..., y, x), False where pixels are masked.
+    **kwargs
+        Passed to `SpectralIndexEngine` (e.g. `dtype`, `bands`, `workers`).
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (..., index, y, x).
+    """
+    with SpectralIndexEngine(indices, **kwargs) as engine:
+        return engine.compute(image, valid=valid)
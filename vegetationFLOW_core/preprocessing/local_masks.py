@@ -0,0 +1,218 @@
+"""
+Local QA Masking Utilities
+
+This module contains NumPy/rasterio counterparts of the Earth Engine masks in
+`cloud_masks` and `water_masks`. They decode the Landsat Collection 2 `QA_PIXEL`
+bit flags of local rasters, so downloaded scenes can be re-masked offline with
+different rules instead of requesting a new export from Earth Engine.
+
+Functions:
+----------
+- QA_bitmask(bits: Iterable[int]) -> int
+    Combines QA bit positions into a single integer mask.
+
+- QA_valid_mask(qa: np.ndarray, bits, extra_flags) -> np.ndarray
+    Vectorized boolean mask of pixels with none of the selected QA bits set.
+
+- QA_mask_raster(path: str, qa_band, bits, extra_flags, block_rows) -> PackedMask
+    Decodes the QA band of a raster block by block into a bit-packed boolean mask.
+
+- apply_mask(image: np.ndarray, mask: np.ndarray, fill) -> np.ndarray
+    Sets masked pixels of a (bands, rows, cols) array to a fill value.
+"""
+
+from typing import Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+# Bits masked by QA_cloud_mask (3: cloud, 11: high bit of the cloud shadow confidence, i.e. medium or
+# high confidence) and QA_water_mask (7: water)
+DEFAULT_MASK_BITS = (3, 7, 11)
+
+# Additional QA_PIXEL flags that can be masked by name
+QA_FLAGS = {
+    "fill": 0,
+    "dilated_cloud": 1,
+    "cirrus": 2,
+    "cloud": 3,
+    "cloud_shadow": 4,
+    "snow": 5,
+    "water": 7,
+    "cloud_shadow_confidence": 11, # Medium or high cloud shadow confidence (bits 10-11)
+}
+
+
+class PackedMask(NamedTuple):
+    """
+    A boolean raster mask packed 8 pixels per byte along each row.
+
+    Attributes
+    ----------
+    bits : np.ndarray
+        uint8 array of shape (rows, ceil(cols / 8)) from `np.packbits(..., axis=-1)`.
+    shape : tuple[int, int]
+        (rows, cols) of the unpacked mask.
+    """
+    bits: np.ndarray
+    shape: tuple[int, int]
+
+    def unpack(self) -> np.ndarray:
+        """Returns the mask as a (rows, cols) boolean array, True where the pixel is valid."""
+        return np.unpackbits(self.bits, axis=-1, count=self.shape[1]).astype(bool)
+
+
+def QA_bitmask(bits: Iterable[int]) -> int:
+    """
+    Combines QA bit positions into a single integer mask.
+
+    Parameters
+    ----------
+    bits : Iterable[int]
+        Bit positions, e.g. (3, 7, 11).
+
+    Returns
+    -------
+    int
+        The OR of `1 << bit` over all bits.
+    """
+    mask = 0
+    for bit in bits:
+        mask |= 1 << bit
+    return mask
+
+
+def _resolve_bits(bits: Iterable[int], extra_flags: Iterable[str]) -> int:
+    extra_flags = list(extra_flags)
+    unknown = [flag for flag in extra_flags if flag not in QA_FLAGS]
+    if unknown:
+        raise ValueError(f"Unknown QA flags: {unknown}. Must be one of {list(QA_FLAGS)}")
+    return QA_bitmask(list(bits) + [QA_FLAGS[flag] for flag in extra_flags])
+
+
+def QA_valid_mask(
+        qa: np.ndarray,
+        bits: Iterable[int] = DEFAULT_MASK_BITS,
+        extra_flags: Iterable[str] = (),
+        out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Computes a boolean mask of pixels that have none of the selected QA bits set.
+
+    This is the local equivalent of applying `QA_cloud_mask` and `QA_water_mask`:
+    by default, pixels flagged as cloud (bit 3), water (bit 7) or with a medium or high
+    cloud shadow confidence (bit 11) are masked out. The cloud shadow flag itself (bit 4)
+    can be added with `extra_flags=("cloud_shadow",)`. All bits are tested in a single vectorized pass.
+
+    Parameters
+    ----------
+    qa : np.ndarray
+        Integer array of QA_PIXEL values, any shape.
+    bits : Iterable[int]
+        QA bit positions to mask out.
+    extra_flags : Iterable[str]
+        Additional flags to mask out by name, see `QA_FLAGS` (e.g. "dilated_cloud", "cirrus").
+    out : np.ndarray | None
+        Optional boolean array to write the result to.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean array of the same shape as `qa`, True where the pixel is valid.
+
+    Example
+    -------
+    >>> valid = QA_valid_mask(qa, extra_flags=("dilated_cloud", "cirrus"))
+    """
+    mask = _resolve_bits(bits, extra_flags)
+    qa = np.asarray(qa)
+    if not np.issubdtype(qa.dtype, np.integer):
+        qa = qa.astype(np.uint16) # QA bands exported as float
+    return np.equal(np.bitwise_and(qa, mask), 0, out=out)
+
+
+def _band_index(src: rasterio.io.DatasetReader, band: Union[int, str]) -> int:
+    """Returns the 1-based index of a band given by index or by description (e.g. 'QA_PIXEL')."""
+    if isinstance(band, int):
+        return band
+    if band in src.descriptions:
+        return src.descriptions.index(band) + 1
+    raise ValueError(f"Band '{band}' not found in {src.name}, available: {src.descriptions}")
+
+
+def QA_mask_raster(
+        path: str,
+        qa_band: Union[int, str] = "QA_PIXEL",
+        bits: Iterable[int] = DEFAULT_MASK_BITS,
+        extra_flags: Iterable[str] = (),
+        block_rows: int = 512
+) -> PackedMask:
+    """
+    Decodes the QA band of a local raster into a packed boolean validity mask.
+
+    The raster is read in windows of `block_rows` full-width rows, so memory use is bounded
+    by the block size rather than the raster size. Each block is packed to 1 bit per pixel
+    as soon as it is decoded.
+
+    Parameters
+    ----------
+    path : str
+        Path to a raster containing a QA_PIXEL band (e.g. a downloaded scene).
+    qa_band : int | str
+        1-based band index, or band description, of the QA band.
+    bits : Iterable[int]
+        QA bit positions to mask out.
+    extra_flags : Iterable[str]
+        Additional flags to mask out by name, see `QA_FLAGS`.
+    block_rows : int
+        Number of rows decoded per block.
+
+    Returns
+    -------
+    PackedMask
+        The packed mask, True (1) where the pixel is valid.
+
+    Example
+    -------
+    >>> packed = QA_mask_raster("scene.tif", extra_flags=("cirrus",))
+    >>> valid = packed.unpack()
+    """
+    with rasterio.open(path) as src:
+        band = _band_index(src, qa_band)
+        packed = np.empty((src.height, (src.width + 7) // 8), dtype=np.uint8)
+        valid = np.empty((block_rows, src.width), dtype=bool)
+        for row in range(0, src.height, block_rows):
+            n_rows = min(block_rows, src.height - row)
+            qa = src.read(band, window=Window(0, row, src.width, n_rows))
+            QA_valid_mask(qa, bits=bits, extra_flags=extra_flags, out=valid[:n_rows])
+            packed[row:row + n_rows] = np.packbits(valid[:n_rows], axis=-1)
+        return PackedMask(bits=packed, shape=(src.height, src.width))
+
+
+def apply_mask(
+        image: np.ndarray,
+        mask: Union[np.ndarray, PackedMask],
+        fill: float = np.nan
+) -> np.ndarray:
+    """
+    Sets the masked pixels of an image to a fill value, in place.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Array of shape (bands, rows, cols) or (rows, cols). Must be a float array to use NaN.
+    mask : np.ndarray | PackedMask
+        Boolean (rows, cols) mask, True where the pixel is valid.
+    fill : float
+        Value written to masked pixels.
+
+    Returns
+    -------
+    np.ndarray
+        The same `image` array.
+    """
+    if isinstance(mask, PackedMask):
+        mask = mask.unpack()
+    np.copyto(image, fill, where=~mask)
+    return image
@@ -1,3 +1,16 @@
-from .grid import patch_roi, create_grid
-from .checks import checkDateRange
-from .logger import Log
\ No newline at end of file
+from .lazy import lazy_module
+
+# Attributes are imported from their submodule on first access, see `lazy_module`
+__getattr__, __dir__, __all__ = lazy_module(
+    __name__,
+    {
+        "patch_roi": ".grid",
+        "create_grid": ".grid",
+        "lattice_tile_key": ".grid",
+        "checkDateRange": ".checks",
+        "Log": ".logger",
+        "HTTPDownloader": ".http_client",
+        "FetchResult": ".http_client",
+        "DownloadMetrics": ".metrics",
+    }
+)
@@ -1,6 +1,7 @@
 import geopandas as gpd
-from shapely.geometry import box
+import shapely
 import numpy as np
+import pandas as pd
 from typing import Union, Optional
 import math
 from pyproj import CRS
@@ -17,6 +18,10 @@ def create_grid(
     Each cell in the grid will be a square polygon with a size defined 
     by cell_size * resolution_m (in coordinate units).
 
+    Cells are snapped to a global lattice anchored at the CRS origin, so every cell carries stable 
+    integer `col` and `row` indices (cell minx = col * size, miny = row * size) that do not depend 
+    on the bounds requested. The polygons are built in one vectorized `shapely.box` call.
+
     Args:
         bounds (Union[np.ndarray, list[float]]): 
             A 1D array or list containing [minx, miny, maxx, maxy] coordinates.
@@ -30,31 +35,112 @@ def create_grid(
             object or anything accepted by GeoDataFrame.
 
     Returns:
-        gpd.GeoDataFrame: A GeoDataFrame containing the grid polygons with the specified CRS.
+        gpd.GeoDataFrame: A GeoDataFrame containing the grid polygons with the specified CRS, 
+            and their integer `col` and `row` lattice indices.
     """
     minx, miny, maxx, maxy = bounds
     width = cell_size * resolution_m
     height = cell_size * resolution_m
 
-    # Snap bounds to the grid
-    minx = math.floor(minx / width) * width
-    miny = math.floor(miny / height) * height
-    maxx = math.ceil(maxx / width) * width
-    maxy = math.ceil(maxy / height) * height
+    # Snap bounds to the grid (as lattice indices)
+    cols = np.arange(math.floor(minx / width), math.ceil(maxx / width), dtype=np.int64)
+    rows = np.arange(math.floor(miny / height), math.ceil(maxy / height), dtype=np.int64)
 
-    cols = np.arange(minx, maxx, width)
-    rows = np.arange(miny, maxy, height)
+    # Column-major order (x outer, y inner)
+    col_idx, row_idx = np.meshgrid(cols, rows, indexing="ij")
+    col_idx = col_idx.ravel()
+    row_idx = row_idx.ravel()
+    x0 = col_idx * width
+    y0 = row_idx * height
 
-    grid_cells = [box(x, y, x + width, y + height) for x in cols for y in rows]
+    grid_cells = shapely.box(x0, y0, x0 + width, y0 + height)
 
-    grid = gpd.GeoDataFrame({'geometry': grid_cells}, crs=crs)
+    grid = gpd.GeoDataFrame({'col': col_idx, 'row': row_idx}, geometry=grid_cells, crs=crs)
     return grid
 
 
+def lattice_tile_key(col: int, row: int, tile_size_px: int, res_m: int) -> str:
+    """
+    Returns the global key of a tile of the EPSG:3857 lattice, e.g. "tile_30m_256px_1530_-4372".
+
+    The key only depends on the tile's position and size on the lattice, so the same ground tile
+    has the same key in every dataset, whatever ROI it was gridded from.
+
+    Args:
+        col (int): Lattice column (tile minx = col * tile size in meters).
+        row (int): Lattice row (tile miny = row * tile size in meters).
+        tile_size_px (int): Tile size in pixels.
+        res_m (int): Resolution in meters per pixel.
+
+    Returns:
+        str: The tile key, also used as the tile's folder name.
+    """
+    return f"tile_{res_m}m_{tile_size_px}px_{col}_{row}"
+
+
+QUADTREE_SPLIT_BELOW = 0.5 # Tiles less than half inside the ROI are subdivided in quadtree mode
+MIN_QUADTREE_TILE_PX = 32
+
+
+def roi_coverage(tiles: np.ndarray, roi_geom: shapely.Geometry) -> np.ndarray:
+    """
+    Computes the fraction of each tile's area that lies inside the ROI.
+
+    Tiles fully inside the ROI are detected with a (prepared) containment test, so the 
+    polygon intersection is only computed for the edge tiles.
+
+    Args:
+        tiles (np.ndarray): Array of tile polygons.
+        roi_geom (shapely.Geometry): The ROI as a single (ideally prepared) geometry, in the tiles' CRS.
+
+    Returns:
+        np.ndarray: Coverage fraction (0 - 1) of every tile.
+    """
+    coverage = np.ones(len(tiles), dtype=np.float64)
+    edge = ~shapely.contains_properly(roi_geom, tiles)
+    if edge.any():
+        edge_tiles = tiles[edge]
+        coverage[edge] = shapely.area(shapely.intersection(edge_tiles, roi_geom)) / shapely.area(edge_tiles)
+    return coverage
+
+
+def split_quadrants(tiles: gpd.GeoDataFrame, res_m: int) -> gpd.GeoDataFrame:
+    """
+    Splits every tile into its four quadrants on the next (half-size) level of the lattice.
+
+    Args:
+        tiles (gpd.GeoDataFrame): Tiles with `col`, `row`, `tile_size_px` and `level` columns.
+        res_m (int): Resolution in meters per pixel.
+
+    Returns:
+        gpd.GeoDataFrame: The child tiles, four per input tile, with lattice indices in their own tile size.
+    """
+    n = len(tiles)
+    child_size_px = np.repeat(tiles["tile_size_px"].to_numpy() // 2, 4)
+    col_idx = np.repeat(tiles["col"].to_numpy() * 2, 4) + np.tile([0, 1, 0, 1], n)
+    row_idx = np.repeat(tiles["row"].to_numpy() * 2, 4) + np.tile([0, 0, 1, 1], n)
+    size_m = child_size_px * res_m
+    x0 = col_idx * size_m
+    y0 = row_idx * size_m
+
+    return gpd.GeoDataFrame(
+        {
+            'col': col_idx,
+            'row': row_idx,
+            'tile_size_px': child_size_px,
+            'level': np.repeat(tiles["level"].to_numpy() + 1, 4),
+        },
+        geometry=shapely.box(x0, y0, x0 + size_m, y0 + size_m),
+        crs=tiles.crs
+    )
+
+
 def patch_roi(
     roi: gpd.GeoDataFrame, 
     tile_size_px: int, 
-    res_m: int
+    res_m: int,
+    min_coverage: float = 0.0,
+    quadtree_levels: int = 0
 ) -> gpd.GeoDataFrame:
     """
     Divides a given Region of Interest (ROI) into spatial tiles (patches) based on 
@@ -63,7 +149,13 @@ def patch_roi(
     This function:
     1. Reprojects the ROI to EPSG:3857 (meters) for accurate tiling.
     2. Creates a regular grid covering the entire extent of the ROI.
-    3. Clips the grid using a spatial join to include only the intersecting tiles.
+    3. Keeps the tiles intersecting any ROI feature, using an STRtree over the grid queried with 
+       the prepared ROI geometries. Each tile is returned once, even if several ROI features overlap it.
+    4. Computes the fraction of each tile covered by the ROI and drops tiles below `min_coverage`.
+
+    In quadtree mode, tiles less than half covered by the ROI are recursively split into quadrants 
+    (up to `quadtree_levels` times), keeping only the quadrants that overlap the ROI. Edge areas are 
+    then fetched with smaller, fuller tiles instead of mostly empty full-size ones.
 
     Args:
         roi (gpd.GeoDataFrame): 
@@ -72,9 +164,16 @@ def patch_roi(
             Number of pixels per tile side (e.g., 256). Combined with `res_m`, defines patch size in meters.
         res_m (int): 
             Resolution in meters per pixel. E.g., res_m = 10 means each pixel represents 10 meters on ground.
+        min_coverage (float):
+            Minimum fraction (0 - 1) of a tile that must lie inside the ROI for it to be kept. 
+            The default (0.0) keeps every intersecting tile.
+        quadtree_levels (int):
+            Maximum number of times a partially covered tile is subdivided. 0 (default) disables quadtree mode.
 
     Returns:
-        gpd.GeoDataFrame: A GeoDataFrame containing the grid patches that intersect the ROI.
+        gpd.GeoDataFrame: A GeoDataFrame containing the unique grid patches that intersect the ROI, 
+            with their `col` and `row` lattice indices, `tile_size_px`, quadtree `level`, ROI `coverage` 
+            and global `tile_key` (see `lattice_tile_key`).
     """
     roi = roi.to_crs(epsg=3857) # Reprojecting to EPSG:3857 (meters) for accurate tiling
     grid = create_grid(
@@ -83,7 +182,43 @@ def patch_roi(
         resolution_m=res_m,
         crs=roi.crs
     )
-    # Clipping grid to ROI using spatial join
-    clipped_tiles = gpd.sjoin(grid, roi, how='inner', predicate='intersects')
-    clipped_tiles = clipped_tiles.reset_index(drop=True)
-    return clipped_tiles
\ No newline at end of file
+    # Clipping grid to ROI using an STRtree over the grid cells
+    roi_geoms = np.asarray(roi.geometry.values)
+    shapely.prepare(roi_geoms)
+    tree = shapely.STRtree(np.asarray(grid.geometry.values))
+    _, tile_idx = tree.query(roi_geoms, predicate='intersects')
+    tile_idx = np.unique(tile_idx) # Deduplicates tiles hit by overlapping features, keeps grid order
+
+    clipped_tiles = grid.iloc[tile_idx].reset_index(drop=True)
+    clipped_tiles["tile_size_px"] = tile_size_px
+    clipped_tiles["level"] = 0
+
+    # Coverage of each tile by the ROI
+    roi_union = shapely.union_all(roi_geoms)
+    shapely.prepare(roi_union)
+    clipped_tiles["coverage"] = roi_coverage(np.asarray(clipped_tiles.geometry.values), roi_union)
+
+    if quadtree_levels > 0:
+        leaves = []
+        tiles = clipped_tiles
+        for _ in range(quadtree_levels):
+            split = (
+                (tiles["coverage"] < QUADTREE_SPLIT_BELOW) 
+                & (tiles["tile_size_px"] % 2 == 0) 
+                & (tiles["tile_size_px"] // 2 >= MIN_QUADTREE_TILE_PX)
+            ).to_numpy()
+            leaves.append(tiles[~split])
+            tiles = split_quadrants(tiles[split], res_m)
+            tiles["coverage"] = roi_coverage(np.asarray(tiles.geometry.values), roi_union)
+            tiles = tiles[tiles["coverage"] > 0] # Quadrants outside the ROI
+            if len(tiles) == 0:
+                break
+        leaves.append(tiles)
+        clipped_tiles = pd.concat(leaves, ignore_index=True)
+
+    clipped_tiles = clipped_tiles[clipped_tiles["coverage"] >= min_coverage].reset_index(drop=True)
+    clipped_tiles["tile_key"] = [
+        lattice_tile_key(col, row, size, res_m)
+        for col, row, size in zip(clipped_tiles["col"], clipped_tiles["row"], clipped_tiles["tile_size_px"])
+    ]
+    return clipped_tiles
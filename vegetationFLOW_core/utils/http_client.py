@@ -0,0 +1,200 @@
+"""
+HTTP Download Utilities
+
+This module contains a pooled, streaming HTTP client used to fetch GeoTIFFs
+from Earth Engine download URLs.
+
+Classes:
+--------
+- FetchResult
+    Byte and latency accounting for a single request.
+- HTTPDownloader
+    Thread-safe downloader sharing one keep-alive `requests.Session` between worker threads.
+"""
+
+import os
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a single download request.
+
+    Attributes:
+        url (str): The requested URL.
+        filepath (str): The local path the response body was written to.
+        status_code (int): HTTP status code of the response.
+        num_bytes (int): Number of bytes written to disk (0 if the request failed).
+        sha256 (str | None): SHA-256 hex digest of the written file (None if the request failed).
+        latency_s (float): Seconds until the response headers were received.
+        duration_s (float): Total seconds including streaming the body to disk.
+    """
+    url: str
+    filepath: str
+    status_code: int
+    num_bytes: int
+    sha256: Optional[str]
+    latency_s: float
+    duration_s: float
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+class HTTPDownloader:
+    """
+    A pooled HTTP client that streams responses to disk in chunks.
+
+    A single `requests.Session` is shared by all worker threads. Its connection pool is sized to
+    the number of workers so connections are kept alive and reused instead of paying TCP/TLS
+    setup on every tile, and response bodies are streamed to disk rather than held in memory.
+
+    Attributes:
+        session (requests.Session): The shared session.
+        timeout (tuple[float, float]): (connect, read) timeouts in seconds.
+        chunk_size (int): Number of bytes read from the socket per write.
+    """
+
+    def __init__(
+            self,
+            pool_size: int = 4,
+            connect_timeout: float = 10.0,
+            read_timeout: float = 120.0,
+            chunk_size: int = 1 << 20,
+            max_retries: int = 3,
+            backoff_factor: float = 1.0
+    ) -> None:
+        """
+        Initializes the session and its connection pool.
+
+        Args:
+            pool_size (int): Maximum number of pooled connections, usually the number of worker threads.
+            connect_timeout (float): Seconds to wait for a connection to be established.
+            read_timeout (float): Seconds to wait between bytes from the server.
+            chunk_size (int): Size in bytes of the chunks streamed to disk.
+            max_retries (int): Retries on connection errors, 429 and 5xx responses.
+            backoff_factor (float): Exponential backoff factor between retries (honours Retry-After).
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.chunk_size = chunk_size
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=True, # Threads wait for a free connection rather than opening extra ones
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._failed = 0
+        self._bytes = 0
+        self._latency_s = 0.0
+        self._duration_s = 0.0
+
+    def fetch(self, url: str, filepath: str) -> FetchResult:
+        """
+        Downloads a URL and streams the response body to a file.
+
+        The body is written to a temporary `.part` file next to `filepath` and atomically renamed 
+        once complete, so `filepath` is either absent or a complete file. The file is only created 
+        for successful (HTTP 200) responses, and the partial file is removed if the transfer fails.
+
+        Args:
+            url (str): The URL to download.
+            filepath (str): Local path to write the response body to.
+
+        Returns:
+            FetchResult: Status, byte count and timings of the request.
+
+        Raises:
+            requests.RequestException: If the request fails or times out after all retries.
+        """
+        start = time.perf_counter()
+        tmp_path = f"{filepath}.part"
+        num_bytes = 0
+        checksum = None
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as r:
+                latency = time.perf_counter() - start
+                if r.status_code == 200:
+                    digest = hashlib.sha256()
+                    with open(tmp_path, "wb") as f:
+                        for chunk in r.iter_content(chunk_size=self.chunk_size):
+                            f.write(chunk)
+                            digest.update(chunk)
+                            num_bytes += len(chunk)
+                    os.replace(tmp_path, filepath) # Atomic on POSIX and Windows
+                    checksum = digest.hexdigest()
+                status_code = r.status_code
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.record(ok=False, num_bytes=0, latency=0.0, duration=time.perf_counter() - start)
+            raise
+
+        result = FetchResult(
+            url=url,
+            filepath=filepath,
+            status_code=status_code,
+            num_bytes=num_bytes,
+            sha256=checksum,
+            latency_s=latency,
+            duration_s=time.perf_counter() - start,
+        )
+        self.record(ok=result.ok, num_bytes=num_bytes, latency=result.latency_s, duration=result.duration_s)
+        return result
+
+    def record(self, ok: bool, num_bytes: int, latency: float, duration: float) -> None:
+        """
+        Adds a request to the accumulated counters.
+
+        Called by `fetch`, and by other transports (e.g. the asyncio engine) sharing these counters.
+        """
+        with self._lock:
+            self._requests += 1
+            self._failed += 0 if ok else 1
+            self._bytes += num_bytes
+            self._latency_s += latency
+            self._duration_s += duration
+
+    def stats(self) -> dict:
+        """
+        Returns the accumulated byte and latency counters of all requests made so far.
+
+        Returns:
+            dict: Request/failure counts, total bytes, mean latency and mean throughput (bytes/s).
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "failed": self._failed,
+                "bytes": self._bytes,
+                "mean_latency_s": self._latency_s / self._requests if self._requests else 0.0,
+                "bytes_per_s": self._bytes / self._duration_s if self._duration_s else 0.0,
+            }
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
@@ -0,0 +1,65 @@
+"""
+Lazy Package Attributes
+
+Packages of vegetationFLOW_core expose their public names without importing the submodules that
+define them, so `import vegetationFLOW_core` stays cheap and heavy dependencies (ee, geopandas,
+rasterio, torch) are only imported when a name that needs them is first used.
+
+Functions:
+----------
+- lazy_module(name, attrs, modules, exports) -> tuple[Callable, Callable, list[str]]
+    Builds the module-level `__getattr__`, `__dir__` and `__all__` of a lazily importing package.
+"""
+
+import importlib
+import sys
+from typing import Callable, Iterable
+
+
+def lazy_module(
+        name: str,
+        attrs: dict[str, str],
+        modules: Iterable[str] = (),
+        exports: Iterable[str] = ()
+) -> tuple[Callable, Callable, list[str]]:
+    """
+    Builds the module-level `__getattr__` (PEP 562), `__dir__` and `__all__` of a package whose
+    attributes and submodules are imported on first access.
+
+    Usage, in a package's `__init__.py`:
+
+        __getattr__, __dir__, __all__ = lazy_module(__name__, {"Log": ".logger"}, modules=("grid",))
+
+    Parameters
+    ----------
+    name : str
+        `__name__` of the package.
+    attrs : dict[str, str]
+        Attribute names mapped to the (relative) submodule defining them.
+    modules : Iterable[str]
+        Submodules exposed as attributes.
+    exports : Iterable[str]
+        Names defined eagerly in the package that belong in `__all__`, e.g. "__version__".
+
+    Returns
+    -------
+    tuple[Callable, Callable, list[str]]
+        `__getattr__`, `__dir__` and `__all__` for the package.
+    """
+    modules = tuple(modules)
+    names = [*exports, *attrs, *modules]
+
+    def __getattr__(attr: str):
+        if attr in attrs:
+            value = getattr(importlib.import_module(attrs[attr], name), attr)
+        elif attr in modules:
+            value = importlib.import_module(f".{attr}", name)
+        else:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+        setattr(sys.modules[name], attr, value) # Cache, so later lookups skip __getattr__
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[name])) | set(names))
+
+    return __getattr__, __dir__, names
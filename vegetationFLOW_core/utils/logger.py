@@ -1,24 +1,112 @@
+import json
 import logging
+import logging.handlers
 import os
+import queue
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s | %(levelname)s | %(threadName)s | %(name)s | %(filename)s:%(lineno)d | %(message)s'
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """Formats a record as one JSON object. Fields passed to `Log.addEvent` are kept as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=str)
+
+
+class TaskFilter(logging.Filter):
+    """Passes only the records logged for one task (their `task_id` attribute)."""
+
+    def __init__(self, task_id:str):
+        super().__init__()
+        self.task_id = task_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "task_id", None) == self.task_id
+
 
 class Log:
-    def __init__(self, log_dir:str, logger_name:str, task_id:str):
-        self.logger = logging.getLogger(logger_name) # Creates or gets the logger
+    """
+    Per-task logger writing to `{log_dir}/logs/{task_id}.log`.
+
+    All tasks share one logger (`logger_name`), so a long-lived worker does not register a new logger per
+    task. Each task adds a single `QueueHandler` with a `TaskFilter`, and its records carry its task id,
+    so they only reach its own files. Records are written to file by a `QueueListener` thread, so logging never blocks the calling (download) thread
+    on file I/O. Call `close()` when the task ends to flush the queue and detach the file, otherwise a
+    long-lived worker keeps the handler open.
+
+    With `structured=True`, records are also written as JSON lines to `{task_id}.jsonl`, and events
+    logged with `addEvent` carry their fields as JSON keys, e.g. for extracting timings.
+    """
+
+    def __init__(self, log_dir:str, logger_name:str, task_id:str, structured:bool=False):
+        self.logger = logging.getLogger(logger_name) # Shared by all tasks, records are routed by task id
         self.logger.setLevel(logging.INFO) #  will capture .info(), .warning(), .error() etc. but not .debug().
-        path = os.path.join(log_dir, "logs", f"{task_id}.log")
+        self.logger.propagate = False
+        self.task_id = task_id
+        for handler in list(self.logger.handlers): # Left behind by an earlier run of the same task that was not closed
+            if any(isinstance(f, TaskFilter) and f.task_id == task_id for f in handler.filters):
+                self.logger.removeHandler(handler)
+                handler.close()
+
         os.makedirs(os.path.join(log_dir, "logs"), exist_ok=True)
-        file_handler = logging.FileHandler(filename=path, mode="w")
-        file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s | %(levelname)s | %(threadName)s | %(name)s | %(filename)s:%(lineno)d | %(message)s')
-        )  #
-        self.logger.addHandler(file_handler)
-    
+        file_handler = logging.FileHandler(filename=os.path.join(log_dir, "logs", f"{task_id}.log"), mode="w")
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        self.handlers = [file_handler]
+        if structured:
+            json_handler = logging.FileHandler(filename=os.path.join(log_dir, "logs", f"{task_id}.jsonl"), mode="w")
+            json_handler.setFormatter(JSONLinesFormatter())
+            self.handlers.append(json_handler)
+
+        self.queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        self.queue_handler.addFilter(TaskFilter(task_id))
+        self.listener = logging.handlers.QueueListener(
+            self.queue_handler.queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        self.logger.addHandler(self.queue_handler)
+        self.structured = structured
+
     def addInfo(self, msg:str):
-        self.logger.info(msg)
-    
+        self.logger.info(msg, extra={"task_id": self.task_id}, stacklevel=2)
+
     def addError(self, msg:str):
-        self.logger.error(msg)
-    
+        self.logger.error(msg, extra={"task_id": self.task_id}, stacklevel=2)
+
     def addWarning(self, msg:str):
-        self.logger.warning(msg)
-    
+        self.logger.warning(msg, extra={"task_id": self.task_id}, stacklevel=2)
+
+    def addEvent(self, event:str, level:int=logging.INFO, **fields):
+        """
+        Logs a structured event, e.g. `addEvent("tile_fetched", tile="tile_3", bytes=1024, seconds=0.4)`.
+
+        The text log gets "event key=value ..."; in structured mode the JSON line has the fields as keys.
+        """
+        msg = " ".join([event] + [f"{key}={value}" for key, value in fields.items()])
+        self.logger.log(level, msg, extra={"task_id": self.task_id, "event": event, "fields": fields}, stacklevel=2)
+
+    def close(self):
+        """Flushes pending records, stops the listener thread and closes the task's log files."""
+        if self.listener is None:
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        self.listener = None
+        for handler in self.handlers:
+            handler.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,152 @@
+"""
+Download Metrics
+
+This module collects progress counters and per-stage latency histograms for a download job,
+so a running job can report how far it got and where its time goes.
+
+Classes:
+--------
+- LatencyHistogram
+    Fixed-bucket latency histogram with approximate quantiles.
+- DownloadMetrics
+    Thread-safe counters and stage histograms, with a JSON-serializable snapshot.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# Upper bucket bounds in seconds (log-spaced, from 10ms to 5min)
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0, 120.0, 300.0)
+
+# Stages of a tile download, in pipeline order
+STAGES = ("plan", "validity", "url", "fetch", "write")
+
+
+class LatencyHistogram:
+    """
+    A latency histogram with fixed buckets (see `LATENCY_BUCKETS`).
+
+    Not thread-safe on its own; `DownloadMetrics` serializes access.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Last bucket counts values above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (the maximum for the overflow bucket)."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_s": self.total / self.count if self.count else None,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "max_s": self.max if self.count else None,
+            "buckets": dict(zip([*map(str, self.buckets), "inf"], self.counts)),
+        }
+
+
+class DownloadMetrics:
+    """
+    Progress counters and per-stage latency histograms of a download job.
+
+    Counters track the planned, downloaded, invalid and failed tiles, the downloaded tiles restored from
+    the tile cache and the bytes written. Each stage in `STAGES` has a latency histogram, fed by `timer`
+    or `observe`. `snapshot()` returns everything as a plain dict (e.g. for Celery task state), and
+    `progress_callback` is called with it at most every `interval_s` seconds as tiles finish.
+
+    Attributes:
+        progress_callback (Callable[[dict], None] | None): Called with `snapshot()` as the job progresses.
+        interval_s (float): Minimum seconds between two progress callbacks.
+    """
+
+    def __init__(
+            self,
+            progress_callback: Optional[Callable[[dict], None]] = None,
+            interval_s: float = 2.0
+    ) -> None:
+        self.progress_callback = progress_callback
+        self.interval_s = interval_s
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_report = 0.0
+        self.counters = {
+            "months_planned": 0,
+            "months_skipped": 0,
+            "tiles_planned": 0,
+            "tiles_done": 0,
+            "tiles_invalid": 0,
+            "tiles_failed": 0,
+            "tiles_cached": 0,
+            "bytes": 0,
+        }
+        self.stages = {stage: LatencyHistogram() for stage in STAGES}
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += value
+        if counter in ("tiles_done", "tiles_invalid", "tiles_failed"):
+            self.report()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage].observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Times the enclosed block into the histogram of `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Returns the counters, derived progress and throughput, and stage latency summaries."""
+        with self._lock:
+            counters = dict(self.counters)
+            stages = {stage: hist.summary() for stage, hist in self.stages.items()}
+        elapsed = time.monotonic() - self._start
+        resolved = counters["tiles_done"] + counters["tiles_invalid"] + counters["tiles_failed"]
+        return {
+            **counters,
+            "tiles_resolved": resolved,
+            "progress": resolved / counters["tiles_planned"] if counters["tiles_planned"] else 0.0,
+            "elapsed_s": elapsed,
+            "bytes_per_s": counters["bytes"] / elapsed if elapsed > 0 else 0.0,
+            "tiles_per_s": resolved / elapsed if elapsed > 0 else 0.0,
+            "stages": stages,
+        }
+
+    def report(self, force: bool = False) -> None:
+        """Calls `progress_callback` with a snapshot, unless one was sent less than `interval_s` ago."""
+        if self.progress_callback is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < self.interval_s:
+                return
+            self._last_report = now
+        self.progress_callback(self.snapshot())
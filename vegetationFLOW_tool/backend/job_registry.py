@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import redis
+import shapely
+from shapely.geometry import shape
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://redis:6379/0")
+KEY_PREFIX = "download-job:"
+COORD_PRECISION = 1e-7 # Degrees (~1cm); coordinates are snapped to this grid before hashing
+
+def canonical_roi(roi_geojson:str) -> shapely.Geometry:
+    """
+    Normalizes a GeoJSON ROI into one geometry: the union of all features, snapped to a fixed precision
+    and in normalized vertex order, so the same area hashes the same regardless of feature order,
+    properties, ring orientation or float noise.
+    """
+    data = json.loads(roi_geojson)
+    if data.get("type") == "FeatureCollection":
+        geoms = [shape(feature["geometry"]) for feature in data["features"]]
+    elif data.get("type") == "Feature":
+        geoms = [shape(data["geometry"])]
+    else:
+        geoms = [shape(data)]
+    geom = shapely.union_all(shapely.set_precision(geoms, COORD_PRECISION))
+    return shapely.normalize(geom)
+
+def job_key(roi_geojson:str, start_year:int, end_year:int, patch_size:int, collection:str, version:str) -> str:
+    """Returns the SHA-256 content hash identifying a download job."""
+    request = {
+        "roi": shapely.to_wkb(canonical_roi(roi_geojson), hex=True),
+        "start_year": int(start_year),
+        "end_year": int(end_year),
+        "patch_size": int(patch_size),
+        "collection": collection,
+        "version": version,
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+class JobRegistry:
+    """
+    Maps job keys to the job doing (or that did) the work, in Redis. A job is a dict holding at least
+    the Celery "task_id", stored as JSON.
+
+    Entries expire with the task results (`ttl_s`), after which a resubmission starts a new task; with
+    resume enabled, that task only verifies the manifest of the existing dataset.
+    """
+
+    def __init__(self, url:str=REDIS_URL, ttl_s:int=24 * 3600):
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl_s = ttl_s
+
+    def claim(self, key:str, job:dict) -> bool:
+        """Registers `job` under `key` if no job is registered yet (atomic). Returns True if claimed."""
+        return bool(self.client.set(KEY_PREFIX + key, json.dumps(job), nx=True, ex=self.ttl_s))
+
+    def get(self, key:str):
+        value = self.client.get(KEY_PREFIX + key)
+        return json.loads(value) if value is not None else None
+
+    def replace(self, key:str, old_task_id:str, job:dict) -> bool:
+        """Swaps the registered job (e.g. after a failure) unless another request already did. Returns True if swapped."""
+        name = KEY_PREFIX + key
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(name)
+                current = pipe.get(name)
+                if current is not None and json.loads(current)["task_id"] != old_task_id:
+                    return False
+                pipe.multi()
+                pipe.set(name, json.dumps(job), ex=self.ttl_s)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def release(self, key:str, task_id:str) -> bool:
+        """Removes the registered job if it is still `task_id` (e.g. when it could not be queued). Returns True if removed."""
+        name = KEY_PREFIX + key
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(name)
+                current = pipe.get(name)
+                if current is None or json.loads(current)["task_id"] != task_id:
+                    return False
+                pipe.multi()
+                pipe.delete(name)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
@@ -1,10 +1,12 @@
 from fastapi import FastAPI
-import vegetationFLOW_core
-import ee
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from celery import states
+import asyncio
+import json
 import os
-import google.auth
 from pydantic import BaseModel
-from routers import download_route
+from routers import download_route, catalog_route
 from worker import celery_app
 
 glob_var = 0
@@ -12,12 +14,43 @@ glob_var = 0
 app = FastAPI()
 
 app.include_router(download_route.router)
+app.include_router(catalog_route.router)
 
-@app.get("/task-status/{task_id}")
-def get_status(task_id: str):
+def taskStatus(task_id: str) -> dict:
     res = celery_app.AsyncResult(task_id)  # bind to celery app instance
     return {
         "task_id": task_id,
         "status": res.status,
         "result": res.result if res.successful() else None,
-    }
\ No newline at end of file
+        "progress": res.info if res.status == "PROGRESS" else None, # Counters and stage latencies, see DownloadMetrics
+    }
+
+@app.get("/task-status/{task_id}")
+def get_status(task_id: str):
+    return taskStatus(task_id)
+
+@app.get("/task-status/{task_id}/stream")
+async def stream_status(task_id: str, interval: float = 1.0):
+    """
+    Server-Sent Events stream of a task's status. An event is sent whenever the status or progress
+    changes, a keep-alive comment otherwise, and the stream ends once the task finished.
+    """
+    async def events():
+        last = None
+        while True:
+            status = await run_in_threadpool(taskStatus, task_id) # The result backend client blocks
+            payload = json.dumps(status, default=str)
+            if payload != last:
+                yield f"data: {payload}\n\n"
+                last = payload
+            else:
+                yield ": keep-alive\n\n"
+            if status["status"] in states.READY_STATES:
+                break
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
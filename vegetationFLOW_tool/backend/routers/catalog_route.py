@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import os
+
+DATA_DIR = os.path.join("/app", "vegetationFLOW_tool", "data")
+
+router = APIRouter(
+    prefix="/catalog",
+    tags=["Catalog"]
+)
+
+@router.get("/{dataset_name}/tiles")
+def query_tiles(
+    dataset_name: str,
+    bbox: Optional[str] = Query(None, description="minx,miny,maxx,maxy"),
+    crs: str = "EPSG:4326",
+    start: Optional[str] = Query(None, description="First month, YYYY-MM"),
+    end: Optional[str] = Query(None, description="Last month, YYYY-MM"),
+    min_valid: float = Query(0.0, ge=0.0, le=1.0),
+    limit: int = Query(1000, gt=0, le=100000),
+):
+    """
+    Tiles of a dataset intersecting `bbox` (in `crs`) between `start` and `end` with at least `min_valid`
+    valid pixels, answered from the dataset's tile catalog.
+    """
+    # Imported here so the API only loads the catalog (stdlib sqlite3) when it is queried
+    from vegetationFLOW_core.datasets.catalog import TileCatalog
+
+    if os.path.basename(dataset_name) != dataset_name or dataset_name in ("", ".", ".."):
+        raise HTTPException(status_code=400, detail="Invalid dataset name")
+    try:
+        bounds = tuple(float(v) for v in bbox.split(",")) if bbox else None
+    except ValueError:
+        bounds = ()
+    if bounds is not None and len(bounds) != 4:
+        raise HTTPException(status_code=400, detail="bbox must be minx,miny,maxx,maxy")
+
+    try:
+        catalog = TileCatalog(os.path.join(DATA_DIR, dataset_name), read_only=True)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"No catalog for dataset {dataset_name}")
+    try:
+        tiles = catalog.query(bounds, crs=crs, start_month=start, end_month=end, min_valid_fraction=min_valid, limit=limit)
+    finally:
+        catalog.close()
+    return {"dataset_name": dataset_name, "count": len(tiles), "tiles": tiles}
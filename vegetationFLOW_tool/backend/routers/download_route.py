@@ -1,8 +1,13 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from tasks.download_task import downloadImages
+from tasks.download_task import downloadImages, downloadImagesFanOut
+from worker import celery_app
+from job_registry import JobRegistry, job_key
+from celery import states
+import vegetationFLOW_core
 import os
 import json
+import uuid
 from fastapi import HTTPException
 
 class DownloadInput(BaseModel):
@@ -13,6 +18,16 @@ class DownloadInput(BaseModel):
     ROI: str
     Patch_Size: int 
 
+# DOWNLOAD_FAN_OUT=1 splits each job into per-(month, tile batch) subtasks shared by all download workers
+FAN_OUT = os.environ.get("DOWNLOAD_FAN_OUT", "0") == "1"
+
+# Part of the job key: datasets made by another version of the pipeline are not reused
+PROCESSING_VERSION = vegetationFLOW_core.__version__
+
+CLAIM_ATTEMPTS = 3
+
+registry = JobRegistry(ttl_s=int(celery_app.conf.result_expires.total_seconds()))
+
 router = APIRouter(
     prefix="/download",
     tags=["Download"]
@@ -20,14 +35,45 @@ router = APIRouter(
 
 @router.post("/start/")
 def start_download(data: DownloadInput):
-    roi_path = os.path.join("/app", "vegetationFLOW_tool", "data", "geojsons", f"{data.Dataset_Name}.geojson")
-    os.makedirs(os.path.join("/app", "vegetationFLOW_tool", "data", "geojsons"), exist_ok=True)
-    # 👇 Ensure the GeoJSON is properly formatted
-    with open(roi_path, "w") as f:
-        f.write(data.ROI)
-    task = downloadImages.delay(data.Dataset_Name, 
-                                roi_path, 
-                                data.Patch_Size, 
-                                data.Start_Year, 
-                                data.End_Year)
-    return {"task_id": task.id}
+    # Identical requests (same area, years, patch size, collection and processing) share one job
+    try:
+        key = job_key(data.ROI, data.Start_Year, data.End_Year, data.Patch_Size, data.Collection_Type, PROCESSING_VERSION)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ROI GeoJSON: {e}")
+
+    # The ROI file and dataset folder are keyed by the job hash, so different ROIs never share them
+    job = {
+        "task_id": str(uuid.uuid4()),
+        "dataset_name": f"{data.Dataset_Name}_{key[:8]}",
+        "job_key": key,
+    }
+    # Another request may register, release or replace the job between our reads: retry a few times
+    for _ in range(CLAIM_ATTEMPTS):
+        existing = registry.get(key)
+        if existing is not None:
+            status = celery_app.AsyncResult(existing["task_id"]).status
+            if status not in (states.FAILURE, states.REVOKED):
+                # Attach to the running job, or return the finished one
+                return {**existing, "status": status, "deduplicated": True}
+        claimed = registry.claim(key, job) if existing is None else registry.replace(key, existing["task_id"], job)
+        if claimed:
+            break
+    else:
+        raise HTTPException(status_code=503, detail="The same download is being registered by another request, retry shortly")
+
+    try:
+        roi_path = os.path.join("/app", "vegetationFLOW_tool", "data", "geojsons", f"{key}.geojson")
+        os.makedirs(os.path.join("/app", "vegetationFLOW_tool", "data", "geojsons"), exist_ok=True)
+        # 👇 Ensure the GeoJSON is properly formatted
+        with open(roi_path, "w") as f:
+            f.write(data.ROI)
+        download_task = downloadImagesFanOut if FAN_OUT else downloadImages
+        download_task.apply_async(
+            args=(job["dataset_name"], roi_path, data.Patch_Size, data.Start_Year, data.End_Year),
+            task_id=job["task_id"]
+        )
+    except Exception as e:
+        # The task was never queued: later identical requests must not attach to it
+        registry.release(key, job["task_id"])
+        raise HTTPException(status_code=500, detail=f"Could not start the download: {e}")
+    return {**job, "status": states.PENDING, "deduplicated": False}
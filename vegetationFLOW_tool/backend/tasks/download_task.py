@@ -1,15 +1,165 @@
-from worker import celery_app
-from vegetationFLOW_core import LandsatDownloader
+from celery import chord, group
+from worker import celery_app, ensure_earth_engine
+from job_registry import REDIS_URL
 import os
+import time
+import redis
 
-@celery_app.task()
-def downloadImages(datasetName:str, roi:str, patchSize:int, startYear:int, endYear:int):
-    dwnloader = LandsatDownloader(
-        data_dir=os.path.join("/app", "vegetationFLOW_tool", "data"),
+DATA_DIR = os.path.join("/app", "vegetationFLOW_tool", "data")
+BATCH_SIZE = int(os.environ.get("DOWNLOAD_BATCH_SIZE", 64)) # Tiles per fan-out subtask
+COUNTERS = ("tiles_planned", "tiles_done", "tiles_invalid", "tiles_failed", "tiles_cached", "bytes")
+# Tiles downloaded for any dataset are shared through this cache (TILE_CACHE_DIR="" disables it)
+TILE_CACHE_DIR = os.environ.get("TILE_CACHE_DIR", os.path.join(DATA_DIR, "tile_cache")) or None
+TILE_CACHE_MAX_BYTES = int(float(os.environ.get("TILE_CACHE_MAX_GB", 50)) * 1024 ** 3)
+# Counters of a fanned-out job, summed over its subtasks in a Redis hash
+PROGRESS_PREFIX = "download-progress:"
+PROGRESS_TTL_S = 7 * 24 * 3600
+
+def makeDownloader(datasetName:str, patchSize:int, **kwargs):
+    # Imported here so the API process, which only enqueues these tasks, never loads ee and geopandas
+    from vegetationFLOW_core import LandsatDownloader
+    ensure_earth_engine()
+    return LandsatDownloader(
+        data_dir=DATA_DIR,
         dataset_name=datasetName,
-        img_size=patchSize
+        img_size=patchSize,
+        resume=True, # A restarted task picks up where the previous attempt stopped
+        cache_dir=TILE_CACHE_DIR,
+        cache_max_bytes=TILE_CACHE_MAX_BYTES,
+        **kwargs
+    )
+
+@celery_app.task(bind=True)
+def downloadImages(self, datasetName:str, roi:str, patchSize:int, startYear:int, endYear:int):
+    # The callback also runs on download threads, where self.request (thread-local) has no task id
+    task_id = self.request.id
+    dwnloader = makeDownloader(
+        datasetName,
+        patchSize,
+        # Tile counters and stage latencies are published as the task's PROGRESS state
+        progress_callback=lambda metrics: self.update_state(task_id=task_id, state="PROGRESS", meta=metrics)
     )
-    if dwnloader.startDownload(roi, startYear, endYear):
-        return "Downloaded"
-    else:
+    try:
+        if dwnloader.startDownload(roi, startYear, endYear):
+            return "Downloaded"
+        else:
+            return "Not Downloaded"
+    finally:
+        dwnloader.close() # Long-lived workers must not keep this task's log handler and connections
+
+def fanOutProgress(taskId:str, increments:dict) -> dict:
+    """
+    Adds counters to the totals of a fanned-out job in Redis and returns the totals as a progress
+    snapshot (same fields as `DownloadMetrics.snapshot`, without stage latencies).
+    """
+    name = PROGRESS_PREFIX + taskId
+    client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    with client.pipeline() as pipe:
+        pipe.hsetnx(name, "started_at", time.time())
+        for key, value in increments.items():
+            pipe.hincrby(name, key, int(value))
+        pipe.expire(name, PROGRESS_TTL_S)
+        pipe.hgetall(name)
+        values = pipe.execute()[-1]
+    counters = {key: int(values.get(key, 0)) for key in COUNTERS}
+    elapsed = time.time() - float(values["started_at"])
+    resolved = counters["tiles_done"] + counters["tiles_invalid"] + counters["tiles_failed"]
+    return {
+        **counters,
+        "tiles_resolved": resolved,
+        "progress": resolved / counters["tiles_planned"] if counters["tiles_planned"] else 0.0,
+        "elapsed_s": elapsed,
+        "bytes_per_s": counters["bytes"] / elapsed if elapsed > 0 else 0.0,
+        "tiles_per_s": resolved / elapsed if elapsed > 0 else 0.0,
+        "stages": {},
+    }
+
+def publishFanOutProgress(task, taskId:str, increments:dict) -> None:
+    """Adds a step's counters to the job totals and publishes them as the parent task's PROGRESS state."""
+    try:
+        task.update_state(task_id=taskId, state="PROGRESS", meta=fanOutProgress(taskId, increments))
+    except redis.RedisError as e: # Progress is informative only, it must not fail the download
+        print(f"Failed to publish progress of {taskId}: {e}")
+
+@celery_app.task(bind=True)
+def downloadImagesFanOut(self, datasetName:str, roi:str, patchSize:int, startYear:int, endYear:int):
+    """
+    Plans the job once, then fans it out as one `downloadTileBatch` subtask per (month, batch of tiles)
+    on the download queue, so any number of workers can share a single job. Subtasks add their counters
+    to this task's PROGRESS state. `aggregateDownload` finishes the download when all subtasks finished
+    and its result becomes this task's result.
+    """
+    task_id = self.request.id
+    dwnloader = makeDownloader(datasetName, patchSize)
+    try:
+        plan = dwnloader.planDownload(roi, startYear, endYear)
+    finally:
+        dwnloader.close()
+    if plan is None:
         return "Not Downloaded"
+    publishFanOutProgress(self, task_id, {"tiles_planned": dwnloader.metrics.snapshot()["tiles_planned"]})
+
+    subtasks = []
+    for start_date, end_date, filename in plan.month_jobs:
+        tile_indices = [int(i) for i in dwnloader.pendingTiles(plan.grid, filename).index]
+        for k in range(0, len(tile_indices), BATCH_SIZE):
+            subtasks.append(downloadTileBatch.s(
+                datasetName, roi, patchSize, start_date, end_date, filename, tile_indices[k:k + BATCH_SIZE], task_id
+            ))
+    finish = (datasetName, roi, patchSize, startYear, endYear, task_id)
+    if len(subtasks) == 0:
+        return aggregateDownload([], *finish)
+
+    workflow = chord(group(subtasks), aggregateDownload.s(*finish))
+    if self.request.is_eager: # No broker (task_always_eager): run the whole workflow in this process
+        return workflow.apply().get()
+    return self.replace(workflow)
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=30)
+def downloadTileBatch(self, datasetName:str, roi:str, patchSize:int, startDate:str, endDate:str,
+                      filename:str, tileIndices:list[int], parentId:str):
+    dwnloader = makeDownloader(
+        datasetName,
+        patchSize,
+        max_workers=1,
+        log_id=f"downloading_{datasetName}_{filename[:7]}_{tileIndices[0]}" # One log per subtask
+    )
+    try:
+        metrics = dwnloader.downloadTiles(roi, startDate, endDate, filename, tileIndices)
+    except Exception as e:
+        raise self.retry(exc=e)
+    finally:
+        dwnloader.close()
+
+    # Failed tiles stay unresolved in the manifest, so a retry only downloads those
+    retrying = metrics["tiles_failed"] > 0 and self.request.retries < self.max_retries
+    # Resolved tiles are never downloaded again, so each attempt adds its own; planned tiles were counted
+    # by the parent, and failed ones only once the subtask gives up on them
+    publishFanOutProgress(self, parentId, {
+        key: metrics[key] for key in COUNTERS if key != "tiles_planned" and not (retrying and key == "tiles_failed")
+    })
+    if retrying:
+        raise self.retry()
+    return {key: metrics[key] for key in COUNTERS}
+
+@celery_app.task()
+def aggregateDownload(results:list[dict], datasetName:str, roi:str, patchSize:int, startYear:int, endYear:int,
+                      parentId:str):
+    """Finishes a fanned-out download (mosaics, final metrics and log) once all its subtasks finished."""
+    try:
+        totals = fanOutProgress(parentId, {})
+        redis.Redis.from_url(REDIS_URL).delete(PROGRESS_PREFIX + parentId)
+    except redis.RedisError: # Fall back to the counters of the last attempt of each subtask
+        totals = {key: sum(result[key] for result in results) for key in COUNTERS}
+
+    import geopandas as gpd
+    dwnloader = makeDownloader(datasetName, patchSize)
+    try:
+        for key in COUNTERS:
+            dwnloader.metrics.increment(key, totals[key])
+        filenames = [f"{year}-{month:02d}.tif" for year in range(startYear, endYear + 1) for month in range(1, 13)]
+        dwnloader.finishDownload(dwnloader.gridROI(gpd.read_file(roi)), filenames)
+    finally:
+        dwnloader.close()
+    return (f"Downloaded: {totals['tiles_done']} tiles ({totals['bytes']} bytes, {totals['tiles_cached']} from cache), "
+            f"{totals['tiles_invalid']} invalid, {totals['tiles_failed']} failed")
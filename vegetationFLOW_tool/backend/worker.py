@@ -1,21 +1,29 @@
 from celery import Celery
-import ee
-import google.auth
 import os
+import threading
+
+_ee_lock = threading.Lock()
+_ee_pid = None # Process that initialized Earth Engine; prefork children must initialize their own
 
 def initialize_earth_engine():
+    import ee # Deferred: importing ee and google.auth is slow and not needed by the API process
+    import google.auth
     credentials, _ = google.auth.load_credentials_from_file(
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"],
         scopes=["https://www.googleapis.com/auth/earthengine.readonly"]
     )
     ee.Initialize(credentials)
 
-try:
-    initialize_earth_engine()
-    print("Earth Engine initialized in worker!")
-
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
+def ensure_earth_engine():
+    """Initializes Earth Engine once per process, on first use by a task."""
+    global _ee_pid
+    if _ee_pid == os.getpid():
+        return
+    with _ee_lock:
+        if _ee_pid != os.getpid():
+            initialize_earth_engine()
+            _ee_pid = os.getpid()
+            print("Earth Engine initialized in worker!")
 
 
 celery_app = Celery(
@@ -25,6 +33,10 @@ celery_app = Celery(
     include=["tasks.download_task"]
 )
 
+# CELERY_ALWAYS_EAGER=1 runs tasks (including fan-out chords) in the calling process, without a broker
+celery_app.conf.task_always_eager = os.environ.get("CELERY_ALWAYS_EAGER", "0") == "1"
+celery_app.conf.task_eager_propagates = celery_app.conf.task_always_eager
+
 celery_app.conf.task_routes = {
     "tasks.download_task.*": {"queue": "download"},
     "tasks.train_task.*": {"queue": "train"},
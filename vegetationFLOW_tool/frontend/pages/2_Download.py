@@ -167,17 +167,39 @@ if not st.session_state["is_downloading"] and st.session_state["downloaded_start
         st.error("Failed to submit task")
 
 # If Download btn pressed and successfull API call to backend -> Show progress bar
+@st.fragment
+def downloadProgress(task_id):
+    """
+    Follows the task's Server-Sent Events stream and updates a progress bar in place.
+    Runs as a fragment, so progress updates do not rerun (and rebuild) the rest of the page.
+    """
+    bar = st.progress(0.0, text="Waiting for the download to start...")
+    try:
+        with requests.get(f"{BACKEND_API}/task-status/{task_id}/stream", stream=True, timeout=(5, None)) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"): # Skip keep-alive comments
+                    continue
+                res = json.loads(line[len("data:"):])
+                progress = res.get("progress")
+                if progress and progress["tiles_planned"] > 0:
+                    bar.progress(
+                        min(progress["progress"], 1.0),
+                        text=f"{progress['tiles_resolved']}/{progress['tiles_planned']} tiles "
+                             f"({progress['tiles_invalid']} invalid, {progress['tiles_failed']} failed) "
+                             f"- {progress['bytes_per_s'] / 1e6:.1f} MB/s"
+                    )
+                if res["status"] == "SUCCESS":
+                    bar.progress(1.0, text="Finished")
+                    st.success(res["result"])
+                elif res["status"] in ("FAILURE", "REVOKED"):
+                    st.error(f"Task {res['status'].lower()}")
+    except requests.RequestException as e:
+        st.error(f"Lost connection to the backend: {e}")
+        return
+    st.session_state["is_downloading"] = False
+    st.session_state["downloaded_started"] = False
+    del st.session_state["task_id"]
+
 if st.session_state["is_downloading"] and st.session_state["downloaded_started"]:
     st.success(f"Task submitted. Task ID: {st.session_state['task_id']}")
-    # Connect to backend to get progress update on task
-    task_id = st.session_state["task_id"]
-    res = requests.get(f"{BACKEND_API}/task-status/{task_id}").json()
-    st.write(res)
-
-    if res["status"] == "SUCCESS":
-        st.success(res["result"])
-        st.session_state.task_running = False
-        del st.session_state["task_id"]
-    else:
-        st.info("Task still running...")
-
+    downloadProgress(st.session_state["task_id"])